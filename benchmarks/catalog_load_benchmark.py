@@ -0,0 +1,76 @@
+# Run from the repository root with: python -m benchmarks.catalog_load_benchmark
+from solver.catalog import Catalog, MajorCatalog
+from solver.catalog_schema import create_tables_if_not_exist
+import random, sqlite3, tempfile, time, os
+
+
+# Reads a major the way it was read before the MajorCourses table, by splitting Majors.course_ids into IN (?, ?, ...) queries
+class CommaSeparatedMajorCatalog(MajorCatalog):
+    def _read_course_rows(self, cursor):
+        cursor.execute("SELECT course_ids FROM Majors WHERE major_id = ?", (self.major_id,))
+        course_ids = [int(course_id) for course_id in cursor.fetchone()[0].split(',')]
+        cursor.execute(f"""
+            SELECT Courses.course_id, crn, professor_id, class_id, quota, day, start_time, end_time
+            FROM Courses LEFT JOIN CourseTimes ON CourseTimes.course_id = Courses.course_id
+            WHERE Courses.course_id IN ({','.join('?' for _ in course_ids)})
+            ORDER BY Courses.course_id, CourseTimes.rowid""", course_ids)
+        return cursor.fetchall()
+
+    def _read_class_rows(self, cursor):
+        class_ids = tuple(self.class_id_to_course_ids_map.keys())
+        cursor.execute(f"SELECT * FROM Classes WHERE class_id IN ({','.join('?' for _ in class_ids)})", class_ids)
+        return cursor.fetchall()
+
+
+# Writes a database in the layout of the older versions, only Majors.course_ids lists the courses of a major
+def make_synthetic_database(path, major_count, courses_per_major, seed=0):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    create_tables_if_not_exist(conn)
+    cursor = conn.cursor()
+    class_count = max(1, courses_per_major // 4)
+    cursor.executemany('INSERT INTO Classes VALUES (?, ?, ?, ?)',
+                       [(class_id, f'C{class_id // 1000} {class_id % 1000}', f'Class {class_id}', '') for class_id in range(1, class_count + 1)])
+    course_id = 0
+    for major_id in range(1, major_count + 1):
+        course_ids = []
+        for _ in range(courses_per_major):
+            course_id += 1
+            days = sorted(rng.sample(range(1, 6), rng.randint(1, 3)))
+            time_tuples = [(day, start_time, start_time + 119) for day in days for start_time in [rng.choice(range(510, 931, 60))]]
+            time_tuples += [(0, 0, 0)] * (3 - len(time_tuples))
+            cursor.execute('INSERT INTO Courses VALUES (?, ?, ?, ?, ?, ?)', (course_id, str(10000 + course_id), 1, rng.randint(1, class_count),
+                           '&'.join(','.join(str(item) for item in time_tuple) for time_tuple in time_tuples), rng.randint(1, 60)))
+            course_ids.append(course_id)
+        cursor.execute('INSERT INTO Majors VALUES (?, ?, ?)', (major_id, f'Major {major_id}', ','.join(str(c) for c in course_ids)))
+    cursor.execute("DELETE FROM Metadata WHERE key = 'schema_version'")
+    conn.commit()
+    return conn
+
+
+def measure_major_load(conn, major_catalog_type, major_ids, repeat=3):
+    best_elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for major_id in major_ids:
+            major_catalog_type(major_id, 8 * 60 + 30, 17 * 60 + 30, 15).load(conn)
+        best_elapsed = min(best_elapsed, time.perf_counter() - start)
+    return best_elapsed / len(major_ids)
+
+
+if __name__ == '__main__':
+    print(f"{'majors':>6} {'courses/major':>13} {'migrate (s)':>12} {'IN query (ms)':>14} {'join (ms)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for major_count, courses_per_major in [(20, 200), (20, 2000), (5, 20000), (2, 40000)]:
+            conn = make_synthetic_database(os.path.join(directory, f'{major_count}_{courses_per_major}.db'), major_count, courses_per_major)
+            start = time.perf_counter()
+            Catalog(conn).load() # Migrates the database to the current schema
+            migrate_elapsed = time.perf_counter() - start
+            major_ids = list(range(1, major_count + 1))
+            try:
+                in_query_text = f'{measure_major_load(conn, CommaSeparatedMajorCatalog, major_ids) * 1000:>14.1f}'
+            except sqlite3.OperationalError as e: # Too many SQL variables on the builds with a lower limit
+                in_query_text = f'{str(e)[:14]:>14}'
+            join_elapsed = measure_major_load(conn, MajorCatalog, major_ids) * 1000
+            print(f'{major_count:>6} {courses_per_major:>13} {migrate_elapsed:>12.3f} {in_query_text} {join_elapsed:>10.1f}')
+            conn.close()
@@ -0,0 +1,62 @@
+# Start the server first, then run from the repository root with: python -m benchmarks.server_load_test --url http://127.0.0.1:8080
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+import argparse, json, random, time
+
+
+def send(url, body=None, timeout=60):
+    data = None if body is None else json.dumps(body).encode()
+    request = Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            status, payload = response.status, json.loads(response.read())
+    except HTTPError as e:
+        status, payload = e.code, json.loads(e.read() or b'{}')
+    except URLError as e:
+        status, payload = 0, {'error': str(e.reason)}
+    except OSError as e:
+        status, payload = 0, {'error': str(e)}
+    return status, payload, time.perf_counter() - start
+
+
+# Slots of random classes without prerequisites so that most of the requests have results
+def make_solve_bodies(major_id, classes, request_count, seed=0):
+    rng = random.Random(seed)
+    class_code_names = [c['class_code_name'] for c in classes if not c['prerequisites'] and c['section_count']]
+    bodies = []
+    for _ in range(request_count):
+        slot_count = rng.randint(2, min(6, len(class_code_names)))
+        picked = rng.sample(class_code_names, slot_count + rng.randint(0, 2))
+        slots = ['|'.join(picked[i::slot_count]) for i in range(slot_count)]
+        bodies.append({'major': major_id, 'slots': slots, 'page': rng.randint(0, 2), 'page_size': 20})
+    return bodies
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))] if sorted_values else 0.0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sends concurrent solve requests to a running scheduler server.')
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--major', type=int, default=1)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    _, classes_payload, _ = send(f'{args.url}/majors/{args.major}/classes')
+    bodies = make_solve_bodies(args.major, classes_payload.get('classes', []), args.requests, args.seed)
+    print(f"{'clients':>7} {'requests':>8} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}  statuses")
+    for concurrency in (1, 4, 16, 64):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            responses = list(executor.map(lambda body: send(f'{args.url}/solve', body), bodies))
+        elapsed = time.perf_counter() - start
+        latencies = sorted(latency for _, _, latency in responses)
+        statuses = {}
+        for status, _, _ in responses:
+            statuses[status] = statuses.get(status, 0) + 1
+        print(f'{concurrency:>7} {len(responses):>8} {len(responses) / elapsed:>8.1f} {percentile(latencies, 0.5) * 1000:>9.1f} '
+              f'{percentile(latencies, 0.95) * 1000:>9.1f} {percentile(latencies, 0.99) * 1000:>9.1f}  {dict(sorted(statuses.items()))}')
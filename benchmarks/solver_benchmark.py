@@ -0,0 +1,90 @@
+# Run from the repository root with: python -m benchmarks.solver_benchmark
+from solver.combination_search import CombinationSearch
+from solver.conflict_index import ConflictIndex
+from solver.parallel_search import ParallelCombinationSearch
+from solver.combination_counter import CombinationCounter
+import random, time, os
+
+DAY_COUNT = 5
+SEGMENT_COUNT = 36 # 15 minute segments between 8:30 and 17:30
+
+
+def make_synthetic_slots(slot_count, sections_per_slot, seed=0):
+    rng = random.Random(seed)
+    courses = []
+    course_masks = {}
+    course_id = 1
+    for _ in range(slot_count):
+        slot = []
+        for _ in range(rng.randint(max(1, sections_per_slot // 2), sections_per_slot)):
+            mask = 0
+            for day in rng.sample(range(DAY_COUNT), rng.randint(1, 2)):
+                length = rng.choice([4, 8])
+                start = rng.randrange(0, SEGMENT_COUNT - length + 1, 4)
+                mask |= ((1 << length) - 1) << (day * SEGMENT_COUNT + start)
+            course_masks[course_id] = mask
+            slot.append(course_id)
+            course_id += 1
+        courses.append(slot)
+    return courses, course_masks
+
+
+def run_pruned_search(courses, course_masks):
+    start = time.perf_counter()
+    conflict_index = ConflictIndex([course_id for course_ids in courses for course_id in course_ids], course_masks)
+    search = CombinationSearch(courses, conflict_index)
+    results = search.run()
+    return search, results, time.perf_counter() - start
+
+
+def compare_parallel_search(courses, course_masks, worker_count):
+    conflict_index = ConflictIndex([course_id for course_ids in courses for course_id in course_ids], course_masks)
+    start = time.perf_counter()
+    serial_results = CombinationSearch(courses, conflict_index).run()
+    serial_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel_results = ParallelCombinationSearch(courses, conflict_index, worker_count=worker_count).run()
+    parallel_elapsed = time.perf_counter() - start
+    assert parallel_results == serial_results
+    return len(serial_results), serial_elapsed, parallel_elapsed
+
+
+def measure_random_access(courses, course_masks, sample_count=1000, seed=0):
+    conflict_index = ConflictIndex([course_id for course_ids in courses for course_id in course_ids], course_masks)
+    counter = CombinationCounter(courses, conflict_index)
+    start = time.perf_counter()
+    result_count = counter.count()
+    count_elapsed = time.perf_counter() - start
+    indices = random.Random(seed).sample(range(result_count), min(sample_count, result_count))
+    start = time.perf_counter()
+    for index in indices:
+        counter.result_at(index)
+    return result_count, count_elapsed, (time.perf_counter() - start) / max(len(indices), 1)
+
+
+if __name__ == '__main__':
+    print(f"{'slots':>5} {'results':>9} {'exhaustive nodes':>18} {'pruned nodes':>13} {'reduction':>10} {'time (s)':>9}")
+    for slot_count in range(10, 16):
+        courses, course_masks = make_synthetic_slots(slot_count, sections_per_slot=6, seed=slot_count)
+        search, results, elapsed = run_pruned_search(courses, course_masks)
+        exhaustive_node_count = search.exhaustive_node_count()
+        print(f'{slot_count:>5} {len(results):>9} {exhaustive_node_count:>18} {search.node_count:>13} '
+              f'{exhaustive_node_count / max(search.node_count, 1):>9.0f}x {elapsed:>9.3f}')
+
+    worker_count = os.cpu_count() or 1
+    print()
+    print(f'Parallel search with {worker_count} workers')
+    print(f"{'slots':>5} {'sections':>8} {'results':>9} {'serial (s)':>11} {'parallel (s)':>13} {'speedup':>8}")
+    for slot_count, sections_per_slot in [(12, 8), (14, 8), (15, 8)]:
+        courses, course_masks = make_synthetic_slots(slot_count, sections_per_slot, seed=slot_count)
+        result_count, serial_elapsed, parallel_elapsed = compare_parallel_search(courses, course_masks, worker_count)
+        print(f'{slot_count:>5} {sections_per_slot:>8} {result_count:>9} {serial_elapsed:>11.3f} {parallel_elapsed:>13.3f} '
+              f'{serial_elapsed / parallel_elapsed:>7.2f}x')
+
+    print()
+    print('Random access to the results')
+    print(f"{'slots':>5} {'sections':>8} {'results':>10} {'count (s)':>10} {'per result (ms)':>16}")
+    for slot_count, sections_per_slot in [(10, 8), (12, 8), (14, 8)]:
+        courses, course_masks = make_synthetic_slots(slot_count, sections_per_slot, seed=slot_count)
+        result_count, count_elapsed, access_elapsed = measure_random_access(courses, course_masks)
+        print(f'{slot_count:>5} {sections_per_slot:>8} {result_count:>10} {count_elapsed:>10.3f} {access_elapsed * 1000:>16.3f}')
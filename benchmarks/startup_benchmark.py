@@ -0,0 +1,38 @@
+# Run from the repository root with: python -m benchmarks.startup_benchmark
+from benchmarks.catalog_load_benchmark import make_synthetic_database
+from solver.catalog import Catalog
+from solver.catalog_snapshot import CatalogSnapshot, load_catalog, get_snapshot_file_addr
+import sqlite3, tempfile, time, os
+
+
+# Startup of the scheduler, the catalog is loaded and then the major of the student
+def measure_startup(db_path, from_snapshot, major_id=1, repeat=5):
+    best_elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn = sqlite3.connect(db_path)
+        catalog = load_catalog(conn) if from_snapshot else Catalog(conn).load()
+        catalog.get_major(major_id)
+        best_elapsed = min(best_elapsed, time.perf_counter() - start)
+        assert (catalog.snapshot is not None) == from_snapshot
+        conn.close()
+    return best_elapsed
+
+
+if __name__ == '__main__':
+    print(f"{'majors':>6} {'courses/major':>13} {'compile (s)':>12} {'snapshot (KB)':>14} {'database (ms)':>14} {'snapshot (ms)':>14} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for major_count, courses_per_major in [(20, 200), (20, 2000), (5, 20000)]:
+            db_path = os.path.join(directory, f'{major_count}_{courses_per_major}.db')
+            conn = make_synthetic_database(db_path, major_count, courses_per_major)
+            conn.execute("INSERT OR REPLACE INTO Metadata (key, value) VALUES ('catalog_version', 'benchmark')")
+            conn.commit()
+            start = time.perf_counter()
+            snapshot_file_addr = get_snapshot_file_addr(conn)
+            CatalogSnapshot.write(snapshot_file_addr, Catalog(conn).load())
+            compile_elapsed = time.perf_counter() - start
+            conn.close()
+            database_elapsed = measure_startup(db_path, from_snapshot=False) * 1000
+            snapshot_elapsed = measure_startup(db_path, from_snapshot=True) * 1000
+            print(f'{major_count:>6} {courses_per_major:>13} {compile_elapsed:>12.3f} {os.path.getsize(snapshot_file_addr) / 1024:>14.0f} '
+                  f'{database_elapsed:>14.1f} {snapshot_elapsed:>14.1f} {database_elapsed / snapshot_elapsed:>7.2f}x')
@@ -1,7 +1,15 @@
 from PyQt5.QtCore import QTime, QStringListModel
 from bs4 import BeautifulSoup
 from sortedcontainers import SortedDict
-import json, os
+from solver.catalog_snapshot import load_catalog
+from solver.schedule_solver import ScheduleSolver, ScheduleRequest
+from solver.prerequisite_index import normalize_class_code
+from solver.result_stream import ResultStream
+from solver.result_table import ResultTable
+from solver.ranked_search import RankedCombinationSearch
+from solver.solve_cache import SolveCache
+from solver.solve_metrics import SolveMetrics
+import json, os, time
 
 class CourseSchedulerBackend:
     def __init__(self, parent, logger):
@@ -9,18 +17,30 @@ class CourseSchedulerBackend:
         self.parent = parent
         self.logger = logger
         self.conn = None
+        self.catalog = None # Qt free catalog of the database, the backend keeps the data of the selected major from it
+        self.major_catalog = None
+        self.solver = None # Solves the selections of the selected major
+        self.catalog_version = ''
+        self.solve_cache = SolveCache(self.solve_cache_directory_path, self.solve_cache_size_limit)
         self.student_major_id = 0
         self.allready_taken_class_codes = set()
         self.prerequisite_class_codes_set = set()
-        self.selected_class_ids = []
+        self.eligible_class_ids = set() # Classes of the major whose prerequisites are satisfied by the already taken classes
         self.selected_class_code_names = []
         self.selected_class_code_names_set = set()
         self.excluded_time_blocks = set() # Holds (day, start_time, end_time) tuples. start_time & end_time in minutes
-        self.results = [] # Holds lists of course ids each list being a result
+        self.results = ResultStream() # Streams lists of course ids each list being a result
         self.current_result_index = 0
         self.something_changed = True
-        self.temp_results = [] # Temporary results so that we dont mess up the previous results if some problem occurs during the calculation
-        self.potential_result = [] # Holds course ids
+        self.rank_results = False # Only the best results are found and shown in the order of their scores
+        # None shows every result, 'random' shows uniformly random results and 'diverse' the most different ones of a random pool.
+        # Ranking the results takes precedence over sampling them
+        self.sampling_mode = None
+        self.solved_selection = None # Holds (usable class code names of the slots, excluded time blocks, rank_results) the results belong to
+        self.solve_metrics = SolveMetrics() # Timings and counters of the last calculation
+        self.pending_calculation = None # Holds (PreparedSolve, solve cache key) between prepare_calculation() and finish_calculation()
+        self.pending_count = None # Holds the PreparedSolve between prepare_count() and run_count()
+        self.temp_results = None # Temporary results so that we dont mess up the previous results if some problem occurs during the calculation
         self.courses = {}
         self.classes = {}
         self.majors = []
@@ -42,12 +62,28 @@ class CourseSchedulerBackend:
         self.day_end_time_minutes = self._time_to_minutes(self.day_end_time) # 17:30
         self.total_slot_limit = 15
         self.total_options_count_limit = 8
+        self.result_buffer_limit = 10000 # Results kept in memory, later ones are enumerated again when they are shown
+        self.result_lookahead = 20 # Results searched ahead of the shown one
+        self.solver_engine = 'search' # 'search', 'parallel' or 'vectorized'
+        self.solver_worker_count = os.cpu_count() or 1 # Number of processes used by the parallel engine
+        self.ranking_weights = dict(RankedCombinationSearch.DEFAULT_WEIGHTS)
+        self.ranked_result_limit = 100 # Number of best results kept if the results are ranked
+        self.sample_result_count = 100 # Number of results drawn if the results are sampled
+        self.sample_seed = 0 # The same seed draws the same sample again
+        self.show_solver_metrics = False # Adds a tab showing the timings and counters of the last calculation
         self.state_file_addr = 'state.json'
+        self.solve_cache_directory_path = 'solve_cache'
+        self.solve_cache_size_limit = 50 * 1024 * 1024 # 50 MB
         self.output_image_directory_path = 'output_images'
         # Error Messages
         self.ERROR_DB_NOT_EXIST = 'Class does not exist in the database.\nMake sure that you typed it right and the database is up to date'
         self.ERROR_PREREQ_NOT_EXIST = 'Class does not exist in amongst the prerequisites.\nMake sure that you typed it right and the database is up to date\nIf you are sure about these two\nIt means you dont need\nto care about this class for prerequisites'
         self.ERROR_NO_COMBINATION = 'Could not find any combinations satisfying the conditions.'
+        self.ERROR_EMPTY_SLOTS = lambda slot_reasons: 'Following slots have no usable section:\n' + '\n'.join(f"{' or '.join(slot)}: {reason}" for slot, reason in slot_reasons)
+        self.REASON_PREREQS_NOT_SATISFIED = 'prerequisites are not satisfied'
+        self.REASON_NO_SECTION = 'there is no section in the database'
+        self.REASON_ALL_SECTIONS_EXCLUDED = 'every section collides with an excluded time block'
+        self.ERROR_SLOTS_ALWAYS_CLASH = lambda slot_pairs: 'Following slots clash for every section:\n' + '\n'.join(f"{' or '.join(slot_1)}  <->  {' or '.join(slot_2)}" for slot_1, slot_2 in slot_pairs)
         self.ERROR_TIME_COLLISION = 'Time block must not collide with the previous time blocks'
         self.ERROR_CLASS_ALLREADY_EXIST = 'Class already exists.'
         self.ERROR_NOT_MULTIPLE_OF_RESOLUTION = f'Time Exclusion Block show be multiple of {self.time_resolution}'
@@ -56,14 +92,21 @@ class CourseSchedulerBackend:
         self.MESSAGE_CONFIRM_MAJOR_UPDATE = 'Updating the major will reset the selected classes\nredownload the related prerequisites and\nrefetch the related data from the database.\nDo you want to proceed?'
         self.MESSAGE_CONFIRM_DB_UPDATE = "Updating the database may take some time.\nAnd it will also reset the program state.\nSo don't use this button too frequently.\nDo you want to proceed?"
         self.MESSAGE_NOTHING_CHANGED = 'No parameter was changed.\nSo nothing to calculate.'
+        self.MESSAGE_COMBINATION_COUNT = lambda count: f'{count} combinations satisfy the conditions.'
+        self.MESSAGE_CALCULATING = 'Calculating...'
+        self.MESSAGE_SOLVER_PROGRESS = lambda node_count, result_count: f'{node_count} nodes explored, {result_count} results found'
+        self.MESSAGE_CALCULATION_CANCELLED = 'Calculation cancelled, the results found so far are shown'
+        self.MESSAGE_COUNTING = 'Counting...'
+        self.MESSAGE_COUNT_CANCELLED = 'Counting cancelled'
 
 
     def reset_state(self):
         self.student_major_id = 0
         self.selected_class_code_names = []
-        self.selected_class_ids = []
-        self.results = []
+        self.results = ResultStream()
+        self.solved_selection = None
         self.course_id_to_same_time_course_ids_map = {}
+        self.solver = None
         self.current_result_index = 0
         self.something_changed = True
         self.current_class_code = ''
@@ -79,15 +122,22 @@ class CourseSchedulerBackend:
             'excluded_time_blocks': [[item for item in time_block] for time_block in self.excluded_time_blocks],
             'student_major_id': self.student_major_id,
             'course_id_to_same_time_course_ids_map': self.course_id_to_same_time_course_ids_map,
-            'results': self.results,
+            'results_complete': self.results.total_count() == len(self.results.buffered_results()),
+            'solved_selection': None if self.solved_selection is None else
+                [self.solved_selection[0], [list(time_block) for time_block in self.solved_selection[1]], self.solved_selection[2]],
             'current_result_index': self.current_result_index,
             'something_changed': self.something_changed,
+            'rank_results': self.rank_results,
+            'sampling_mode': self.sampling_mode,
+            'sample_seed': self.sample_seed,
             'current_class_code': self.current_class_code,
             'added_classes': dict(self.added_classes)
         }
     
         with open(file_addr, 'w') as f:
             json.dump(state, f, indent=4)
+        # Results are kept in a binary file next to the state so they can be mapped instead of parsed on load
+        self.results.buffered_results().save(self._get_results_file_addr(file_addr))
 
     def load_state(self, file_addr):
         if os.path.exists(file_addr):
@@ -99,14 +149,29 @@ class CourseSchedulerBackend:
             self.student_major_id = state.get('student_major_id', 0)
             course_id_str_to_same_time_course_ids_map = state.get('course_id_to_same_time_course_ids_map', {})
             self.course_id_to_same_time_course_ids_map = {int(key): value for key, value in course_id_str_to_same_time_course_ids_map.items()}
-            self.results = state.get('results', [])
+            # States saved before the results file existed hold the results themselves
+            results = state['results'] if 'results' in state else ResultTable.load(self._get_results_file_addr(file_addr))
+            self.results = ResultStream(results=results, buffer_limit=self.result_buffer_limit, lookahead=self.result_lookahead)
             self.current_result_index = state.get('current_result_index', 0)
             self.something_changed = state.get('something_changed', True)
+            self.rank_results = state.get('rank_results', False)
+            self.sampling_mode = state.get('sampling_mode')
+            self.sample_seed = state.get('sample_seed', 0)
+            # Only the buffered part of the results is saved so they have to be calculated again to see the rest
+            if not state.get('results_complete', True):
+                self.something_changed = True
+            solved_selection = state.get('solved_selection')
+            self.solved_selection = None if solved_selection is None else\
+                (solved_selection[0], set(tuple(time_block) for time_block in solved_selection[1]), solved_selection[2])
             self.excluded_time_blocks = set([tuple(int(item) for item in lst) for lst in state.get('excluded_time_blocks', [])])
             self.current_class_code = state.get('current_class_code', '')
             self.added_classes = SortedDict(state.get('added_classes', {}))
     
 
+    @staticmethod
+    def _get_results_file_addr(state_file_addr):
+        return os.path.splitext(state_file_addr)[0] + '_results.bin'
+
     def get_selected_class_code_names_from_slot_list(self):
         self.selected_class_code_names = [
             [class_code_name for class_code_name in slot_row.class_options] for slot_row in self.parent.slot_list_tab.slot_rows
@@ -115,36 +180,123 @@ class CourseSchedulerBackend:
 
 
     def calculate_combinations(self):
+        if self.prepare_calculation():
+            self.finish_calculation(cancelled=not self.run_calculation())
+
+    # The calculation is split so that run_calculation() can run in a background thread,
+    # prepare_calculation() and finish_calculation() touch the GUI and run before and after it
+    def prepare_calculation(self):
         # check if the user has changed some parameter if nothing was changed then no need to recalculate
         if not self._is_it_allowed() or not self.something_changed:
-            return
-        
-        # Map self.selected_class_ids from self.selected_class_code_names
-        self.get_selected_class_code_names_from_slot_list()
-        self.selected_class_ids = [[self.class_code_name_to_id_map[class_code_name] for class_code_name in slot] for slot in self.selected_class_code_names]
-
-        # Prerequisites are allready checked at the class addition stage 
+            return False
         
-        # Filter not aplicable courses and duplicates in terms of day and time
-        course_id_to_same_time_course_ids_map = {}
-        courses = [[course_id for class_id in slot for course_id in self.class_id_to_course_ids_map.get(class_id, [])]
-                   for slot in self.selected_class_ids]
-        courses = [self._exclude_same_time_courses(course_ids, course_id_to_same_time_course_ids_map) for course_ids in courses]
-        course_id_to_same_time_course_ids_map = {course_id: sorted(same_time_ids, key=lambda item: self.courses[item][4], reverse=True)
-                                                for course_id, same_time_ids in course_id_to_same_time_course_ids_map.items()}
-
-        self._calculate_results(courses)
-        if self.temp_results == []:
+        self.solve_metrics = SolveMetrics()
+        prepared = self._prepare_solve(self.solve_metrics)
+        if prepared.empty_slot_reasons:
             self.something_changed = False
-            self.parent.show_warning(self.ERROR_NO_COMBINATION)
+            reason_messages = {
+                ScheduleSolver.REASON_PREREQS_NOT_SATISFIED: self.REASON_PREREQS_NOT_SATISFIED,
+                ScheduleSolver.REASON_NO_SECTION: self.REASON_NO_SECTION,
+                ScheduleSolver.REASON_ALL_SECTIONS_EXCLUDED: self.REASON_ALL_SECTIONS_EXCLUDED,
+            }
+            self.parent.show_warning(self.ERROR_EMPTY_SLOTS([(slot, reason_messages[reason]) for slot, reason in prepared.empty_slot_reasons]))
+            return False
+
+        self.pending_calculation = (prepared, self._get_solve_cache_key())
+        # Changes made while the calculation runs set it back to True
+        self.something_changed = False
+        return True
+
+    # Returns False if the calculation was cancelled through progress, results_ready is called
+    # as soon as the first results can be shown while the rest is still being calculated
+    def run_calculation(self, progress=None, results_ready=None):
+        prepared, solve_cache_key = self.pending_calculation
+        from_cache = self._load_results_from_cache(solve_cache_key, prepared, progress)
+        if not from_cache:
+            def publish_first_results(result_stream):
+                self.temp_results = result_stream
+                if results_ready is not None:
+                    results_ready()
+            # Only the buffered results of the previous calculation are updated, they belong to solved_selection
+            previous = (self.solved_selection, self.results, self.course_id_to_same_time_course_ids_map)
+            self.temp_results = self.solver.solve(prepared, self.solve_metrics, progress, publish_first_results, previous)
+        # The searches stop early and keep what they found if they are cancelled, these results are not cached
+        if progress is not None and progress.cancelled:
+            return False
+        if not from_cache:
+            with self.solve_metrics.phase('store'):
+                self._store_results_in_cache(solve_cache_key)
+        return True
+
+    # Shows the results found so far, they are replaced by finish_calculation()
+    def publish_partial_results(self):
+        if self.temp_results:
+            self.results = self.temp_results
+            self.current_result_index = 0
+            # The results only hold one course of every group of same time courses
+            prepared, _ = self.pending_calculation
+            self.course_id_to_same_time_course_ids_map = prepared.course_id_to_same_time_course_ids_map
+
+    def finish_calculation(self, cancelled=False):
+        prepared, _ = self.pending_calculation
+        self.pending_calculation = None
+        selection = prepared.selection()
+        self._log_solve_metrics(cancelled)
+        if cancelled:
+            # Partial results are kept to be viewed but they can not be the base of an incremental update
+            self.something_changed = True
+            selection = None
+        if not self.temp_results:
+            self.temp_results = None
+            if cancelled:
+                return
+            always_clashing_slot_pairs = self.solver.get_always_clashing_slot_pairs(prepared)
+            if always_clashing_slot_pairs:
+                self.parent.show_warning(self.ERROR_SLOTS_ALWAYS_CLASH(always_clashing_slot_pairs))
+            else:
+                self.parent.show_warning(self.ERROR_NO_COMBINATION)
             return
         
-        self.results = self.temp_results
-        self.temp_results = []
-        self.course_id_to_same_time_course_ids_map = course_id_to_same_time_course_ids_map
-        self.current_result_index = 0
-        self.something_changed = False # Reset the value of something_changed
+        if self.results is not self.temp_results:
+            self.results = self.temp_results
+            self.current_result_index = 0
+        self.temp_results = None
+        self.course_id_to_same_time_course_ids_map = prepared.course_id_to_same_time_course_ids_map
+        self.solved_selection = selection
+
+
+    # Emits the metrics of the calculation as one log record with a JSON payload
+    def _log_solve_metrics(self, cancelled):
+        self.solve_metrics.finish()
+        self.solve_metrics.cancelled = cancelled
+        if self.temp_results is not None:
+            self.solve_metrics.result_count = self.temp_results.total_count()
+            self.solve_metrics.record_result_memory(self.temp_results.buffered_results())
+        self.logger.info('solve_metrics %s', json.dumps(self.solve_metrics.as_dict()))
+
+    # Returns the number of valid combinations for the current slots without enumerating them
+    def count_combinations(self):
+        if not self.prepare_count():
+            return 0
+
+        return self.run_count()
+
+    # The count is split like the calculation so that run_count() can run in a background thread
+    def prepare_count(self):
+        if not self._is_it_allowed():
+            return False
 
+        self.pending_count = self._prepare_solve()
+        return True
+
+    # Returns None if the count was cancelled through progress
+    def run_count(self, progress=None):
+        prepared = self.pending_count
+        self.pending_count = None
+        return self.solver.count(prepared, progress)
+
+    def get_current_result(self):
+        return self.results.get(self.current_result_index)
 
     def add_excluded_time_block(self, block_tuple):
         if block_tuple[1] >= self.day_start_time_minutes and block_tuple[2] <= self.day_end_time_minutes:
@@ -159,6 +311,22 @@ class CourseSchedulerBackend:
             and {self.day_end_time}")
         return False
     
+    def set_rank_results(self, rank_results):
+        if self.rank_results != rank_results:
+            self.rank_results = rank_results
+            self.something_changed = True
+
+    def set_sampling_mode(self, sampling_mode):
+        if self.sampling_mode != sampling_mode:
+            self.sampling_mode = sampling_mode
+            self.something_changed = True
+
+    def set_sample_seed(self, sample_seed):
+        if self.sample_seed != sample_seed:
+            self.sample_seed = sample_seed
+            if self.sampling_mode is not None:
+                self.something_changed = True
+
     def remove_excluded_time_block(self, block_tuple):
         if block_tuple in self.excluded_time_blocks:
             self.excluded_time_blocks.remove(block_tuple)
@@ -168,10 +336,11 @@ class CourseSchedulerBackend:
         if not self._is_it_allowed() or class_code == '':
             return False
         
-        if class_code in self.prerequisite_class_codes_set\
-            or class_code + 'E' in self.prerequisite_class_codes_set:
-            if class_code not in self.allready_taken_class_codes:
+        if normalize_class_code(class_code) in self.prerequisite_class_codes_set:
+            # MAT 103 and MAT 103E are the same class for the prerequisites
+            if normalize_class_code(class_code) not in set(normalize_class_code(taken_class_code) for taken_class_code in self.allready_taken_class_codes):
                 self.allready_taken_class_codes.add(class_code)
+                self._update_eligible_class_ids()
                 self.something_changed = True
                 return True
             else:
@@ -186,6 +355,7 @@ class CourseSchedulerBackend:
         
         if class_code in self.allready_taken_class_codes:
             self.allready_taken_class_codes.remove(class_code)
+            self._update_eligible_class_ids()
             self.something_changed = True
 
     def update_student_major(self, index):
@@ -250,56 +420,30 @@ class CourseSchedulerBackend:
         print('*' * 30)
 
     def load_data(self):
-        self._create_tables_if_not_exist()
-        cursor = self.conn.cursor()
-
-        cursor.execute("SELECT major_name FROM Majors")
-        self.majors = [row[0] for row in cursor.fetchall()]
-
-        cursor.execute("SELECT professor_name FROM Professors")
-        self.professors = [row[0] for row in cursor.fetchall()]
-
-        cursor.execute("SELECT class_code_name FROM Classes")
-        self.prerequisite_class_codes_set = set()
-        for row in cursor.fetchall():
-            self.prerequisite_class_codes_set.add(row[0])
+        start = time.perf_counter()
+        self.catalog = load_catalog(self.conn, self.day_start_time_minutes, self.day_end_time_minutes, self.time_resolution)
+        self.logger.debug('catalog loaded from the %s in %.1f ms', 'database' if self.catalog.snapshot is None else 'snapshot',
+                          (time.perf_counter() - start) * 1000)
+        self.majors = self.catalog.majors
+        self.professors = self.catalog.professors
+        self.prerequisite_class_codes_set = self.catalog.prerequisite_class_codes_set
+        self.catalog_version = self.catalog.catalog_version
 
 
     def fetch_major_specific_data(self):
         if self.student_major_id == 0:
             return
         
-        cursor = self.conn.cursor()
-
-        cursor.execute("SELECT course_ids FROM Majors WHERE major_id = ?", (self.student_major_id,))
-        major_row = cursor.fetchone()
-        
-        course_ids = [int(course_id) for course_id in major_row[0].split(',')]
-        
-        cursor.execute(f"SELECT * FROM Courses WHERE course_id IN ({','.join('?' for _ in course_ids)})", course_ids)
-        courses = cursor.fetchall()
-        self.courses = {}
-        for course in courses:
-            course_lst = list(course[1:])
-            course_lst[3] = [tuple(int(item) for item in time_tuple.split(',')) for time_tuple in course[4].split('&')]
-            self.courses[course[0]] = course_lst
-        
-        self.class_id_to_course_ids_map = {}
-        for course in courses:
-            self.class_id_to_course_ids_map.setdefault(course[3], []).append(course[0])
-        class_ids = tuple(self.class_id_to_course_ids_map.keys())
-        cursor.execute(f"SELECT * FROM Classes WHERE class_id IN ({','.join('?' for _ in class_ids)})", class_ids)
-        self.classes = {}
-        self.class_code_name_to_id_map = {}
-        classes = cursor.fetchall()
-        for c in classes:
-            c_lst = list(c[1:])
-            c_lst[2] = [] if c[3] == '' else [[or_item for or_item in or_group.split('|')] for or_group in c[3].split('&')]
-            self.classes[c[0]] = c_lst
-            self.class_code_name_to_id_map[c[1]] = c[0]
-            # For example class_code = EHB, class_number = 335E
-            class_code, class_number = c[1].split(' ')
-            self.class_code_to_class_ids_map.setdefault(class_code, SortedDict())[class_number] = c[0]
+        self.major_catalog = self.catalog.get_major(self.student_major_id)
+        self.solver = ScheduleSolver(self.major_catalog)
+        self.courses = self.major_catalog.courses
+        self.classes = self.major_catalog.classes
+        self.class_id_to_course_ids_map = self.major_catalog.class_id_to_course_ids_map
+        self.class_code_name_to_id_map = self.major_catalog.class_code_name_to_id_map
+        self._update_eligible_class_ids()
+        # The map of the backend is cleared by reset_state() so the one of the catalog is copied into it
+        for class_code, class_number_to_id_map in self.major_catalog.class_code_to_class_ids_map.items():
+            self.class_code_to_class_ids_map.setdefault(class_code, SortedDict()).update(class_number_to_id_map)
 
 #################################################################################################
 #       PRIVATE FUNCTIONS                                                                       #
@@ -320,60 +464,60 @@ class CourseSchedulerBackend:
         
     #     return True, 0 # returns 0 as an invalid value for class id because no class is problematic
 
-    # Resturns a new list that same time courses are excluded
-    def _exclude_same_time_courses(self, old_list, course_id_to_same_time_course_ids_map):
-        result_list = []
-
-        while old_list != []:
-            new_list = []
-            reference_course_id = old_list[0]
-            lst = [reference_course_id]
-            course_id_to_same_time_course_ids_map[reference_course_id] = lst
-            result_list.append(reference_course_id)
-            for i in range(1, len(old_list)):
-                if self._are_two_courses_same_time(reference_course_id, old_list[i]):
-                    lst.append(old_list[i])
-                else:
-                    new_list.append(old_list[i])
-
-            old_list = new_list
-        
-        return result_list
-
-    def _are_two_courses_same_time(self, course_id_1, course_id_2):
-        time_tuples_1 = self.courses[course_id_1][3]
-        time_tuples_2 = self.courses[course_id_2][3]
-
-        return time_tuples_1 == time_tuples_2
-
-
-    def _calculate_results(self, courses):
-        i = 0
-        self.potential_result = [0] * len(courses)
-        self.temp_results = []
-        self._calculate_recursive(courses, i)
-
-    def _calculate_recursive(self, courses, i):
-        if i >= len(courses):
-            if self._check_potential_result():
-                self.temp_results.append(self.potential_result.copy())
-            return
-        
-        for j in range(len(courses[i])):
-            self.potential_result[i] = courses[i][j]
-            self._calculate_recursive(courses, i + 1)
+    # Returns the PreparedSolve of the selection in the slot list, the solver follows the config of the backend
+    def _prepare_solve(self, metrics=None):
+        self.get_selected_class_code_names_from_slot_list()
+        self.solver.engine = self.solver_engine
+        self.solver.worker_count = self.solver_worker_count
+        self.solver.result_buffer_limit = self.result_buffer_limit
+        self.solver.result_lookahead = self.result_lookahead
+        self.solver.ranking_weights = self.ranking_weights
+        self.solver.ranked_result_limit = self.ranked_result_limit
+        self.solver.sample_result_count = self.sample_result_count
+        request = ScheduleRequest(self._get_solve_class_code_names(), self.excluded_time_blocks, self.allready_taken_class_codes,
+                                  self.rank_results, self.sampling_mode, self.sample_seed)
+        return self.solver.prepare(request, metrics)
+
+    # The options of every slot are solved in a fixed order so the same selection gives the same results and cache key
+    # whatever order the options were added in. The slots keep their order since every result holds one course per slot in it
+    def _get_solve_class_code_names(self):
+        return [sorted(slot) for slot in self.selected_class_code_names]
+
+    # Everything the results depend on, so a cached result is found again for the same selection
+    def _get_solve_cache_key(self):
+        return self.solve_cache.make_key({
+            'catalog_version': self.catalog_version,
+            'student_major_id': self.student_major_id,
+            'selected_class_code_names': self._get_solve_class_code_names(),
+            'excluded_time_blocks': sorted(self.excluded_time_blocks),
+            'allready_taken_class_codes': sorted(self.allready_taken_class_codes),
+            'rank_results': self.rank_results,
+            'ranking_weights': self.ranking_weights if self.rank_results else None,
+            'ranked_result_limit': self.ranked_result_limit if self.rank_results else None,
+            'sampling_mode': self.sampling_mode,
+            'sample_result_count': self.sample_result_count if self.sampling_mode is not None else None,
+            'sample_seed': self.sample_seed if self.sampling_mode is not None else None,
+        })
+
+    # Cached results may only be the beginning of the results, then the search continues after them when needed
+    def _load_results_from_cache(self, solve_cache_key, prepared, progress=None):
+        with self.solve_metrics.phase('load_cache'):
+            entry = self.solve_cache.get(solve_cache_key)
+        if entry is None:
+            return False
+        self.solve_metrics.source = 'cache'
+        self.temp_results = self.solver.resume(prepared, entry['results'], entry['total_count'], entry['complete'],
+                                               self.solve_metrics, progress)
+        return True
 
-    def _check_potential_result(self):
-        if self.potential_result and self._excluded_time_blocks_ok() and self._no_collision_between_courses():
-            return True
-        return False
-        
-    def _excluded_time_blocks_ok(self):
-        # Holds (day, start_time, end_time) tuples. start_time & end_time in minutes
-        time_list = [time_tuple for course_id in self.potential_result for time_tuple in self.courses[course_id][3]]
-        return not any(self._time_collision_not_ok(excluded_time_tuple, time_tuple)\
-                    for excluded_time_tuple in self.excluded_time_blocks\
-                    for time_tuple in time_list)
+    def _store_results_in_cache(self, solve_cache_key):
+        buffered_results = self.temp_results.buffered_results()
+        total_count = self.temp_results.total_count()
+        self.solve_cache.put(solve_cache_key, {
+            'results': buffered_results.tolist(),
+            'total_count': total_count,
+            'complete': total_count == len(buffered_results),
+        })
 
     @staticmethod    
     def _time_collision_not_ok(time_tuple1, time_tuple2):
@@ -390,26 +534,22 @@ class CourseSchedulerBackend:
             if self._time_collision_not_ok(block_tuple, new_block_tuple):
                 return False
         return True
-    
-    def _no_collision_between_courses(self):
-        for i in range(len(self.potential_result)):
-            for j in range(i + 1, len(self.potential_result)):
-                if any(self._time_collision_not_ok(time_tuple1, time_tuple2)\
-                    for time_tuple1 in self.courses[self.potential_result[i]][3]\
-                    for time_tuple2 in self.courses[self.potential_result[j]][3]):
-                    return False
-        return True
 
 
     def check_prerequisites_for_class(self, class_id):
-        prerequisites = self.classes[class_id][2]
-
-        for or_class_codes in prerequisites:
-            if not any(class_code in self.allready_taken_class_codes for class_code in or_class_codes):
-                self.parent.show_warning(self.ERROR_PREREQS_NOT_SATISFIED(class_id=class_id))
-                return False
+        if not self._prerequisites_satisfied(class_id):
+            self.parent.show_warning(self.ERROR_PREREQS_NOT_SATISFIED(class_id=class_id))
+            return False
         
         return True
+
+    def _prerequisites_satisfied(self, class_id):
+        return class_id in self.eligible_class_ids
+
+    # Every class of the major is checked at once so the tabs only look the classes up
+    def _update_eligible_class_ids(self):
+        self.eligible_class_ids = self.major_catalog.prerequisite_index.get_eligible_class_ids(self.allready_taken_class_codes)\
+            if self.major_catalog else set()
     
     @staticmethod
     def _total_minutes_to_HHmm(total_minutes):
@@ -420,36 +560,3 @@ class CourseSchedulerBackend:
     @staticmethod
     def _time_to_minutes(time):
         return time.hour() * 60 + time.minute()
-    
-    def _create_tables_if_not_exist(self):
-        cursor = self.conn.cursor()
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS Courses (
-            course_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            crn TEXT,
-            professor_id INTEGER,
-            class_id INTEGER,
-            time_tuples TEXT,
-            quota INTEGER,
-            FOREIGN KEY(professor_id) REFERENCES Professors(professor_id),
-            FOREIGN KEY(class_id) REFERENCES Classes(class_id)
-        )''')
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS Classes (
-            class_id INTEGER PRIMARY KEY,
-            class_code_name TEXT,
-            class_title TEXT,
-            prerequisite_class_ids TEXT -- Store as a comma-separated string
-        )''')
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS Majors (
-            major_id INTEGER PRIMARY KEY,
-            major_name TEXT,
-            course_ids TEXT -- Store as a comma-separated string
-        )''')
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS Professors (
-            professor_id INTEGER PRIMARY KEY,
-            professor_name TEXT
-        )''')
-        self.conn.commit()
\ No newline at end of file
@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import (
      QMainWindow, QPushButton, QComboBox,
     QVBoxLayout, QHBoxLayout, QWidget,QMessageBox,
-    QTabWidget, QApplication
+    QTabWidget, QApplication, QCheckBox, QLabel, QSpinBox
 )
 from database_update.update_database import CourseScraper
 from database_update.status_dialog import Worker, ProgressDialog
@@ -11,7 +11,9 @@ from tabs.slot_list_tab import SlotListTab
 from tabs.time_table_tab import TimeTableTab
 from tabs.time_exclusion_tab import TimeExclusionTab
 from tabs.already_taken_classes_tab import AlreadyTakenClassesTab
+from tabs.solver_metrics_tab import SolverMetricsTab
 from course_schduler_backend import CourseSchedulerBackend
+from solver_worker import SolverWorker
 import sqlite3, logging, os
 
 class CourseScheduler(QMainWindow):
@@ -45,6 +47,8 @@ class CourseScheduler(QMainWindow):
         self.conn.close()
     
     def closeEvent(self, event):
+        self.solver_worker.trigger_cancel()
+        self.solver_worker.wait()
         self.backend.save_state(self.backend.state_file_addr)
         event.accept()
 
@@ -57,20 +61,55 @@ class CourseScheduler(QMainWindow):
         self.worker.thread_returned.connect(self.handle_update_database_finish)
         self.worker.progress_updated.connect(self.progress_dialog.update_progress)
         self.worker.update_progress_bar.connect(self.progress_dialog.update_progress_bar)
+        # Combinations are calculated in the background so the window keeps responding
+        self.solver_worker = SolverWorker(parent=self)
+        self.solver_worker.progress_updated.connect(self.update_solver_progress)
+        self.solver_worker.results_ready.connect(self.show_partial_results)
+        self.solver_worker.thread_returned.connect(self.handle_calculation_finish)
+        self.solver_worker.count_returned.connect(self.handle_count_finish)
 
     def _init_control_layout(self):
         control_layout = QHBoxLayout()
         self._init_major_dropdown()
-        update_btn = QPushButton('Update Database')
-        update_btn.clicked.connect(self.handle_update_database)
-        calculate_btn = QPushButton('Calculate Combinations')
-        calculate_btn.clicked.connect(self.calculate_combinations)
+        self.update_btn = QPushButton('Update Database')
+        self.update_btn.clicked.connect(self.handle_update_database)
+        self.calculate_btn = QPushButton('Calculate Combinations')
+        self.calculate_btn.clicked.connect(self.calculate_combinations)
+        self.cancel_calculation_btn = QPushButton('Cancel')
+        self.cancel_calculation_btn.setEnabled(False)
+        self.cancel_calculation_btn.clicked.connect(self.cancel_calculation)
+        self.solver_status_label = QLabel(self)
+        self.count_btn = QPushButton('Count Combinations')
+        self.count_btn.clicked.connect(self.count_combinations)
+        self.rank_results_checkbox = QCheckBox('Best Results First')
+        self.rank_results_checkbox.setChecked(self.backend.rank_results)
+        self.rank_results_checkbox.toggled.connect(self.backend.set_rank_results)
+        self._init_sampling_controls()
 
         control_layout.addWidget(self.major_dropdown)
-        control_layout.addWidget(update_btn)
-        control_layout.addWidget(calculate_btn)
+        control_layout.addWidget(self.update_btn)
+        control_layout.addWidget(self.calculate_btn)
+        control_layout.addWidget(self.cancel_calculation_btn)
+        control_layout.addWidget(self.count_btn)
+        control_layout.addWidget(self.rank_results_checkbox)
+        control_layout.addWidget(self.sampling_mode_dropdown)
+        control_layout.addWidget(self.sample_seed_input)
+        control_layout.addWidget(self.solver_status_label)
         self.layout.addLayout(control_layout)
 
+    def _init_sampling_controls(self):
+        # Holds (text, sampling mode) pairs of the dropdown items
+        self.sampling_modes = [('All Results', None), ('Random Sample', 'random'), ('Diverse Sample', 'diverse')]
+        self.sampling_mode_dropdown = QComboBox(self)
+        self.sampling_mode_dropdown.addItems([text for text, _ in self.sampling_modes])
+        self.sampling_mode_dropdown.setCurrentIndex([mode for _, mode in self.sampling_modes].index(self.backend.sampling_mode))
+        self.sampling_mode_dropdown.currentIndexChanged.connect(lambda index: self.backend.set_sampling_mode(self.sampling_modes[index][1]))
+        self.sample_seed_input = QSpinBox(self)
+        self.sample_seed_input.setPrefix('Seed: ')
+        self.sample_seed_input.setRange(0, 2**31 - 1)
+        self.sample_seed_input.setValue(self.backend.sample_seed)
+        self.sample_seed_input.valueChanged.connect(self.backend.set_sample_seed)
+
     def _init_tabs(self):
         self.tabs = QTabWidget(self)
         self.class_portfolio_tab = ClassPortfolioTab(self.tabs, self.backend)
@@ -84,6 +123,7 @@ class CourseScheduler(QMainWindow):
         self.class_portfolio_tab.classes_list.removed.connect(self.added_classes_tab.remove_class)
         self.added_classes_tab.added_classes_list.removed.connect(self.added_classes_tab.remove_class)
         self.added_classes_tab.added_classes_list.removed.connect(self.class_portfolio_tab.toggle_class_if_necessary)
+        self.already_taken_classes_tab.taken_classes_changed.connect(self.class_portfolio_tab.update_eligibility)
 
         self.tabs.addTab(self.class_portfolio_tab, 'Class Portfolio')
         self.tabs.addTab(self.added_classes_tab, 'Added Classes')
@@ -91,6 +131,10 @@ class CourseScheduler(QMainWindow):
         self.tabs.addTab(self.time_table_tab, 'Time Table')
         self.tabs.addTab(self.already_taken_classes_tab, 'Already Taken Classes')
         self.tabs.addTab(self.time_exclusion_tab, 'Add Time Exclusions')
+        self.solver_metrics_tab = None
+        if self.backend.show_solver_metrics:
+            self.solver_metrics_tab = SolverMetricsTab(self.tabs, self.backend)
+            self.tabs.addTab(self.solver_metrics_tab, 'Solver Metrics')
         self.layout.addWidget(self.tabs)
 
     def _init_major_dropdown(self):
@@ -149,6 +193,7 @@ class CourseScheduler(QMainWindow):
         self.worker.quit()
         self.worker.wait()
         if return_code == self.scraper.SUCCESS:
+            self.backend.solve_cache.clear()
             self._reset_program_state()
         # if the program is in initial state and
         # database exists in the db_path it is deleted
@@ -189,11 +234,70 @@ class CourseScheduler(QMainWindow):
             self.show_warning(self.backend.MESSAGE_NOTHING_CHANGED)
             return
 
-        self.backend.calculate_combinations()
-        self.logger.debug(self.backend.results)
+        if not self.backend.prepare_calculation():
+            return
+        # The selection is read by the solver so it is not changed until the calculation finishes
+        self._set_calculation_running(True)
+        self.solver_status_label.setText(self.backend.MESSAGE_CALCULATING)
+        self.solver_worker.start_calculation()
+
+    def cancel_calculation(self):
+        self.cancel_calculation_btn.setEnabled(False)
+        self.solver_worker.trigger_cancel()
+
+    def update_solver_progress(self, node_count, result_count):
+        self.solver_status_label.setText(self.backend.MESSAGE_SOLVER_PROGRESS(node_count, result_count))
+
+    def show_partial_results(self):
+        self.backend.publish_partial_results()
+        self.time_table_tab.update_time_table()
+        self.time_table_tab.show_current_result()
+
+    def handle_calculation_finish(self, cancelled):
+        self.solver_worker.wait()
+        self._set_calculation_running(False)
+        self.solver_status_label.setText(self.backend.MESSAGE_CALCULATION_CANCELLED if cancelled else '')
+        self.backend.finish_calculation(cancelled)
+        if self.solver_metrics_tab is not None:
+            self.solver_metrics_tab.update_metrics()
         self.time_table_tab.update_time_table()
         self.time_table_tab.show_current_result()
 
+    def _set_calculation_running(self, running):
+        self.calculate_btn.setEnabled(not running)
+        self.update_btn.setEnabled(not running)
+        self.count_btn.setEnabled(not running)
+        self.cancel_calculation_btn.setEnabled(running)
+        self.rank_results_checkbox.setEnabled(not running)
+        self.sampling_mode_dropdown.setEnabled(not running)
+        self.sample_seed_input.setEnabled(not running)
+        self.major_dropdown.setEnabled(not running)
+        for tab_index in range(self.tabs.count()):
+            if self.tabs.widget(tab_index) is not self.time_table_tab:
+                self.tabs.setTabEnabled(tab_index, not running)
+
+    def count_combinations(self):
+        if self.backend.student_major_id == 0:
+            self.show_warning(self.backend.ERROR_MAJOR_NOT_SELECTED)
+            return
+        if not self.backend.prepare_count():
+            return
+        # Counting can take as long as a calculation so it runs in the solver thread and can be cancelled the same way
+        self._set_calculation_running(True)
+        self.solver_status_label.setText(self.backend.MESSAGE_COUNTING)
+        self.solver_worker.start_count()
+
+    def handle_count_finish(self, count):
+        self.solver_worker.wait()
+        self._set_calculation_running(False)
+        if count is None:
+            self.solver_status_label.setText(self.backend.MESSAGE_COUNT_CANCELLED)
+            return
+        self.solver_status_label.setText('')
+        # The count is shown next to the results instead of in a dialog, it is replaced once the results are updated
+        self.time_table_tab.total_result_count_label.setText(f'/ {count}')
+        self.time_table_tab.total_result_count_label.setToolTip(self.backend.MESSAGE_COMBINATION_COUNT(count))
+
     def show_error(self, error_message):
         msg = QMessageBox()
         msg.setIcon(QMessageBox.Critical)
@@ -1,12 +1,14 @@
 from bs4 import BeautifulSoup
-import sqlite3, json, re, logging, requests
+import sqlite3, json, re, logging, requests, uuid
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 import time
-
+from solver.catalog_schema import create_tables_if_not_exist, insert_course_times, insert_major_courses
+from solver.catalog_snapshot import CatalogSnapshot, get_snapshot_file_addr
+from solver.catalog import Catalog
 
 
 # onsart linki
@@ -311,13 +313,15 @@ class CourseScraper:
         self._create_tables_if_not_exist()
         cursor = self.conn.cursor()
 
-        for table in ['Courses', 'Professors', 'Majors']:
+        for table in ['Courses', 'CourseTimes', 'Professors', 'Majors', 'MajorCourses']:
             cursor.execute(f"DELETE FROM {table}")
             cursor.execute("DELETE FROM sqlite_sequence WHERE name='Courses'")
         self.conn.commit()
 
         cursor.executemany('''INSERT INTO Courses (crn, professor_id, class_id, time_tuples, quota) 
                             VALUES (?, ?, ?, ?, ?)''', self.course_list)
+        # Course ids start from 1 since the sequence of Courses is reset above
+        insert_course_times(cursor, ((course_id, course[3]) for course_id, course in enumerate(self.course_list, 1)))
         self.conn.commit()
 
         cursor.executemany('''INSERT INTO Classes (class_id, class_code_name, class_title, prerequisite_class_ids)
@@ -337,41 +341,24 @@ class CourseScraper:
 
         cursor.executemany('''INSERT INTO Majors (major_id, major_name, course_ids)
                             VALUES (?, ?, ?)''', self.majors_list)
+        insert_major_courses(cursor, ((major[0], major[2]) for major in self.majors_list))
         self.conn.commit()
 
-    def _create_tables_if_not_exist(self):
-        cursor = self.conn.cursor()
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS Courses (
-            course_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            crn TEXT,
-            professor_id INTEGER,
-            class_id INTEGER,
-            time_tuples TEXT,
-            quota INTEGER,
-            FOREIGN KEY(professor_id) REFERENCES Professors(professor_id),
-            FOREIGN KEY(class_id) REFERENCES Classes(class_id)
-        )''')
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS Classes (
-            class_id INTEGER PRIMARY KEY,
-            class_code_name TEXT,
-            class_title TEXT,
-            prerequisite_class_ids TEXT -- Store as a comma-separated string
-        )''')
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS Majors (
-            major_id INTEGER PRIMARY KEY,
-            major_name TEXT,
-            course_ids TEXT -- Store as a comma-separated string
-        )''')
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS Professors (
-            professor_id INTEGER PRIMARY KEY,
-            professor_name TEXT
-        )''')
+        # A new version on every update invalidates the results cached for the previous catalog
+        cursor.execute("INSERT OR REPLACE INTO Metadata (key, value) VALUES ('catalog_version', ?)", (uuid.uuid4().hex,))
         self.conn.commit()
 
+        # The scheduler starts from the compiled snapshot, it reads the database instead if the snapshot could not be written
+        snapshot_file_addr = get_snapshot_file_addr(self.conn)
+        if snapshot_file_addr:
+            try:
+                CatalogSnapshot.write(snapshot_file_addr, Catalog(self.conn).load())
+            except Exception:
+                self.logger.exception('Catalog snapshot could not be written')
+
+    def _create_tables_if_not_exist(self):
+        create_tables_if_not_exist(self.conn)
+
     def get_class_code_ids_and_token(self):
         chrome_options = Options()
         chrome_options.add_argument("--headless")  # Runs Chrome in headless mode
@@ -0,0 +1,173 @@
+# Solves the requests of many students in one process pool and writes the results of every student into the output directory, e.g.
+# python scheduler_batch.py --db courses.db --requests requests.jsonl --output batch_results --workers 4
+# Every line of the requests file is a JSON object like
+# {"student_id": "150200001", "major": 1, "slots": ["MAT 101|MAT 103", "FIZ 101"], "exclude": ["1,08:30,10:30"], "taken": ["MAT 100"]}
+# where "rank", "sample", "seed" and "limit" may be given as well
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from solver.catalog_snapshot import load_catalog
+from solver.schedule_solver import ScheduleSolver, ScheduleRequest
+from solver.solve_metrics import SolveMetrics
+from scheduler_cli import parse_time_block, parse_slots, check_selection, get_empty_slot_details, write_results
+import argparse, json, os, re, sqlite3, sys, time
+
+SUMMARY_FILE_NAME = 'summary.jsonl'
+
+# Loaded once in every worker process by init_worker() and shared by all of the requests the process solves
+worker_catalog = None
+worker_solvers = {} # Holds major_id -> ScheduleSolver whose conflict index covers the classes of every student of the major
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Finds the schedules of many students and writes them into a directory.')
+    parser.add_argument('--db', default='courses.db', help='path of the course database')
+    parser.add_argument('--requests', required=True, help='JSON lines file holding one request per student')
+    parser.add_argument('--output', default='batch_results', help='directory the results and the summary are written to')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='processes solving the requests, 1 solves them in this process')
+    parser.add_argument('--engine', choices=['search', 'vectorized'], default='search')
+    parser.add_argument('--limit', type=int, help='write at most this many results of a student unless the request has its own limit')
+    return parser.parse_args(argv)
+
+
+# Stands in for a line that is not a JSON object, it is reported in its own summary so the other requests are still solved
+class InvalidRequest(dict):
+    pass
+
+
+def read_requests(file_addr):
+    requests = []
+    with open(file_addr, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = None
+            if not isinstance(request, dict):
+                requests.append(InvalidRequest(student_id=str(line_number), line_number=line_number))
+                continue
+            request.setdefault('student_id', str(line_number))
+            requests.append(request)
+    return requests
+
+
+# Returns major_id -> class code names selected by any of the students of the major
+def group_class_code_names_by_major(catalog, requests):
+    major_id_to_class_code_names = {}
+    for request in requests:
+        major_id = catalog.find_major_id(request.get('major', ''))
+        if major_id:
+            class_code_names = major_id_to_class_code_names.setdefault(major_id, set())
+            class_code_names.update(class_code_name for slot in parse_slots(request.get('slots', [])) for class_code_name in slot)
+    return {major_id: sorted(class_code_names) for major_id, class_code_names in major_id_to_class_code_names.items()}
+
+
+def init_worker(db_path, major_id_to_class_code_names, engine):
+    global worker_catalog
+    conn = sqlite3.connect(db_path)
+    try:
+        worker_catalog = load_catalog(conn)
+        for major_id, class_code_names in major_id_to_class_code_names.items():
+            major_catalog = worker_catalog.get_major(major_id)
+            if major_catalog is None:
+                continue
+            solver = ScheduleSolver(major_catalog, engine=engine)
+            # Unknown classes are reported by the requests selecting them
+            solver.index_classes([class_code_name for class_code_name in class_code_names
+                                  if class_code_name in major_catalog.class_code_name_to_id_map])
+            worker_solvers[major_id] = solver
+    finally:
+        conn.close()
+
+
+def get_results_file_name(student_id):
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', str(student_id)) + '.jsonl'
+
+
+# Solves one request in a worker and returns its summary, the results are written into their own file
+def solve_student(request, output_directory_path, default_limit):
+    start_time = time.perf_counter()
+    summary = {'student_id': request['student_id'], 'error': None, 'result_count': None, 'written_count': 0}
+    solver = worker_solvers.get(worker_catalog.find_major_id(request.get('major', '')))
+    selected_class_code_names = parse_slots(request.get('slots', []))
+    try:
+        excluded_time_blocks = [parse_time_block(text) for text in request.get('exclude', [])]
+    except (ValueError, AttributeError): # e.g. a number instead of the text of a time block
+        excluded_time_blocks = None
+    if isinstance(request, InvalidRequest):
+        summary.update(error='invalid_request', line_number=request['line_number'])
+    elif solver is None:
+        summary.update(error='major_not_found', major=request.get('major'))
+    elif excluded_time_blocks is None:
+        summary.update(error='invalid_time_block', time_blocks=request.get('exclude'))
+    else:
+        selection_error = check_selection(solver.major_catalog, selected_class_code_names)
+        if selection_error is not None:
+            summary.update(selection_error[1], error=selection_error[0])
+    if summary['error'] is not None:
+        summary['seconds'] = round(time.perf_counter() - start_time, 6)
+        return summary
+
+    metrics = SolveMetrics()
+    # A failing request is recorded in its own summary instead of stopping the whole batch
+    try:
+        prepared = solver.prepare(ScheduleRequest(selected_class_code_names, excluded_time_blocks, request.get('taken', []),
+                                                  rank_results=request.get('rank', False), sampling_mode=request.get('sample'),
+                                                  sample_seed=request.get('seed', 0)), metrics)
+        if prepared.empty_slot_reasons:
+            summary.update(get_empty_slot_details(prepared), error='empty_slots')
+        else:
+            results = solver.solve(prepared, metrics)
+            with open(os.path.join(output_directory_path, get_results_file_name(request['student_id'])), 'w') as f:
+                summary['written_count'] = write_results(results, request.get('limit', default_limit), f, solver.major_catalog,
+                                                         worker_catalog.professors, prepared.course_id_to_same_time_course_ids_map)
+            summary['result_count'] = results.total_count()
+            metrics.result_count = summary['result_count']
+    except Exception as e:
+        summary.update(error='solve_failed', message=f'{type(e).__name__}: {e}')
+    metrics.finish()
+    summary['solve_metrics'] = metrics.as_dict()
+    summary['seconds'] = round(time.perf_counter() - start_time, 6)
+    return summary
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.exists(args.db):
+        print(json.dumps({'error': 'database_not_found', 'db': args.db}), file=sys.stderr)
+        return 1
+    requests = read_requests(args.requests)
+    conn = sqlite3.connect(args.db)
+    try:
+        major_id_to_class_code_names = group_class_code_names_by_major(load_catalog(conn), requests)
+    finally:
+        conn.close()
+    if not os.path.exists(args.output):
+        os.makedirs(args.output)
+
+    start_time = time.perf_counter()
+    initargs = (args.db, major_id_to_class_code_names, args.engine)
+    if args.workers <= 1:
+        init_worker(*initargs)
+        summaries = [solve_student(request, args.output, args.limit) for request in requests]
+    else:
+        # Every worker loads the catalog once, the requests are handed out in chunks to keep the messaging low
+        chunk_size = max(1, len(requests) // (args.workers * 4))
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker, initargs=initargs) as executor:
+            summaries = list(executor.map(solve_student, requests, repeat(args.output), repeat(args.limit), chunksize=chunk_size))
+    total_seconds = time.perf_counter() - start_time
+
+    with open(os.path.join(args.output, SUMMARY_FILE_NAME), 'w') as f:
+        for summary in summaries:
+            f.write(json.dumps(summary) + '\n')
+    print(json.dumps({
+        'request_count': len(summaries),
+        'error_count': sum(summary['error'] is not None for summary in summaries),
+        'total_seconds': round(total_seconds, 6),
+    }))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
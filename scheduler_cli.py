@@ -0,0 +1,150 @@
+# Solves a selection without the GUI and prints every result as one JSON line, e.g.
+# python scheduler_cli.py --db courses.db --major 1 --slot "MAT 101|MAT 103" --slot "FIZ 101" --exclude "1,08:30,10:30" --taken "MAT 100"
+from solver.catalog_snapshot import load_catalog
+from solver.schedule_solver import ScheduleSolver, ScheduleRequest
+from solver.solve_metrics import SolveMetrics
+import argparse, json, os, sqlite3, sys
+
+
+def parse_time(text):
+    hour, minute = text.split(':')
+    return int(hour) * 60 + int(minute)
+
+
+# 'DAY,HH:MM,HH:MM' -> (day, start_time, end_time) with the times in minutes, Monday is day 1 and Friday is day 5.
+# Raises ValueError if the text is not such a time block
+def parse_time_block(text):
+    day, start_time, end_time = text.split(',')
+    time_block = (int(day), parse_time(start_time), parse_time(end_time))
+    if not 1 <= time_block[0] <= 5 or not 0 <= time_block[1] < time_block[2] <= 24 * 60:
+        raise ValueError(f'invalid time block {text!r}')
+    return time_block
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Finds the schedules of the selected classes and prints them as JSON lines.')
+    parser.add_argument('--db', default='courses.db', help='path of the course database')
+    parser.add_argument('--major', required=True, help='id or name of the major')
+    parser.add_argument('--slot', action='append', default=[], help="'|' separated class code names, one of them is taken in the slot")
+    parser.add_argument('--exclude', action='append', default=[], help="'DAY,HH:MM,HH:MM' time block no course may collide with")
+    parser.add_argument('--taken', action='append', default=[], help='class code of an already taken class')
+    parser.add_argument('--engine', choices=['search', 'parallel', 'vectorized'], default='search')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='processes of the parallel engine')
+    parser.add_argument('--rank', action='store_true', help='print only the best results in the order of their scores')
+    parser.add_argument('--sample', choices=['random', 'diverse'], help='print a sample of the results')
+    parser.add_argument('--sample-count', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--limit', type=int, help='print at most this many results')
+    parser.add_argument('--count', action='store_true', help='print only the number of results')
+    parser.add_argument('--metrics', action='store_true', help='print the timings and counters of the solve to stderr')
+    return parser.parse_args(argv)
+
+
+def print_error(error, **details):
+    print(json.dumps(dict(error=error, **details)), file=sys.stderr)
+
+
+# 'MAT 101|MAT 103' -> ['MAT 101', 'MAT 103'], slots without a class are left out
+def parse_slots(slot_texts):
+    selected_class_code_names = [[class_code_name.strip() for class_code_name in slot.split('|') if class_code_name.strip()] for slot in slot_texts]
+    return [slot for slot in selected_class_code_names if slot]
+
+
+# Returns (error, details) if the selection can not be solved for the major, None otherwise
+def check_selection(major_catalog, selected_class_code_names):
+    if not selected_class_code_names:
+        return 'no_slots', {}
+    unknown_class_code_names = [class_code_name for slot in selected_class_code_names for class_code_name in slot
+                                if class_code_name not in major_catalog.class_code_name_to_id_map]
+    if unknown_class_code_names:
+        return 'unknown_classes', {'class_code_names': unknown_class_code_names}
+    return None
+
+
+def get_empty_slot_details(prepared):
+    return {'slots': [{'class_code_names': slot, 'reason': reason} for slot, reason in prepared.empty_slot_reasons]}
+
+
+# Writes at most limit results as JSON lines and returns the number of them
+def write_results(results, limit, file, major_catalog, professors, course_id_to_same_time_course_ids_map):
+    index = 0
+    while limit is None or index < limit:
+        result = results.get(index)
+        if result is None:
+            break
+        file.write(json.dumps(result_to_dict(index, result, major_catalog, professors, course_id_to_same_time_course_ids_map)) + '\n')
+        index += 1
+    return index
+
+
+# Every course of a result is printed with the CRNs of the courses at the same time, best quota first
+def result_to_dict(index, result, major_catalog, professors, course_id_to_same_time_course_ids_map):
+    courses = []
+    for course_id in result:
+        crn, professor_id, class_id, time_tuples, quota = major_catalog.courses[course_id]
+        courses.append({
+            'class_code_name': major_catalog.classes[class_id][0],
+            'crn': crn,
+            'professor': professors[professor_id - 1] if 0 < professor_id <= len(professors) else None,
+            'time_tuples': [list(time_tuple) for time_tuple in time_tuples],
+            'quota': quota,
+            'same_time_crns': [major_catalog.courses[same_time_id][0] for same_time_id in course_id_to_same_time_course_ids_map.get(course_id, [course_id])],
+        })
+    return {'index': index, 'courses': courses}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.exists(args.db):
+        print_error('database_not_found', db=args.db)
+        return 1
+    try:
+        excluded_time_blocks = [parse_time_block(text) for text in args.exclude]
+    except ValueError:
+        print_error('invalid_time_block', time_blocks=args.exclude)
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    try:
+        catalog = load_catalog(conn)
+        major_id = catalog.find_major_id(args.major)
+        major_catalog = catalog.get_major(major_id) if major_id else None
+        if major_catalog is None:
+            print_error('major_not_found', major=args.major)
+            return 1
+    finally:
+        conn.close()
+
+    selected_class_code_names = parse_slots(args.slot)
+    selection_error = check_selection(major_catalog, selected_class_code_names)
+    if selection_error is not None:
+        print_error(selection_error[0], **selection_error[1])
+        return 1
+
+    solver = ScheduleSolver(major_catalog, engine=args.engine, worker_count=args.workers, sample_result_count=args.sample_count)
+    request = ScheduleRequest(selected_class_code_names, excluded_time_blocks, args.taken,
+                              rank_results=args.rank, sampling_mode=args.sample, sample_seed=args.seed)
+    metrics = SolveMetrics()
+    prepared = solver.prepare(request, metrics)
+    if prepared.empty_slot_reasons:
+        print_error('empty_slots', **get_empty_slot_details(prepared))
+        return 1
+
+    if args.count:
+        print(json.dumps({'count': solver.count(prepared)}))
+        return 0
+
+    results = solver.solve(prepared, metrics)
+    written_count = write_results(results, args.limit, sys.stdout, major_catalog, catalog.professors, prepared.course_id_to_same_time_course_ids_map)
+    # A limit of 0 prints nothing even if there are results
+    if written_count == 0 and not results.total_count():
+        print_error('no_combination', always_clashing_slot_pairs=solver.get_always_clashing_slot_pairs(prepared))
+    metrics.finish()
+    metrics.result_count = results.total_count()
+    if args.metrics:
+        print(json.dumps({'solve_metrics': metrics.as_dict()}), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
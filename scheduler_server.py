@@ -0,0 +1,258 @@
+# Serves the scheduler as a local HTTP/JSON service, e.g.
+# python scheduler_server.py --db courses.db --port 8080
+#   GET  /majors                      majors of the catalog
+#   GET  /majors/<major>/classes      classes of a major with their prerequisites
+#   POST /prerequisites               {"major": 1, "taken": ["MAT 100"], "class_code_names": ["MAT 101"]}
+#   POST /solve                       {"major": 1, "slots": ["MAT 101|MAT 103"], "exclude": ["1,08:30,10:30"], "taken": [], "page": 0, "page_size": 20}
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as SolveTimeout
+from collections import OrderedDict
+from urllib.parse import unquote
+from solver.catalog_snapshot import load_catalog
+from solver.schedule_solver import ScheduleSolver, ScheduleRequest
+from solver.search_progress import SearchProgress
+from solver.solve_metrics import SolveMetrics
+from scheduler_cli import parse_time_block, parse_slots, check_selection, get_empty_slot_details, result_to_dict
+import argparse, json, logging, os, sqlite3, sys, threading
+
+
+class ServiceError(Exception):
+    def __init__(self, status, error, details=None):
+        super().__init__(error)
+        self.status = status
+        self.error = error
+        self.details = details or {}
+
+
+class SchedulerService:
+    def __init__(self, catalog, engine='search', worker_count=4, queue_limit=16, timeout=10.0, page_size_limit=100, result_cache_size=64):
+        self.catalog = catalog # Every major is loaded before the service starts so no request reads the database
+        self.solvers = {major_id: ScheduleSolver(major_catalog, engine=engine) for major_id, major_catalog in catalog.major_catalogs.items()}
+        self.timeout = timeout # Seconds a solve may take before it is cancelled
+        self.page_size_limit = page_size_limit
+        self.result_cache_size = result_cache_size # Solved requests kept so that their next pages are not solved again
+        # Threads share the catalog and the cached results, a request is refused once every worker is busy and the queue is full
+        self.executor = ThreadPoolExecutor(max_workers=worker_count)
+        self.solve_slots = threading.BoundedSemaphore(worker_count + queue_limit)
+        self.result_cache = OrderedDict() # Holds request key -> (lock, ResultStream, PreparedSolve), least recently used first
+        self.result_cache_lock = threading.Lock()
+
+    def list_majors(self):
+        return {'majors': [{'major_id': major_id, 'major_name': major_name} for major_id, major_name in enumerate(self.catalog.majors, 1)]}
+
+    def list_classes(self, major):
+        major_catalog = self._get_solver(major).major_catalog
+        return {'classes': [{
+            'class_code_name': class_code_name,
+            'class_title': major_catalog.classes[class_id][1],
+            'prerequisites': major_catalog.classes[class_id][2],
+            'section_count': len(major_catalog.class_id_to_course_ids_map.get(class_id, [])),
+        } for class_code_name, class_id in sorted(major_catalog.class_code_name_to_id_map.items())]}
+
+    def check_prerequisites(self, body):
+        major_catalog = self._get_solver(body.get('major', '')).major_catalog
+        class_code_names = body.get('class_code_names', [])
+        selection_error = check_selection(major_catalog, [class_code_names] if class_code_names else [])
+        if selection_error is not None:
+            raise ServiceError(400, *selection_error)
+        taken_class_codes = set(body.get('taken', []))
+        return {'classes': [{
+            'class_code_name': class_code_name,
+            'satisfied': major_catalog.prerequisites_satisfied(major_catalog.class_code_name_to_id_map[class_code_name], taken_class_codes),
+            'prerequisites': major_catalog.classes[major_catalog.class_code_name_to_id_map[class_code_name]][2],
+        } for class_code_name in class_code_names]}
+
+    def solve(self, body):
+        solver = self._get_solver(body.get('major', ''))
+        page = body.get('page', 0)
+        page_size = body.get('page_size', 20)
+        if not isinstance(page, int) or not isinstance(page_size, int) or page < 0 or not 0 < page_size <= self.page_size_limit:
+            raise ServiceError(400, 'invalid_page', {'page_size_limit': self.page_size_limit})
+        # Time blocks are checked here since an invalid one would only fail inside the worker
+        try:
+            excluded_time_blocks = [parse_time_block(text) for text in body.get('exclude', [])]
+        except (ValueError, AttributeError, TypeError):
+            raise ServiceError(400, 'invalid_time_block', {'time_blocks': body.get('exclude')})
+        selected_class_code_names = parse_slots(body.get('slots', []))
+        selection_error = check_selection(solver.major_catalog, selected_class_code_names)
+        if selection_error is not None:
+            raise ServiceError(400, *selection_error)
+        request = ScheduleRequest(selected_class_code_names, excluded_time_blocks, body.get('taken', []),
+                                  rank_results=bool(body.get('rank', False)), sampling_mode=body.get('sample'), sample_seed=body.get('seed', 0))
+        if request.sampling_mode not in (None, 'random', 'diverse'):
+            raise ServiceError(400, 'invalid_sampling_mode')
+
+        if not self.solve_slots.acquire(blocking=False):
+            raise ServiceError(503, 'busy')
+        progress = SearchProgress()
+        future = self.executor.submit(self._solve_page, solver, request, page, page_size, progress)
+        # The slot is freed once the solve really stops, which is a bit after its request timed out
+        future.add_done_callback(lambda _: self.solve_slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except SolveTimeout:
+            progress.cancel()
+            raise ServiceError(504, 'timeout', {'timeout_seconds': self.timeout})
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # Accepts the id or the name of a major
+    def _get_solver(self, major):
+        solver = self.solvers.get(self.catalog.find_major_id(major))
+        if solver is None:
+            raise ServiceError(404, 'major_not_found', {'major': major})
+        return solver
+
+    # Runs in a worker, the request is only solved if none of its pages was asked for recently
+    def _solve_page(self, solver, request, page, page_size, progress):
+        key = json.dumps([solver.major_catalog.major_id, request.selected_class_code_names, sorted(request.excluded_time_blocks),
+                          sorted(request.taken_class_codes), request.rank_results, request.sampling_mode, request.sample_seed])
+        with self.result_cache_lock:
+            entry = self.result_cache.get(key)
+            if entry is not None:
+                self.result_cache.move_to_end(key)
+        metrics = None
+        if entry is None:
+            metrics = SolveMetrics()
+            prepared = solver.prepare(request, metrics)
+            if prepared.empty_slot_reasons:
+                raise ServiceError(422, 'empty_slots', get_empty_slot_details(prepared))
+            results = solver.solve(prepared, metrics, progress)
+            if progress.cancelled:
+                return None
+            metrics.finish()
+            entry = (threading.Lock(), results, prepared)
+            with self.result_cache_lock:
+                self.result_cache[key] = entry
+                while len(self.result_cache) > self.result_cache_size:
+                    self.result_cache.popitem(last=False)
+
+        # A stream pulls the next results from its search so only one thread may read it at a time
+        lock, results, prepared = entry
+        page_results = []
+        with lock:
+            for index in range(page * page_size, (page + 1) * page_size):
+                result = results.get(index)
+                if result is None:
+                    break
+                page_results.append(result_to_dict(index, result, solver.major_catalog, self.catalog.professors,
+                                                   prepared.course_id_to_same_time_course_ids_map))
+            result_count = results.total_count()
+        response = {'result_count': result_count, 'page': page, 'page_size': page_size, 'results': page_results}
+        if result_count == 0:
+            response['always_clashing_slot_pairs'] = solver.get_always_clashing_slot_pairs(prepared)
+        if metrics is not None:
+            response['solve_metrics'] = metrics.as_dict()
+        return response
+
+
+class SchedulerRequestHandler(BaseHTTPRequestHandler):
+    MAX_BODY_SIZE = 1024 * 1024 # 1 MB
+
+    def do_GET(self):
+        parts = [unquote(part) for part in self.path.split('?')[0].strip('/').split('/')]
+        if parts == ['majors']:
+            self._respond(self.server.service.list_majors)
+        elif len(parts) == 3 and parts[0] == 'majors' and parts[2] == 'classes':
+            self._respond(lambda: self.server.service.list_classes(parts[1]))
+        else:
+            self._send_json(404, {'error': 'not_found'})
+
+    def do_POST(self):
+        path = self.path.split('?')[0].rstrip('/')
+        if path == '/prerequisites':
+            self._respond(lambda: self.server.service.check_prerequisites(self._read_json_body()))
+        elif path == '/solve':
+            self._respond(lambda: self.server.service.solve(self._read_json_body()))
+        else:
+            self._send_json(404, {'error': 'not_found'})
+
+    def log_message(self, format, *args):
+        logging.getLogger('scheduler_logger').debug('%s - %s', self.address_string(), format % args)
+
+    def _respond(self, handle):
+        try:
+            self._send_json(200, handle())
+        except ServiceError as e:
+            self._send_json(e.status, dict(error=e.error, **e.details))
+        except Exception:
+            logging.getLogger('scheduler_logger').exception('request failed: %s', self.path)
+            self._send_json(500, {'error': 'internal_error'})
+
+    def _read_json_body(self):
+        content_length = (self.headers.get('Content-Length') or '0').strip()
+        # int() would also take a sign, underscores and non ASCII digits
+        if not (content_length.isascii() and content_length.isdigit()):
+            raise ServiceError(400, 'invalid_content_length')
+        content_length = int(content_length)
+        if content_length > self.MAX_BODY_SIZE:
+            raise ServiceError(413, 'body_too_large')
+        try:
+            body = json.loads(self.rfile.read(content_length) or b'{}')
+        except ValueError:
+            raise ServiceError(400, 'invalid_json')
+        if not isinstance(body, dict):
+            raise ServiceError(400, 'invalid_json')
+        return body
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class SchedulerHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128 # Connections waiting to be accepted, the default of 5 resets them under load
+    daemon_threads = True
+
+
+# Reads the whole catalog into memory, the database is not touched after this
+def preload_catalog(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        catalog = load_catalog(conn)
+        for major_id in range(1, len(catalog.majors) + 1):
+            catalog.get_major(major_id)
+    finally:
+        conn.close()
+    return catalog
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serves the scheduler over HTTP with JSON requests and responses.')
+    parser.add_argument('--db', default='courses.db', help='path of the course database')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--engine', choices=['search', 'vectorized'], default='search')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='threads solving the requests')
+    parser.add_argument('--queue-limit', type=int, default=16, help='solves waiting for a worker before new ones are refused')
+    parser.add_argument('--timeout', type=float, default=10.0, help='seconds a solve may take')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.exists(args.db):
+        print(json.dumps({'error': 'database_not_found', 'db': args.db}), file=sys.stderr)
+        return 1
+    service = SchedulerService(preload_catalog(args.db), engine=args.engine, worker_count=args.workers,
+                               queue_limit=args.queue_limit, timeout=args.timeout)
+    server = SchedulerHTTPServer((args.host, args.port), SchedulerRequestHandler)
+    server.service = service
+    print(f'Serving on http://{args.host}:{server.server_address[1]}', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
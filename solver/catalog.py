@@ -0,0 +1,200 @@
+from sortedcontainers import SortedDict
+from bisect import bisect_left, bisect_right
+from .prerequisite_index import PrerequisiteIndex, normalize_class_code
+from .catalog_schema import create_tables_if_not_exist, get_metadata
+
+
+class Catalog:
+    def __init__(self, conn, day_start_minutes=8 * 60 + 30, day_end_minutes=17 * 60 + 30, time_resolution=15):
+        self.conn = conn
+        self.day_start_minutes = day_start_minutes # 8:30
+        self.day_end_minutes = day_end_minutes # 17:30
+        self.time_resolution = time_resolution
+        self.majors = [] # Major names, the major id of the ith name is i + 1
+        self.professors = []
+        self.prerequisite_class_codes_set = set() # Normalized class codes of every class, see normalize_class_code()
+        self.catalog_version = ''
+        self.major_catalogs = {} # Holds major_id -> MajorCatalog, every major is read from the database once
+        self.snapshot = None # Compiled catalog the majors are read from instead of the database, see CatalogSnapshot
+
+    def load(self):
+        create_tables_if_not_exist(self.conn)
+        cursor = self.conn.cursor()
+
+        cursor.execute("SELECT major_name FROM Majors")
+        self.majors = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("SELECT professor_name FROM Professors")
+        self.professors = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("SELECT class_code_name FROM Classes")
+        self.prerequisite_class_codes_set = set(normalize_class_code(row[0]) for row in cursor.fetchall())
+
+        self.catalog_version = get_metadata(self.conn, 'catalog_version')
+        self.major_catalogs = {}
+        self.snapshot = None
+        return self
+
+    # The snapshot must be compiled with the same day start, day end and time resolution
+    def load_from_snapshot(self, snapshot):
+        self.majors = snapshot.get_strings('major_names')
+        self.professors = snapshot.get_strings('professor_names')
+        self.prerequisite_class_codes_set = set(snapshot.get_strings('prerequisite_class_codes'))
+        self.catalog_version = snapshot.catalog_version
+        self.major_catalogs = {}
+        self.snapshot = snapshot
+        return self
+
+    # Returns None if the major does not exist
+    def get_major(self, major_id):
+        if major_id not in self.major_catalogs:
+            major_catalog = MajorCatalog(major_id, self.day_start_minutes, self.day_end_minutes, self.time_resolution)
+            loaded = major_catalog.load_from_snapshot(self.snapshot) if self.snapshot is not None else major_catalog.load(self.conn)
+            if not loaded:
+                return None
+            self.major_catalogs[major_id] = major_catalog
+        return self.major_catalogs[major_id]
+
+    # Accepts the id or the name of a major, returns 0 if there is no such major
+    def find_major_id(self, major):
+        if str(major).isdigit():
+            return int(major) if 0 < int(major) <= len(self.majors) else 0
+        return self.majors.index(major) + 1 if major in self.majors else 0
+
+
+class MajorCatalog:
+    def __init__(self, major_id, day_start_minutes, day_end_minutes, time_resolution):
+        self.major_id = major_id
+        self.day_start_minutes = day_start_minutes
+        self.day_end_minutes = day_end_minutes
+        self.time_resolution = time_resolution
+        self.courses = {} # Holds course_id -> [crn, professor_id, class_id, [(day, start_time, end_time)], quota]
+        self.classes = {} # Holds class_id -> [class code name, class title, prerequisite or groups]
+        self.class_id_to_course_ids_map = {}
+        self.class_code_name_to_id_map = {}
+        self.class_code_to_class_ids_map = SortedDict() # Holds class_code -> SortedDict of class_number -> class_id
+        self.time_segment_boundaries = [] # Sorted minutes splitting a day into the segments used by the occupancy masks
+        self.course_masks = {} # Holds course_id -> weekly occupancy bitmask
+        self.course_id_to_time_group_id = {} # Holds course_id -> id shared by the courses with the same time tuples
+        self.prerequisite_index = None # Prerequisites of the classes compiled into bitset clauses
+
+    # Returns False if the major does not exist
+    def load(self, conn):
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT 1 FROM Majors WHERE major_id = ?", (self.major_id,))
+        if cursor.fetchone() is None:
+            return False
+
+        for course_id, crn, professor_id, class_id, quota, day, start_time, end_time in self._read_course_rows(cursor):
+            course = self.courses.get(course_id)
+            if course is None:
+                course = self.courses[course_id] = [crn, professor_id, class_id, [], quota]
+                self.class_id_to_course_ids_map.setdefault(class_id, []).append(course_id)
+            if day is not None:
+                course[3].append((day, start_time, end_time))
+
+        self._update_time_segment_boundaries()
+        self.course_masks = {course_id: self.time_tuples_to_mask(course[3]) for course_id, course in self.courses.items()}
+        self._update_time_group_ids()
+
+        for c in self._read_class_rows(cursor):
+            self._add_class(c[0], c[1], c[2], [] if c[3] == '' else [[or_item for or_item in or_group.split('|')] for or_group in c[3].split('&')])
+        self.prerequisite_index = PrerequisiteIndex(self.classes)
+        return True
+
+    # Takes the courses, masks and time groups as they were computed when the snapshot was compiled.
+    # Returns False if the major does not exist
+    def load_from_snapshot(self, snapshot):
+        major = snapshot.read_major(self.major_id)
+        if major is None:
+            return False
+        courses, self.time_segment_boundaries, course_masks, time_group_ids, classes = major
+        for (course_id, course), course_mask, time_group_id in zip(courses, course_masks, time_group_ids):
+            self.courses[course_id] = course
+            self.course_masks[course_id] = course_mask
+            self.course_id_to_time_group_id[course_id] = time_group_id
+            self.class_id_to_course_ids_map.setdefault(course[2], []).append(course_id)
+        for class_id, class_code_name, class_title, prerequisite_or_groups in classes:
+            self._add_class(class_id, class_code_name, class_title, prerequisite_or_groups)
+        self.prerequisite_index = PrerequisiteIndex(self.classes)
+        return True
+
+    def _add_class(self, class_id, class_code_name, class_title, prerequisite_or_groups):
+        self.classes[class_id] = [class_code_name, class_title, prerequisite_or_groups]
+        self.class_code_name_to_id_map[class_code_name] = class_id
+        # For example class_code = EHB, class_number = 335E
+        class_code, class_number = class_code_name.split(' ')
+        # setdefault() would build a SortedDict for every class, even when the class code already has one
+        class_number_to_id_map = self.class_code_to_class_ids_map.get(class_code)
+        if class_number_to_id_map is None:
+            class_number_to_id_map = self.class_code_to_class_ids_map[class_code] = SortedDict()
+        class_number_to_id_map[class_number] = class_id
+
+    # One row per time tuple of a course, a course without time tuples comes as a single row of NULL times
+    def _read_course_rows(self, cursor):
+        cursor.execute("""
+            SELECT Courses.course_id, crn, professor_id, class_id, quota, day, start_time, end_time
+            FROM MajorCourses
+            JOIN Courses ON Courses.course_id = MajorCourses.course_id
+            LEFT JOIN CourseTimes ON CourseTimes.course_id = Courses.course_id
+            WHERE MajorCourses.major_id = ?
+            ORDER BY Courses.course_id, CourseTimes.rowid""", (self.major_id,))
+        return cursor.fetchall()
+
+    def _read_class_rows(self, cursor):
+        cursor.execute("""
+            SELECT * FROM Classes WHERE class_id IN (
+                SELECT class_id FROM MajorCourses JOIN Courses ON Courses.course_id = MajorCourses.course_id
+                WHERE MajorCourses.major_id = ?)""", (self.major_id,))
+        return cursor.fetchall()
+
+    # Bit (day - 1) * segment_count + i is set if the ith segment of the day is occupied.
+    # Times between the boundaries, e.g. of an excluded time block, occupy the whole segments they fall in
+    # and the times before the first or after the last boundary occupy no segment
+    def time_tuples_to_mask(self, time_tuples):
+        boundaries = self.time_segment_boundaries
+        if not boundaries:
+            return 0
+        segment_count = len(boundaries) - 1
+        mask = 0
+        for day, start_time, end_time in time_tuples:
+            first_segment = max(bisect_right(boundaries, start_time) - 1, 0)
+            last_segment = min(bisect_left(boundaries, end_time), segment_count)
+            if last_segment > first_segment:
+                mask |= ((1 << (last_segment - first_segment)) - 1) << ((day - 1) * segment_count + first_segment)
+        return mask
+
+    def prerequisites_satisfied(self, class_id, taken_class_codes):
+        return self.prerequisite_index.is_eligible(class_id, self.prerequisite_index.to_bits(taken_class_codes))
+
+    # Resturns a new list that same time courses are excluded.
+    # Courses are grouped by their time group in one pass, the first course of every group represents it
+    def exclude_same_time_courses(self, old_list, course_id_to_same_time_course_ids_map):
+        time_group_id_to_course_ids = {}
+        for course_id in old_list:
+            time_group_id_to_course_ids.setdefault(self.course_id_to_time_group_id[course_id], []).append(course_id)
+
+        result_list = []
+        for same_time_ids in time_group_id_to_course_ids.values():
+            course_id_to_same_time_course_ids_map[same_time_ids[0]] = same_time_ids
+            result_list.append(same_time_ids[0])
+
+        return result_list
+
+    # The day is split at every time_resolution step between day_start_minutes and day_end_minutes
+    # and additionally at every start/end time of the loaded courses (e.g. 10:29),
+    # so that two masks share a bit exactly when the time tuples collide
+    def _update_time_segment_boundaries(self):
+        boundaries = set(range(self.day_start_minutes, self.day_end_minutes + 1, self.time_resolution))
+        for course in self.courses.values():
+            for _, start_time, end_time in course[3]:
+                boundaries.update((start_time, end_time))
+        self.time_segment_boundaries = sorted(boundaries)
+
+    # Gives the same id to every course that has the same time tuples, computed once per major
+    def _update_time_group_ids(self):
+        time_key_to_group_id = {}
+        for course_id, course in self.courses.items():
+            time_key = tuple(sorted(course[3]))
+            self.course_id_to_time_group_id[course_id] = time_key_to_group_id.setdefault(time_key, len(time_key_to_group_id))
@@ -0,0 +1,102 @@
+# Tables of the course database, shared by the catalog that reads it and the scraper that writes it
+SCHEMA_VERSION = 3 # 1: times only in Courses.time_tuples, 2: CourseTimes table, 3: MajorCourses table and indexes
+
+
+def create_tables_if_not_exist(conn):
+    cursor = conn.cursor()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS Courses (
+        course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        crn TEXT,
+        professor_id INTEGER,
+        class_id INTEGER,
+        time_tuples TEXT, -- Kept for the older versions, CourseTimes is read instead
+        quota INTEGER,
+        FOREIGN KEY(professor_id) REFERENCES Professors(professor_id),
+        FOREIGN KEY(class_id) REFERENCES Classes(class_id)
+    )''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS CourseTimes (
+        course_id INTEGER,
+        day INTEGER, -- 1 is Monday
+        start_time INTEGER, -- Minutes since midnight
+        end_time INTEGER,
+        FOREIGN KEY(course_id) REFERENCES Courses(course_id)
+    )''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS CourseTimesCourseId ON CourseTimes(course_id)')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS Classes (
+        class_id INTEGER PRIMARY KEY,
+        class_code_name TEXT,
+        class_title TEXT,
+        prerequisite_class_ids TEXT -- Store as a comma-separated string
+    )''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS Majors (
+        major_id INTEGER PRIMARY KEY,
+        major_name TEXT,
+        course_ids TEXT -- Kept for the older versions, MajorCourses is read instead
+    )''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS MajorCourses (
+        major_id INTEGER,
+        course_id INTEGER,
+        PRIMARY KEY(major_id, course_id),
+        FOREIGN KEY(major_id) REFERENCES Majors(major_id),
+        FOREIGN KEY(course_id) REFERENCES Courses(course_id)
+    ) WITHOUT ROWID''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS CoursesClassId ON Courses(class_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS ClassesClassCodeName ON Classes(class_code_name)')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS Professors (
+        professor_id INTEGER PRIMARY KEY,
+        professor_name TEXT
+    )''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS Metadata (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )''')
+    conn.commit()
+    _migrate(conn)
+
+
+# '1,510,630&3,510,630&0,0,0' -> [(1, 510, 630), (3, 510, 630)], the day 0 entries only pad the text to a fixed length
+def parse_time_tuples(time_tuples_text):
+    time_tuples = [tuple(int(item) for item in time_tuple.split(',')) for time_tuple in time_tuples_text.split('&') if time_tuple]
+    return [time_tuple for time_tuple in time_tuples if time_tuple[0] != 0]
+
+
+def insert_course_times(cursor, course_id_to_time_tuples_text):
+    cursor.executemany('INSERT INTO CourseTimes (course_id, day, start_time, end_time) VALUES (?, ?, ?, ?)',
+                       ((course_id,) + time_tuple for course_id, time_tuples_text in course_id_to_time_tuples_text
+                        for time_tuple in parse_time_tuples(time_tuples_text)))
+
+
+def insert_major_courses(cursor, major_id_to_course_ids_text):
+    cursor.executemany('INSERT OR IGNORE INTO MajorCourses (major_id, course_id) VALUES (?, ?)',
+                       ((major_id, int(course_id)) for major_id, course_ids_text in major_id_to_course_ids_text
+                        for course_id in (course_ids_text or '').split(',') if course_id))
+
+
+def get_metadata(conn, key, default=''):
+    row = conn.execute("SELECT value FROM Metadata WHERE key = ?", (key,)).fetchone()
+    return default if row is None else row[0]
+
+
+# Databases written by the older versions are brought up to SCHEMA_VERSION once
+def _migrate(conn):
+    cursor = conn.cursor()
+    schema_version = int(get_metadata(conn, 'schema_version', 1))
+    if schema_version >= SCHEMA_VERSION:
+        return
+    if schema_version < 2:
+        cursor.execute('DELETE FROM CourseTimes')
+        cursor.execute('SELECT course_id, time_tuples FROM Courses')
+        insert_course_times(cursor, cursor.fetchall())
+    if schema_version < 3:
+        cursor.execute('DELETE FROM MajorCourses')
+        cursor.execute('SELECT major_id, course_ids FROM Majors')
+        insert_major_courses(cursor, cursor.fetchall())
+    cursor.execute("INSERT OR REPLACE INTO Metadata (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+    conn.commit()
@@ -0,0 +1,253 @@
+from array import array
+from bisect import bisect_left
+from .catalog import Catalog
+from .catalog_schema import SCHEMA_VERSION, create_tables_if_not_exist, get_metadata
+import json, mmap, os, struct, sys
+
+UINT_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+INT_TYPECODE = 'i' if array('i').itemsize == 4 else 'l'
+# Magic, version, byte order (0 little, 1 big), size of the JSON directory following the header
+HEADER_FORMAT = '<4sIII'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAGIC = b'CSNP'
+VERSION = 2 # 2: prerequisite class codes normalized with a space between the letters and the digits
+SECTION_ALIGNMENT = 8
+# Holds section name -> typecode of its items. Strings are stored once and referred to by their index.
+# Every *_starts section has one more item than the rows it splits, the ith row owns the items from starts[i] to starts[i + 1]
+SECTION_TYPECODES = {
+    'string_starts': UINT_TYPECODE, # Byte offsets into string_data
+    'string_data': 'B', # UTF-8
+    'major_names': UINT_TYPECODE, # The major id of the ith name is i + 1
+    'professor_names': UINT_TYPECODE,
+    'prerequisite_class_codes': UINT_TYPECODE,
+    # Courses of every major sorted by course id
+    'course_ids': UINT_TYPECODE,
+    'course_crns': UINT_TYPECODE,
+    'course_professor_ids': UINT_TYPECODE,
+    'course_class_ids': UINT_TYPECODE,
+    'course_quotas': INT_TYPECODE,
+    'course_time_starts': UINT_TYPECODE,
+    'time_days': 'B',
+    'time_start_times': 'H',
+    'time_end_times': 'H',
+    # Classes of every major sorted by class id, a class owns prerequisite or groups which own class codes
+    'class_ids': UINT_TYPECODE,
+    'class_code_names': UINT_TYPECODE,
+    'class_titles': UINT_TYPECODE,
+    'class_group_starts': UINT_TYPECODE,
+    'group_item_starts': UINT_TYPECODE,
+    'group_items': UINT_TYPECODE,
+    # Indexed by major_id - 1
+    'major_course_starts': UINT_TYPECODE,
+    'major_course_indexes': UINT_TYPECODE, # Course rows of the major in the order of MajorCatalog.courses
+    'major_time_group_ids': UINT_TYPECODE, # Aligned with major_course_indexes
+    'major_boundary_starts': UINT_TYPECODE,
+    'major_boundaries': 'H',
+    'major_mask_sizes': UINT_TYPECODE, # Bytes of every little endian course mask of the major
+    'major_mask_starts': UINT_TYPECODE, # Byte offsets into mask_data
+    'mask_data': 'B',
+}
+
+
+# The snapshot lives next to the database, in memory databases have none
+def get_snapshot_file_addr(conn):
+    for _, name, file_addr in conn.execute('PRAGMA database_list'):
+        if name == 'main':
+            return file_addr + '.snapshot' if file_addr else None
+    return None
+
+
+# Reads the catalog from the snapshot of the database if the snapshot was compiled from its current data, otherwise from the database
+def load_catalog(conn, day_start_minutes=8 * 60 + 30, day_end_minutes=17 * 60 + 30, time_resolution=15):
+    catalog = Catalog(conn, day_start_minutes, day_end_minutes, time_resolution)
+    create_tables_if_not_exist(conn)
+    snapshot_file_addr = get_snapshot_file_addr(conn)
+    snapshot = CatalogSnapshot.load(snapshot_file_addr) if snapshot_file_addr else None
+    if snapshot is not None and snapshot.is_fresh(get_metadata(conn, 'catalog_version'), day_start_minutes, day_end_minutes, time_resolution):
+        return catalog.load_from_snapshot(snapshot)
+    return catalog.load()
+
+
+def _align(offset):
+    return -(-offset // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+
+# A compiled catalog in one memory mapped file, the columns are read in place when a major is loaded
+class CatalogSnapshot:
+    def __init__(self, directory, sections):
+        self.catalog_version = directory['catalog_version'] # Version of the database the snapshot was compiled from
+        self.schema_version = directory['schema_version']
+        self.day_start_minutes = directory['day_start_minutes']
+        self.day_end_minutes = directory['day_end_minutes']
+        self.time_resolution = directory['time_resolution']
+        self.sections = sections # Holds section name -> memoryview of the mapped file
+
+    def is_fresh(self, catalog_version, day_start_minutes, day_end_minutes, time_resolution):
+        return bool(catalog_version) and self.catalog_version == catalog_version and self.schema_version == SCHEMA_VERSION\
+            and (self.day_start_minutes, self.day_end_minutes, self.time_resolution) == (day_start_minutes, day_end_minutes, time_resolution)
+
+    def get_string(self, index):
+        string_starts = self.sections['string_starts']
+        return str(self.sections['string_data'][string_starts[index]:string_starts[index + 1]], 'utf-8')
+
+    def get_strings(self, section_name):
+        return [self.get_string(index) for index in self.sections[section_name]]
+
+    # Returns (courses as [(course_id, course)], time segment boundaries, course masks, time group ids, classes as
+    # [(class_id, class code name, class title, prerequisite or groups)]) or None if the major does not exist
+    def read_major(self, major_id):
+        sections = self.sections
+        if not 0 < major_id <= len(sections['major_names']):
+            return None
+        course_starts = sections['major_course_starts']
+        first_course, last_course = course_starts[major_id - 1], course_starts[major_id]
+        boundary_starts = sections['major_boundary_starts']
+        time_segment_boundaries = sections['major_boundaries'][boundary_starts[major_id - 1]:boundary_starts[major_id]].tolist()
+
+        time_starts, days, start_times, end_times = sections['course_time_starts'], sections['time_days'], sections['time_start_times'], sections['time_end_times']
+        course_ids, crns, professor_ids = sections['course_ids'], sections['course_crns'], sections['course_professor_ids']
+        course_class_ids, quotas = sections['course_class_ids'], sections['course_quotas']
+        string_starts, string_data = sections['string_starts'], sections['string_data']
+        courses = []
+        for course_index in sections['major_course_indexes'][first_course:last_course]:
+            time_tuples = [(days[i], start_times[i], end_times[i]) for i in range(time_starts[course_index], time_starts[course_index + 1])]
+            crn = crns[course_index]
+            courses.append((course_ids[course_index], [str(string_data[string_starts[crn]:string_starts[crn + 1]], 'utf-8'),
+                            professor_ids[course_index], course_class_ids[course_index], time_tuples, quotas[course_index]]))
+
+        mask_size, mask_start, mask_data = sections['major_mask_sizes'][major_id - 1], sections['major_mask_starts'][major_id - 1], sections['mask_data']
+        course_masks = [int.from_bytes(mask_data[mask_start + i * mask_size:mask_start + (i + 1) * mask_size], 'little')
+                        for i in range(last_course - first_course)]
+        time_group_ids = sections['major_time_group_ids'][first_course:last_course].tolist()
+
+        class_ids, group_starts, item_starts, items = sections['class_ids'], sections['class_group_starts'], sections['group_item_starts'], sections['group_items']
+        classes = []
+        for class_id in sorted(set(course[2] for _, course in courses)):
+            class_index = bisect_left(class_ids, class_id)
+            prerequisite_or_groups = [[self.get_string(item) for item in items[item_starts[group]:item_starts[group + 1]]]
+                                      for group in range(group_starts[class_index], group_starts[class_index + 1])]
+            classes.append((class_id, self.get_string(sections['class_code_names'][class_index]),
+                            self.get_string(sections['class_titles'][class_index]), prerequisite_or_groups))
+        return courses, time_segment_boundaries, course_masks, time_group_ids, classes
+
+    # Compiles every major of a catalog loaded from the database
+    @staticmethod
+    def write(file_addr, catalog):
+        major_catalogs = [catalog.get_major(major_id) for major_id in range(1, len(catalog.majors) + 1)]
+        sections = {section_name: array(typecode) for section_name, typecode in SECTION_TYPECODES.items()}
+        string_to_index = {}
+        string_data = bytearray()
+
+        def intern(string):
+            index = string_to_index.get(string)
+            if index is None:
+                index = string_to_index[string] = len(string_to_index)
+                sections['string_starts'].append(len(string_data))
+                string_data.extend(string.encode())
+            return index
+
+        sections['major_names'].extend(intern(major_name) for major_name in catalog.majors)
+        sections['professor_names'].extend(intern(professor_name) for professor_name in catalog.professors)
+        sections['prerequisite_class_codes'].extend(intern(class_code) for class_code in sorted(catalog.prerequisite_class_codes_set))
+
+        courses, classes = {}, {}
+        for major_catalog in filter(None, major_catalogs):
+            courses.update(major_catalog.courses)
+            classes.update(major_catalog.classes)
+        course_id_to_index = {}
+        for course_id in sorted(courses):
+            crn, professor_id, class_id, time_tuples, quota = courses[course_id]
+            course_id_to_index[course_id] = len(course_id_to_index)
+            sections['course_ids'].append(course_id)
+            sections['course_crns'].append(intern(crn))
+            sections['course_professor_ids'].append(professor_id)
+            sections['course_class_ids'].append(class_id)
+            sections['course_quotas'].append(quota)
+            sections['course_time_starts'].append(len(sections['time_days']))
+            for day, start_time, end_time in time_tuples:
+                sections['time_days'].append(day)
+                sections['time_start_times'].append(start_time)
+                sections['time_end_times'].append(end_time)
+        sections['course_time_starts'].append(len(sections['time_days']))
+
+        for class_id in sorted(classes):
+            class_code_name, class_title, prerequisite_or_groups = classes[class_id]
+            sections['class_ids'].append(class_id)
+            sections['class_code_names'].append(intern(class_code_name))
+            sections['class_titles'].append(intern(class_title))
+            sections['class_group_starts'].append(len(sections['group_item_starts']))
+            for or_group in prerequisite_or_groups:
+                sections['group_item_starts'].append(len(sections['group_items']))
+                sections['group_items'].extend(intern(class_code) for class_code in or_group)
+        sections['class_group_starts'].append(len(sections['group_item_starts']))
+        sections['group_item_starts'].append(len(sections['group_items']))
+
+        for major_catalog in major_catalogs:
+            sections['major_course_starts'].append(len(sections['major_course_indexes']))
+            sections['major_boundary_starts'].append(len(sections['major_boundaries']))
+            sections['major_mask_starts'].append(len(sections['mask_data']))
+            if major_catalog is None:
+                sections['major_mask_sizes'].append(0)
+                continue
+            course_ids = list(major_catalog.courses)
+            sections['major_course_indexes'].extend(course_id_to_index[course_id] for course_id in course_ids)
+            sections['major_time_group_ids'].extend(major_catalog.course_id_to_time_group_id[course_id] for course_id in course_ids)
+            sections['major_boundaries'].extend(major_catalog.time_segment_boundaries)
+            mask_size = (max((major_catalog.course_masks[course_id].bit_length() for course_id in course_ids), default=0) + 7) // 8
+            sections['major_mask_sizes'].append(mask_size)
+            for course_id in course_ids:
+                sections['mask_data'].frombytes(major_catalog.course_masks[course_id].to_bytes(mask_size, 'little'))
+        sections['major_course_starts'].append(len(sections['major_course_indexes']))
+        sections['major_boundary_starts'].append(len(sections['major_boundaries']))
+        sections['major_mask_starts'].append(len(sections['mask_data']))
+        sections['string_starts'].append(len(string_data))
+        sections['string_data'].frombytes(bytes(string_data))
+
+        # Section offsets are relative to the aligned end of the directory
+        directory = {'catalog_version': catalog.catalog_version, 'schema_version': SCHEMA_VERSION, 'day_start_minutes': catalog.day_start_minutes,
+                     'day_end_minutes': catalog.day_end_minutes, 'time_resolution': catalog.time_resolution, 'sections': {}}
+        offset = 0
+        for section_name, section in sections.items():
+            offset = _align(offset)
+            directory['sections'][section_name] = [offset, section.typecode, len(section)]
+            offset += len(section) * section.itemsize
+        directory_data = json.dumps(directory).encode()
+        data_start = _align(HEADER_SIZE + len(directory_data))
+
+        temp_file_addr = file_addr + '.tmp'
+        with open(temp_file_addr, 'wb') as f:
+            f.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, int(sys.byteorder == 'big'), len(directory_data)))
+            f.write(directory_data)
+            for section_name, section in sections.items():
+                f.write(b'\0' * (data_start + directory['sections'][section_name][0] - f.tell()))
+                f.write(section.tobytes())
+        os.replace(temp_file_addr, file_addr)
+
+    # Returns None if the file is missing or not valid
+    @classmethod
+    def load(cls, file_addr):
+        try:
+            with open(file_addr, 'rb') as f:
+                header = f.read(HEADER_SIZE)
+                if len(header) < HEADER_SIZE:
+                    return None
+                magic, version, big_endian, directory_size = struct.unpack(HEADER_FORMAT, header)
+                if magic != MAGIC or version != VERSION or big_endian != int(sys.byteorder == 'big'):
+                    return None
+                directory = json.loads(f.read(directory_size))
+                mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        data_start = _align(HEADER_SIZE + directory_size)
+        sections = {}
+        try:
+            for section_name, typecode in SECTION_TYPECODES.items():
+                offset, stored_typecode, item_count = directory['sections'][section_name]
+                size = item_count * array(typecode).itemsize
+                if stored_typecode != typecode or data_start + offset + size > len(mapped_file):
+                    return None
+                sections[section_name] = memoryview(mapped_file)[data_start + offset:data_start + offset + size].cast(typecode)
+            return cls(directory, sections)
+        except (KeyError, TypeError, ValueError):
+            return None
@@ -0,0 +1,90 @@
+from .search_progress import SearchCancelled
+
+
+class CombinationCounter:
+    def __init__(self, courses, conflict_index, excluded_time_blocks_mask=0, progress=None):
+        self.courses = courses # Holds a list of course ids for every slot
+        self.conflict_index = conflict_index
+        self.excluded_time_blocks_mask = excluded_time_blocks_mask
+        self.domains = []
+        self.future_bits = [] # Holds the courses of the ith and the following slots
+        self.slot_indexes = [] # Positions of every slot's courses in the index, result_at() follows the course lists
+        self.subtree_counts = {} # Holds (slot, relevant blocked bits) -> number of completions
+        self.node_count = 0 # Number of placements tried while counting
+        self.progress = progress # Optional SearchProgress, count() returns None if it is cancelled
+
+    # Returns the number of valid combinations without keeping any of them.
+    # Slots are placed in their own order and the number of completions only depends on which
+    # courses of the remaining slots are blocked, so it is computed once for every such state
+    def count(self):
+        self.subtree_counts = {}
+        self.node_count = 0
+        if self.courses == []:
+            return 0
+
+        self._init_domains()
+        try:
+            return self._count(0, 0)
+        except SearchCancelled:
+            return None
+        finally:
+            # The subtree counts are reused by result_at() which should not report to the finished search
+            self.progress = None
+
+    # Returns the course ids of the index-th result in the order of the slots and their courses, None if there is no such result.
+    # The subtree counts tell how many results every course of a slot leads to so only one path of the tree is followed
+    def result_at(self, index):
+        if self.courses == []:
+            return None
+        if self.domains == []:
+            self._init_domains()
+        if index < 0 or index >= self._count(0, 0):
+            return None
+
+        conflict_rows = self.conflict_index.conflict_rows
+        blocked_bits = 0
+        index_result = []
+        for i in range(len(self.courses)):
+            bits = self.domains[i] & ~blocked_bits
+            for course_index in self.slot_indexes[i]:
+                if not bits >> course_index & 1:
+                    continue
+                row = conflict_rows[course_index]
+                subtree_count = self._count(i + 1, blocked_bits | row)
+                if index < subtree_count:
+                    index_result.append(course_index)
+                    blocked_bits |= row
+                    break
+                index -= subtree_count
+        course_ids = self.conflict_index.course_ids
+        return [course_ids[index] for index in index_result]
+
+    def _init_domains(self):
+        self.domains = self.conflict_index.slot_domains(self.courses, self.excluded_time_blocks_mask)
+        self.slot_indexes = self.conflict_index.slot_indexes(self.courses)
+        self.future_bits = [0] * (len(self.courses) + 1)
+        for i in reversed(range(len(self.courses))):
+            self.future_bits[i] = self.future_bits[i + 1] | self.domains[i]
+
+    def _count(self, i, blocked_bits):
+        if i >= len(self.courses):
+            return 1
+
+        key = (i, blocked_bits & self.future_bits[i])
+        subtree_count = self.subtree_counts.get(key)
+        if subtree_count is not None:
+            return subtree_count
+
+        if self.progress is not None:
+            self.progress.update(self.node_count, 0)
+        conflict_rows = self.conflict_index.conflict_rows
+        subtree_count = 0
+        bits = self.domains[i] & ~blocked_bits
+        while bits:
+            lowest_bit = bits & -bits
+            bits ^= lowest_bit
+            self.node_count += 1
+            subtree_count += self._count(i + 1, blocked_bits | conflict_rows[lowest_bit.bit_length() - 1])
+
+        self.subtree_counts[key] = subtree_count
+        return subtree_count
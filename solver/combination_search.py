@@ -0,0 +1,113 @@
+def bit_count(bits):
+    return bin(bits).count('1')
+
+if hasattr(int, 'bit_count'):
+    bit_count = int.bit_count
+
+
+class CombinationSearch:
+    def __init__(self, courses, conflict_index, excluded_time_blocks_mask=0, static_order=False, progress=None):
+        self.courses = courses # Holds a list of course ids for every slot
+        self.conflict_index = conflict_index
+        self.excluded_time_blocks_mask = excluded_time_blocks_mask
+        # Slots are placed in their own order so the results are yielded already sorted like run() returns them
+        self.static_order = static_order
+        self._slot_indexes = [] # Positions of every slot's courses in the index, used to follow the course lists in static order
+        self.results = []
+        self.node_count = 0 # Number of placements tried during the last run
+        self.leaf_count = 0 # Number of results reached
+        self.clash_pruned_count = 0 # Number of placements abandoned because a remaining slot had no fitting course left
+        self.progress = progress # Optional SearchProgress, the generators raise SearchCancelled if it is cancelled
+
+    def run(self):
+        # Slots are visited in a dynamic order so the results are sorted back into the order of the slots
+        index_results = sorted(self._iter_index_results(), key=self.conflict_index.slot_order_key(self.courses))
+        course_ids = self.conflict_index.course_ids
+        self.results = [[course_ids[index] for index in result] for result in index_results]
+        return self.results
+
+    # Yields the results one by one in the order they are found instead of sorting them
+    def iter_results(self):
+        course_ids = self.conflict_index.course_ids
+        for result in self._iter_index_results():
+            yield [course_ids[index] for index in result]
+
+    # Every generator gets its own potential result so several enumerations can run side by side
+    def _iter_index_results(self):
+        self.node_count = 0
+        self.leaf_count = 0
+        self.clash_pruned_count = 0
+        if self.courses == []:
+            return
+
+        self._slot_indexes = self.conflict_index.slot_indexes(self.courses)
+        yield from self.iter_index_results_from(self.conflict_index.slot_domains(self.courses, self.excluded_time_blocks_mask))
+
+    # Searches only the part of the tree allowed by the given slot domains
+    def iter_index_results_from(self, domains):
+        if domains and all(domains):
+            # Holds conflict index positions of the placed courses
+            potential_result = [0] * len(domains)
+            yield from self._search(domains, list(range(len(domains))), potential_result)
+
+    # The slot with the fewest compatible courses is placed first and the courses colliding with
+    # the placed one are removed from the domains of the remaining slots.
+    # A branch is abandoned as soon as one of these domains becomes empty
+    def _search(self, domains, unassigned_slots, potential_result):
+        if unassigned_slots == []:
+            yield potential_result.copy()
+            return
+        if self.progress is not None:
+            self.progress.update(self.node_count, self.leaf_count)
+
+        slot = unassigned_slots[0]
+        if not self.static_order:
+            smallest_domain_size = bit_count(domains[slot])
+            for other_slot in unassigned_slots:
+                domain_size = bit_count(domains[other_slot])
+                if domain_size < smallest_domain_size:
+                    slot, smallest_domain_size = other_slot, domain_size
+        remaining_slots = [other_slot for other_slot in unassigned_slots if other_slot != slot]
+        conflict_rows = self.conflict_index.conflict_rows
+        if remaining_slots == []:
+            # Every course left in the domain of the last slot completes a result
+            for index in self._iter_domain(slot, domains[slot]):
+                self.node_count += 1
+                self.leaf_count += 1
+                potential_result[slot] = index
+                yield potential_result.copy()
+            return
+
+        for index in self._iter_domain(slot, domains[slot]):
+            self.node_count += 1
+            row = conflict_rows[index]
+            new_domains = domains.copy()
+            for other_slot in remaining_slots:
+                new_domains[other_slot] = domains[other_slot] & ~row
+                if not new_domains[other_slot]:
+                    self.clash_pruned_count += 1
+                    break
+            else:
+                potential_result[slot] = index
+                yield from self._search(new_domains, remaining_slots, potential_result)
+
+    # Yields the index positions of the courses in the domain, in the order of the slot's course list in static order
+    def _iter_domain(self, slot, bits):
+        if self.static_order:
+            for index in self._slot_indexes[slot]:
+                if bits >> index & 1:
+                    yield index
+            return
+        while bits:
+            lowest_bit = bits & -bits
+            bits ^= lowest_bit
+            yield lowest_bit.bit_length() - 1
+
+    # Number of nodes the leaf-only search visits: every prefix of the cartesian product
+    def exhaustive_node_count(self):
+        node_count = 0
+        prefix_count = 1
+        for course_ids in self.courses:
+            prefix_count *= len(course_ids)
+            node_count += prefix_count
+        return node_count
@@ -0,0 +1,63 @@
+class ConflictIndex:
+    def __init__(self, course_ids, course_masks):
+        self.course_ids = list(course_ids)
+        self.course_masks = course_masks
+        self.course_id_to_index = {course_id: index for index, course_id in enumerate(self.course_ids)}
+        self.conflict_rows = [] # Bit j of the ith row is set if the ith and jth courses collide
+        self._build_rows()
+
+    def _build_rows(self):
+        # Same time sections share a mask so the pairwise test is done once per distinct mask
+        mask_to_bits = {}
+        for index, course_id in enumerate(self.course_ids):
+            mask = self.course_masks[course_id]
+            mask_to_bits[mask] = mask_to_bits.get(mask, 0) | (1 << index)
+
+        masks = list(mask_to_bits.keys())
+        mask_to_row = {}
+        for mask in masks:
+            row = 0
+            for other_mask in masks:
+                if mask & other_mask:
+                    row |= mask_to_bits[other_mask]
+            mask_to_row[mask] = row
+
+        self.conflict_rows = [mask_to_row[self.course_masks[course_id]] for course_id in self.course_ids]
+
+    def covers(self, course_ids):
+        return all(course_id in self.course_id_to_index for course_id in course_ids)
+
+    def to_bits(self, course_ids):
+        bits = 0
+        for course_id in course_ids:
+            bits |= 1 << self.course_id_to_index[course_id]
+        return bits
+
+    # Positions of every slot's courses in the index, in the order of the slot's course list
+    def slot_indexes(self, courses):
+        return [[self.course_id_to_index[course_id] for course_id in course_ids] for course_ids in courses]
+
+    # Key sorting index results into the order of the slots and their course lists.
+    # The positions of the courses in the index depend on the selections the index was built for so they can not be used
+    def slot_order_key(self, courses):
+        slot_positions = [{index: position for position, index in enumerate(indexes)} for indexes in self.slot_indexes(courses)]
+        return lambda index_result: [slot_positions[slot][index] for slot, index in enumerate(index_result)]
+
+    # Bits of the courses overlapping the given occupancy mask, e.g. the excluded time blocks
+    def overlapping_bits(self, mask):
+        bits = 0
+        for index, course_id in enumerate(self.course_ids):
+            if self.course_masks[course_id] & mask:
+                bits |= 1 << index
+        return bits
+
+    # Holds a bitset of the compatible courses for every slot,
+    # courses overlapping an excluded time block are left out
+    def slot_domains(self, courses, excluded_time_blocks_mask=0):
+        excluded_bits = self.overlapping_bits(excluded_time_blocks_mask)
+        return [self.to_bits(course_ids) & ~excluded_bits for course_ids in courses]
+
+    # True if every course of the first list collides with every course of the second one
+    def always_conflict(self, course_ids_1, course_ids_2):
+        bits_2 = self.to_bits(course_ids_2)
+        return all(self.conflict_rows[self.course_id_to_index[course_id]] & bits_2 == bits_2 for course_id in course_ids_1)
@@ -0,0 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import namedtuple
+from .combination_search import CombinationSearch, bit_count
+from .search_progress import SearchCancelled
+import os
+
+# The part of the conflict index the workers need, sent once to every worker process
+SearchSnapshot = namedtuple('SearchSnapshot', ['course_ids', 'conflict_rows'])
+
+_worker_snapshot = None
+
+def _init_worker(snapshot):
+    global _worker_snapshot
+    _worker_snapshot = snapshot
+
+def _search_branch(domains):
+    search = CombinationSearch(None, _worker_snapshot)
+    index_results = list(search.iter_index_results_from(domains))
+    return index_results, search.node_count, search.clash_pruned_count
+
+
+class ParallelCombinationSearch:
+    def __init__(self, courses, conflict_index, excluded_time_blocks_mask=0, worker_count=None, branches_per_worker=4, progress=None):
+        self.courses = courses # Holds a list of course ids for every slot
+        self.conflict_index = conflict_index
+        self.excluded_time_blocks_mask = excluded_time_blocks_mask
+        self.worker_count = worker_count or os.cpu_count() or 1
+        self.branches_per_worker = branches_per_worker
+        self.results = []
+        self.node_count = 0 # Number of placements tried by all of the workers
+        self.leaf_count = 0
+        self.clash_pruned_count = 0
+        self.progress = progress # Optional SearchProgress, the results of the finished branches are returned if it is cancelled
+
+    # Returns the same results in the same order as CombinationSearch.run()
+    def run(self):
+        self.results = []
+        self.node_count = 0
+        self.leaf_count = 0
+        self.clash_pruned_count = 0
+        if self.courses == []:
+            return self.results
+
+        domains = self.conflict_index.slot_domains(self.courses, self.excluded_time_blocks_mask)
+        if not all(domains):
+            return self.results
+
+        branches = self._split_into_branches(domains, self.worker_count * self.branches_per_worker)
+        snapshot = SearchSnapshot(self.conflict_index.course_ids, self.conflict_index.conflict_rows)
+        index_results = []
+        with ProcessPoolExecutor(max_workers=self.worker_count, initializer=_init_worker, initargs=(snapshot,)) as executor:
+            # map returns the branches in the order they were submitted
+            try:
+                for branch_index_results, branch_node_count, branch_clash_pruned_count in executor.map(_search_branch, branches):
+                    index_results.extend(branch_index_results)
+                    self.node_count += branch_node_count
+                    self.clash_pruned_count += branch_clash_pruned_count
+                    if self.progress is not None:
+                        self.progress.update(self.node_count, len(index_results))
+            except SearchCancelled:
+                # Only the running branches are waited for
+                executor.shutdown(cancel_futures=True)
+
+        index_results.sort(key=self.conflict_index.slot_order_key(self.courses))
+        self.leaf_count = len(index_results)
+        course_ids = self.conflict_index.course_ids
+        self.results = [[course_ids[index] for index in result] for result in index_results]
+        return self.results
+
+    # Every branch fixes the courses of some slots and narrows the domains of the others.
+    # The most constrained slot of every branch is split until there are enough branches
+    def _split_into_branches(self, domains, branch_count_target):
+        branches = [domains]
+        while len(branches) < branch_count_target:
+            new_branches = []
+            for branch_domains in branches:
+                new_branches.extend(self._split_branch(branch_domains))
+            if len(new_branches) == len(branches):
+                break
+            branches = new_branches
+        return branches
+
+    def _split_branch(self, domains):
+        open_slots = [slot for slot in range(len(domains)) if bit_count(domains[slot]) > 1]
+        if open_slots == []:
+            return [domains]
+
+        slot = min(open_slots, key=lambda slot: bit_count(domains[slot]))
+        conflict_rows = self.conflict_index.conflict_rows
+        branches = []
+        bits = domains[slot]
+        while bits:
+            lowest_bit = bits & -bits
+            bits ^= lowest_bit
+            row = conflict_rows[lowest_bit.bit_length() - 1]
+            branch_domains = [domain & ~row for domain in domains]
+            branch_domains[slot] = lowest_bit
+            if all(branch_domains):
+                branches.append(branch_domains)
+        return branches
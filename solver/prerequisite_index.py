@@ -0,0 +1,45 @@
+import re
+
+# The E suffix marks the English sections of a class, e.g. MAT 101E, they count as the same class for the prerequisites
+CLASS_CODE_PATTERN = re.compile(r'^([A-Z]+)\s*(\d+)E?$')
+
+
+# 'mat103', 'MAT 103' and 'MAT103E' all give 'MAT 103', codes of another shape only get their spaces and case normalized
+def normalize_class_code(class_code):
+    class_code = ' '.join(class_code.upper().split())
+    match = CLASS_CODE_PATTERN.match(class_code)
+    return f'{match.group(1)} {match.group(2)}' if match else class_code
+
+
+class PrerequisiteIndex:
+    # classes holds class_id -> [class code name, class title, prerequisite or groups]
+    def __init__(self, classes):
+        self.class_code_to_bit = {} # Holds normalized class code -> bit of the class code in the taken bits
+        # Holds class_id -> clauses, a class is eligible if the taken bits share a bit with every clause.
+        # Classes without prerequisites have no clauses
+        self.class_id_to_clauses = {}
+        for class_id, class_items in classes.items():
+            self.class_id_to_clauses[class_id] = [self._to_clause(or_group) for or_group in class_items[2]]
+
+    def _to_clause(self, or_class_codes):
+        clause = 0
+        for class_code in or_class_codes:
+            clause |= 1 << self.class_code_to_bit.setdefault(normalize_class_code(class_code), len(self.class_code_to_bit))
+        return clause
+
+    # Class codes that are no prerequisite of any class are left out since they can not satisfy a clause
+    def to_bits(self, taken_class_codes):
+        taken_bits = 0
+        for class_code in taken_class_codes:
+            bit = self.class_code_to_bit.get(normalize_class_code(class_code))
+            if bit is not None:
+                taken_bits |= 1 << bit
+        return taken_bits
+
+    def is_eligible(self, class_id, taken_bits):
+        return all(taken_bits & clause for clause in self.class_id_to_clauses[class_id])
+
+    # Evaluates every class in one pass, called whenever the taken classes change
+    def get_eligible_class_ids(self, taken_class_codes):
+        taken_bits = self.to_bits(taken_class_codes)
+        return set(class_id for class_id, clauses in self.class_id_to_clauses.items() if all(taken_bits & clause for clause in clauses))
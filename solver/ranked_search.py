@@ -0,0 +1,148 @@
+from .combination_search import bit_count
+from .search_progress import SearchCancelled
+import heapq
+
+
+class RankedCombinationSearch:
+    # Default weights of the objective, every schedule gets
+    # campus_days * days + idle_gaps * idle hours + early_start * hours before day_end_time the week starts - quota * seats
+    # and the schedules with the smallest scores are the best ones
+    DEFAULT_WEIGHTS = {'campus_days': 10.0, 'idle_gaps': 1.0, 'early_start': 1.0, 'quota': 0.05}
+
+    def __init__(self, courses, conflict_index, course_time_tuples, course_quotas, excluded_time_blocks_mask=0,
+                 weights=None, result_limit=100, day_end_minutes=17 * 60 + 30, time_resolution=15, progress=None):
+        self.courses = courses # Holds a list of course ids for every slot
+        self.conflict_index = conflict_index
+        self.course_time_tuples = course_time_tuples # Holds course_id -> (day, start_time, end_time) tuples
+        self.course_quotas = course_quotas # Holds course_id -> best quota amongst its same time courses
+        self.excluded_time_blocks_mask = excluded_time_blocks_mask
+        self.weights = dict(self.DEFAULT_WEIGHTS, **(weights or {}))
+        self.result_limit = result_limit
+        self.day_end_minutes = day_end_minutes
+        self.time_resolution = time_resolution # Idle gaps shorter than this are ignored, e.g. 10:29 -> 10:30
+        self.results = []
+        self.scores = []
+        self.node_count = 0 # Number of placements tried during the last run
+        self.pruned_count = 0 # Number of branches cut because they could not beat the current top results
+        self.leaf_count = 0 # Number of complete results scored
+        self.clash_pruned_count = 0 # Number of placements abandoned because a remaining slot had no fitting course left
+        self.progress = progress # Optional SearchProgress, the best results found so far are returned if it is cancelled
+
+    # Returns at most result_limit results sorted from the best to the worst score
+    def run(self):
+        self.results = []
+        self.scores = []
+        self.node_count = 0
+        self.pruned_count = 0
+        self.leaf_count = 0
+        self.clash_pruned_count = 0
+        if self.courses == []:
+            return self.results
+
+        domains = self.conflict_index.slot_domains(self.courses, self.excluded_time_blocks_mask)
+        if not all(domains):
+            return self.results
+
+        course_ids = self.conflict_index.course_ids
+        # Per course values used by the bounds, indexed like the conflict index
+        self._day_bits = [0] * len(course_ids)
+        self._earliest_starts = [self.day_end_minutes] * len(course_ids)
+        self._quotas = [0] * len(course_ids)
+        for index, course_id in enumerate(course_ids):
+            for day, start_time, _ in self.course_time_tuples[course_id]:
+                self._day_bits[index] |= 1 << day
+                self._earliest_starts[index] = min(self._earliest_starts[index], start_time)
+            self._quotas[index] = self.course_quotas.get(course_id, 0)
+
+        # Max heap of (-score, -position of every course in its slot's course list, result) holding the best results found so far.
+        # Equal scores are ordered like the slots so the results do not depend on the positions of the courses in the index
+        self._top_results = []
+        self._order_key = self.conflict_index.slot_order_key(self.courses)
+        self._found_count = 0
+        potential_result = [0] * len(self.courses)
+        try:
+            self._search(domains, list(range(len(self.courses))), potential_result, 0, self.day_end_minutes, 0)
+        except SearchCancelled:
+            pass
+
+        ranked = sorted((-negative_score, [-position for position in negative_key], result) for negative_score, negative_key, result in self._top_results)
+        self.scores = [score for score, _, _ in ranked]
+        self.results = [[course_ids[index] for index in result] for _, _, result in ranked]
+        return self.results
+
+    def _search(self, domains, unassigned_slots, potential_result, day_bits, earliest_start, quota_sum):
+        if unassigned_slots == []:
+            self._add_result(potential_result, day_bits, earliest_start, quota_sum)
+            return
+        if self.progress is not None:
+            self.progress.update(self.node_count, self._found_count)
+
+        if len(self._top_results) >= self.result_limit:
+            # Branches that can only tie with the worst top result are still searched since they may come first in the slot order
+            if self._lower_bound(domains, unassigned_slots, day_bits, earliest_start, quota_sum) > -self._top_results[0][0]:
+                self.pruned_count += 1
+                return
+
+        slot = min(unassigned_slots, key=lambda slot: bit_count(domains[slot]))
+        remaining_slots = [other_slot for other_slot in unassigned_slots if other_slot != slot]
+        conflict_rows = self.conflict_index.conflict_rows
+        bits = domains[slot]
+        while bits:
+            lowest_bit = bits & -bits
+            bits ^= lowest_bit
+            index = lowest_bit.bit_length() - 1
+            self.node_count += 1
+            row = conflict_rows[index]
+            new_domains = domains.copy()
+            for other_slot in remaining_slots:
+                new_domains[other_slot] = domains[other_slot] & ~row
+                if not new_domains[other_slot]:
+                    self.clash_pruned_count += 1
+                    break
+            else:
+                potential_result[slot] = index
+                self._search(new_domains, remaining_slots, potential_result, day_bits | self._day_bits[index],
+                             min(earliest_start, self._earliest_starts[index]), quota_sum + self._quotas[index])
+
+    # Campus days and the early start only grow when courses are added and idle gaps can shrink to zero,
+    # while every remaining slot can add at most the best quota left in its domain
+    def _lower_bound(self, domains, unassigned_slots, day_bits, earliest_start, quota_sum):
+        best_remaining_quota = 0
+        for slot in unassigned_slots:
+            bits = domains[slot]
+            best_quota = 0
+            while bits:
+                lowest_bit = bits & -bits
+                bits ^= lowest_bit
+                best_quota = max(best_quota, self._quotas[lowest_bit.bit_length() - 1])
+            best_remaining_quota += best_quota
+        return self.weights['campus_days'] * bit_count(day_bits)\
+            + self.weights['early_start'] * (self.day_end_minutes - earliest_start) / 60\
+            - self.weights['quota'] * (quota_sum + best_remaining_quota)
+
+    def _add_result(self, potential_result, day_bits, earliest_start, quota_sum):
+        score = self.weights['campus_days'] * bit_count(day_bits)\
+            + self.weights['idle_gaps'] * self._idle_gap_minutes(potential_result) / 60\
+            + self.weights['early_start'] * (self.day_end_minutes - earliest_start) / 60\
+            - self.weights['quota'] * quota_sum
+        self._found_count += 1
+        self.leaf_count += 1
+        item = (-score, [-position for position in self._order_key(potential_result)], potential_result.copy())
+        if len(self._top_results) < self.result_limit:
+            heapq.heappush(self._top_results, item)
+        elif item > self._top_results[0]:
+            heapq.heapreplace(self._top_results, item)
+
+    def _idle_gap_minutes(self, potential_result):
+        course_ids = self.conflict_index.course_ids
+        day_to_time_blocks = {}
+        for index in potential_result:
+            for day, start_time, end_time in self.course_time_tuples[course_ids[index]]:
+                day_to_time_blocks.setdefault(day, []).append((start_time, end_time))
+
+        idle_minutes = 0
+        for time_blocks in day_to_time_blocks.values():
+            time_blocks.sort()
+            for (_, previous_end_time), (start_time, _) in zip(time_blocks, time_blocks[1:]):
+                idle_minutes += max(0, start_time - previous_end_time) // self.time_resolution * self.time_resolution
+        return idle_minutes
@@ -0,0 +1,44 @@
+import random
+
+
+class ResultSampler:
+    def __init__(self, counter, total_count, seed=0):
+        self.counter = counter # Counted CombinationCounter of the slots
+        self.total_count = total_count # Returned by counter.count()
+        self.seed = seed # The same seed draws the same results for the same slots
+
+    # Every result is equally likely since the indices are drawn uniformly and result_at() maps them to distinct results
+    def sample(self, count):
+        if self.total_count <= count:
+            return [self.counter.result_at(index) for index in range(self.total_count)]
+        rng = random.Random(self.seed)
+        # sample() takes the len() of its population which overflows past sys.maxsize results, so the indices are drawn one by one.
+        # count is at most a fraction of the results most of the time, few draws are repeated
+        indices = []
+        drawn_indices = set()
+        while len(indices) < count:
+            index = rng.randrange(self.total_count)
+            if index not in drawn_indices:
+                drawn_indices.add(index)
+                indices.append(index)
+        return [self.counter.result_at(index) for index in indices]
+
+    # Greedily picks the results from a uniform pool that differ from the already picked ones in the most slots
+    def diverse_sample(self, count, pool_factor=10):
+        pool = self.sample(count * pool_factor)
+        if len(pool) <= count:
+            return pool
+
+        picked = [pool[0]]
+        # Holds the number of differing slots to the closest picked result for every result in the pool
+        min_distances = [self._distance(pool[0], result) for result in pool]
+        while len(picked) < count:
+            best_index = max(range(len(pool)), key=lambda index: min_distances[index])
+            picked.append(pool[best_index])
+            for index, result in enumerate(pool):
+                min_distances[index] = min(min_distances[index], self._distance(pool[best_index], result))
+        return picked
+
+    @staticmethod
+    def _distance(result_1, result_2):
+        return sum(course_id_1 != course_id_2 for course_id_1, course_id_2 in zip(result_1, result_2))
@@ -0,0 +1,88 @@
+from itertools import islice
+from .result_table import ResultTable
+
+
+class ResultStream:
+    def __init__(self, search=None, results=None, buffer_limit=10000, lookahead=20, total_count=None, indexer=None):
+        self.search = search # Object with an iter_results() generator, None if all of the results are given
+        self.indexer = indexer # Optional object with result_at(index) giving the results in the order of the search
+        self.buffer_limit = buffer_limit # At most this many results are kept in memory from the beginning of the stream
+        self.lookahead = lookahead # Results pulled ahead of the requested one so the next pages are ready
+        # Results are kept in a compact table, given lists of course ids are copied into one
+        self.results = results if isinstance(results, ResultTable) else ResultTable.from_results(results or [])
+        self.found_count = len(self.results)
+        self.finished = search is None
+        self.known_total_count = total_count # Set if the results were counted before the enumeration
+        # Given results are the beginning of the search so the search continues after them
+        self._generator = None if search is None else islice(search.iter_results(), len(self.results), None)
+        # Results after the buffer limit are enumerated again on demand and only a window of them is kept
+        self._window_start = 0
+        self._window = []
+
+    def __len__(self):
+        return self.found_count if self.known_total_count is None else self.known_total_count
+
+    def __bool__(self):
+        return len(self) > 0
+
+    # Total number of results or None if they are neither counted nor enumerated yet
+    def total_count(self):
+        if self.known_total_count is not None:
+            return self.known_total_count
+        return self.found_count if self.finished else None
+
+    def set_total_count(self, total_count, indexer=None):
+        self.known_total_count = total_count
+        if indexer is not None:
+            self.indexer = indexer
+
+    # Pulls at most step results from the search, returns True once all of the results are counted
+    def advance(self, step):
+        if self.total_count() is None:
+            self._pull(step)
+        return self.total_count() is not None
+
+    def get(self, index):
+        if index < 0:
+            return None
+        # Results that are neither searched nor next in line are computed directly
+        if self.indexer is not None and index >= len(self.results)\
+            and (index >= self.buffer_limit or index > self.found_count + self.lookahead):
+            return self.indexer.result_at(index)
+        if index < self.buffer_limit:
+            self._pull_until(min(index + self.lookahead + 1, self.buffer_limit))
+        # Results given at the beginning are all kept even if there are more than buffer_limit of them
+        if index < len(self.results):
+            return self.results[index]
+        if index < self.buffer_limit:
+            return None
+        return self._get_from_window(index)
+
+    def buffered_results(self):
+        return self.results
+
+    def _pull_until(self, count):
+        while not self.finished and self.found_count < count:
+            self._pull(count - self.found_count)
+
+    def _pull(self, step):
+        pulled_count = 0
+        for result in islice(self._generator, step):
+            if self.found_count < self.buffer_limit:
+                self.results.append(result)
+            self.found_count += 1
+            pulled_count += 1
+        if pulled_count < step:
+            self.finished = True
+            self._generator = None
+
+    def _get_from_window(self, index):
+        if self.total_count() is not None and index >= self.total_count():
+            return None
+        if not self._window_start <= index < self._window_start + len(self._window):
+            if self.search is None:
+                return None
+            self._window_start = index
+            self._window = list(islice(self.search.iter_results(), index, index + self.lookahead + 1))
+        offset = index - self._window_start
+        return self._window[offset] if offset < len(self._window) else None
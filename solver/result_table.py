@@ -0,0 +1,92 @@
+from array import array
+import mmap, os, struct, sys
+
+# Course ids are stored as 4 byte unsigned integers
+TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+# Magic, version, byte order (0 little, 1 big), slot count, result count
+HEADER_FORMAT = '<4sIIII'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAGIC = b'RTBL'
+VERSION = 1
+
+
+class ResultTable:
+    # Results are kept row by row in one flat buffer, every row holds the course ids of slot_count slots
+    def __init__(self, slot_count=0):
+        self.slot_count = slot_count
+        self.data = array(TYPECODE)
+        self._mapped_file_addr = None # Set while data is a read only view of a memory mapped file
+
+    @classmethod
+    def from_results(cls, results):
+        table = cls()
+        for result in results:
+            table.append(result)
+        return table
+
+    def __len__(self):
+        return len(self.data) // self.slot_count if self.slot_count else 0
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('result index out of range')
+        start = index * self.slot_count
+        return list(self.data[start:start + self.slot_count])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, result):
+        if self._mapped_file_addr is not None:
+            # Mapped files are never written, the rows are copied into memory first
+            self.data = array(TYPECODE, self.data)
+            self._mapped_file_addr = None
+        if not self.slot_count:
+            self.slot_count = len(result)
+        self.data.extend(result)
+
+    def nbytes(self):
+        return len(self.data) * self.data.itemsize
+
+    def tolist(self):
+        return list(self)
+
+    def save(self, file_addr):
+        # The file already holds these rows and it can not be replaced while it is mapped on some systems
+        if self._mapped_file_addr is not None and os.path.abspath(self._mapped_file_addr) == os.path.abspath(file_addr):
+            return
+        temp_file_addr = file_addr + '.tmp'
+        with open(temp_file_addr, 'wb') as f:
+            f.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, int(sys.byteorder == 'big'), self.slot_count, len(self)))
+            f.write(self.data.tobytes() if isinstance(self.data, array) else self.data.cast('B'))
+        os.replace(temp_file_addr, file_addr)
+
+    # Returns an empty table if the file is missing or not valid.
+    # The rows are read from the mapped file when they are accessed instead of being parsed on load
+    @classmethod
+    def load(cls, file_addr):
+        table = cls()
+        if not os.path.exists(file_addr):
+            return table
+        with open(file_addr, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                return table
+            magic, version, big_endian, slot_count, result_count = struct.unpack(HEADER_FORMAT, header)
+            data_size = slot_count * result_count * array(TYPECODE).itemsize
+            if magic != MAGIC or version != VERSION or os.fstat(f.fileno()).st_size != HEADER_SIZE + data_size:
+                return table
+            table.slot_count = slot_count
+            if data_size == 0:
+                return table
+            if big_endian != int(sys.byteorder == 'big'):
+                table.data.frombytes(f.read())
+                table.data.byteswap()
+                return table
+            mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        table.data = memoryview(mapped_file)[HEADER_SIZE:].cast(TYPECODE)
+        table._mapped_file_addr = file_addr
+        return table
@@ -0,0 +1,343 @@
+from .combination_search import CombinationSearch
+from .conflict_index import ConflictIndex
+from .result_stream import ResultStream
+from .combination_counter import CombinationCounter
+from .parallel_search import ParallelCombinationSearch
+from .vectorized_search import VectorizedCombinationSearch
+from .ranked_search import RankedCombinationSearch
+from .search_progress import SearchCancelled
+from .result_sampler import ResultSampler
+from .solve_metrics import SolveMetrics
+import threading
+
+
+class ScheduleRequest:
+    def __init__(self, selected_class_code_names, excluded_time_blocks=(), taken_class_codes=(),
+                 rank_results=False, sampling_mode=None, sample_seed=0):
+        self.selected_class_code_names = selected_class_code_names # Class code names of the options of every slot
+        self.excluded_time_blocks = set(excluded_time_blocks) # Holds (day, start_time, end_time) tuples. start_time & end_time in minutes
+        self.taken_class_codes = set(taken_class_codes)
+        self.rank_results = rank_results # Only the best results are found in the order of their scores
+        # None finds every result, 'random' draws uniformly random results and 'diverse' the most different ones of a random pool.
+        # Ranking the results takes precedence over sampling them
+        self.sampling_mode = sampling_mode
+        self.sample_seed = sample_seed
+
+
+# Holds everything ScheduleSolver.prepare() derives from a request
+class PreparedSolve:
+    def __init__(self, request):
+        self.request = request
+        self.selected_class_ids = []
+        self.usable_class_code_names = [] # Selected class code names of every slot whose prerequisites are satisfied
+        self.excluded_time_blocks_mask = 0
+        self.courses = [] # Course ids of every slot with one course for every group of same time courses
+        self.course_id_to_same_time_course_ids_map = {}
+        self.empty_slot_reasons = [] # Holds (class code names, reason) for every slot left without a course
+        self.conflict_index = None
+
+    # What the results are based on if they are updated incrementally later, None if they can not be the base of such an update
+    def selection(self):
+        if self.request.sampling_mode is not None and not self.request.rank_results:
+            # A sample misses most of the results
+            return None
+        return (self.usable_class_code_names, set(self.request.excluded_time_blocks), self.request.rank_results)
+
+
+class ScheduleSolver:
+    REASON_PREREQS_NOT_SATISFIED = 'prerequisites_not_satisfied'
+    REASON_NO_SECTION = 'no_section'
+    REASON_ALL_SECTIONS_EXCLUDED = 'all_sections_excluded'
+
+    def __init__(self, major_catalog, engine='search', worker_count=1, result_buffer_limit=10000, result_lookahead=20,
+                 ranking_weights=None, ranked_result_limit=100, sample_result_count=100,
+                 vectorized_combination_limit=VectorizedCombinationSearch.DEFAULT_COMBINATION_LIMIT):
+        self.major_catalog = major_catalog
+        self.engine = engine # 'search', 'parallel' or 'vectorized'
+        self.worker_count = worker_count # Number of processes used by the parallel engine
+        self.result_buffer_limit = result_buffer_limit # Results kept in memory, later ones are enumerated again when they are needed
+        self.result_lookahead = result_lookahead # Results searched ahead of the requested one
+        self.ranking_weights = dict(RankedCombinationSearch.DEFAULT_WEIGHTS if ranking_weights is None else ranking_weights)
+        self.ranked_result_limit = ranked_result_limit # Number of best results kept if the results are ranked
+        self.sample_result_count = sample_result_count # Number of results drawn if the results are sampled
+        # Selections with more combinations are searched with pruning even if the vectorized engine is selected
+        self.vectorized_combination_limit = vectorized_combination_limit
+        self.conflict_index = None # Reused by the next requests until one of them selects a course it does not cover
+        self._conflict_index_lock = threading.Lock() # Requests of one solver may be prepared in several threads, e.g. by the server
+
+    # Returns the PreparedSolve of the request, its empty_slot_reasons have to be empty for the request to be solved
+    def prepare(self, request, metrics=None):
+        if metrics is None:
+            metrics = SolveMetrics()
+        major_catalog = self.major_catalog
+        prepared = PreparedSolve(request)
+        with metrics.phase('map_ids'):
+            prepared.selected_class_ids = [[major_catalog.class_code_name_to_id_map[class_code_name] for class_code_name in slot]
+                                           for slot in request.selected_class_code_names]
+
+            # Prerequisites are checked at the class addition stage but the already taken classes may have changed since then
+            taken_bits = major_catalog.prerequisite_index.to_bits(request.taken_class_codes)
+            prepared.usable_class_code_names = [[major_catalog.classes[class_id][0] for class_id in slot
+                                                 if major_catalog.prerequisite_index.is_eligible(class_id, taken_bits)]
+                                                for slot in prepared.selected_class_ids]
+
+            # Filter not aplicable courses and duplicates in terms of day and time.
+            # Courses colliding with an excluded time block are left out before the search
+            prepared.excluded_time_blocks_mask = major_catalog.time_tuples_to_mask(request.excluded_time_blocks)
+            all_courses = [[course_id for class_code_name in slot
+                            for course_id in major_catalog.class_id_to_course_ids_map.get(major_catalog.class_code_name_to_id_map[class_code_name], [])]
+                           for slot in prepared.usable_class_code_names]
+            courses = [[course_id for course_id in course_ids if not major_catalog.course_masks[course_id] & prepared.excluded_time_blocks_mask]
+                       for course_ids in all_courses]
+            metrics.exclusion_pruned_count = sum(len(course_ids) for course_ids in all_courses) - sum(len(course_ids) for course_ids in courses)
+
+        with metrics.phase('group_same_time'):
+            course_id_to_same_time_course_ids_map = {}
+            prepared.courses = [major_catalog.exclude_same_time_courses(course_ids, course_id_to_same_time_course_ids_map) for course_ids in courses]
+            prepared.course_id_to_same_time_course_ids_map = {
+                course_id: sorted(same_time_ids, key=lambda item: major_catalog.courses[item][4], reverse=True)
+                for course_id, same_time_ids in course_id_to_same_time_course_ids_map.items()}
+        metrics.candidate_course_count = sum(len(course_ids) for course_ids in prepared.courses)
+
+        prepared.empty_slot_reasons = self._get_empty_slot_reasons(prepared)
+        with metrics.phase('index_conflicts'):
+            prepared.conflict_index = self._get_conflict_index(prepared.selected_class_ids)
+        return prepared
+
+    # Returns a ResultStream of the results, it only holds the results found so far if the solve was cancelled through progress.
+    # results_ready is called with the stream as soon as its first results can be used while the rest is still being calculated.
+    # previous holds (selection, results, same time map) of an earlier solve that the results are updated from if possible
+    def solve(self, prepared, metrics=None, progress=None, results_ready=None, previous=None):
+        if metrics is None:
+            metrics = SolveMetrics()
+        if previous is not None:
+            with metrics.phase('incremental'):
+                results = self._solve_incrementally(prepared, previous, metrics, progress)
+            if results is not None:
+                return results
+        return self._solve(prepared, metrics, progress, results_ready)
+
+    # Continues from results found before, e.g. by a cached solve. The search continues after them when more are needed.
+    # The results are in the order of the courses of every slot whichever conflict index found them, so the search skips exactly them
+    def resume(self, prepared, results, total_count, complete, metrics=None, progress=None):
+        if metrics is None:
+            metrics = SolveMetrics()
+        search = None
+        if not complete:
+            search = CombinationSearch(prepared.courses, prepared.conflict_index, prepared.excluded_time_blocks_mask, static_order=True)
+        result_stream = ResultStream(search, results=results, buffer_limit=self.result_buffer_limit,
+                                     lookahead=self.result_lookahead, total_count=total_count)
+        if search is not None:
+            self._index_result_stream(result_stream, prepared, metrics, progress)
+        return result_stream
+
+    # Returns the number of valid combinations without enumerating them
+    def count(self, prepared, progress=None):
+        return CombinationCounter(prepared.courses, prepared.conflict_index, prepared.excluded_time_blocks_mask, progress=progress).count()
+
+    # Returns the class code names of the slot pairs where no section of one slot fits next to any section of the other
+    def get_always_clashing_slot_pairs(self, prepared):
+        courses = prepared.courses
+        selected_class_code_names = prepared.request.selected_class_code_names
+        slot_pairs = []
+        for i in range(len(courses)):
+            for j in range(i + 1, len(courses)):
+                if courses[i] and courses[j] and prepared.conflict_index.always_conflict(courses[i], courses[j]):
+                    slot_pairs.append((selected_class_code_names[i], selected_class_code_names[j]))
+        return slot_pairs
+
+    # Builds one conflict index covering every section of the given classes so that the requests selecting only these classes share it
+    def index_classes(self, class_code_names):
+        with self._conflict_index_lock:
+            self.conflict_index = None
+        self._get_conflict_index([[self.major_catalog.class_code_name_to_id_map[class_code_name] for class_code_name in class_code_names]])
+
+    # Returns (class code names, reason) for every slot left without a course
+    def _get_empty_slot_reasons(self, prepared):
+        major_catalog = self.major_catalog
+        empty_slot_reasons = []
+        for i, course_ids in enumerate(prepared.courses):
+            if course_ids != []:
+                continue
+            if prepared.usable_class_code_names[i] == []:
+                reason = self.REASON_PREREQS_NOT_SATISFIED
+            elif all(major_catalog.class_id_to_course_ids_map.get(major_catalog.class_code_name_to_id_map[class_code_name], []) == []
+                     for class_code_name in prepared.usable_class_code_names[i]):
+                reason = self.REASON_NO_SECTION
+            else:
+                reason = self.REASON_ALL_SECTIONS_EXCLUDED
+            empty_slot_reasons.append((prepared.request.selected_class_code_names[i], reason))
+        return empty_slot_reasons
+
+    # The conflict index covers every section of the selected classes and is only rebuilt if one of them is missing
+    def _get_conflict_index(self, selected_class_ids):
+        candidate_course_ids = [course_id for slot in selected_class_ids for class_id in slot
+                                for course_id in self.major_catalog.class_id_to_course_ids_map.get(class_id, [])]
+        with self._conflict_index_lock:
+            conflict_index = self.conflict_index
+            if conflict_index is None or not conflict_index.covers(candidate_course_ids):
+                conflict_index = ConflictIndex(candidate_course_ids, self.major_catalog.course_masks)
+                self.conflict_index = conflict_index
+        return conflict_index
+
+    # Updates the previous results if they are all in memory and the selection only changed by
+    # added exclusion blocks, removed options or added options of the same slots.
+    # The streamed results of the default engine are only all in memory if there are few of them or they were all pulled,
+    # enumerating the rest here would cost as much as a new solve.
+    # Returns None if the results have to be calculated from scratch
+    def _solve_incrementally(self, prepared, previous, metrics, progress=None):
+        solved_selection, previous_results, previous_same_time_map = previous
+        request = prepared.request
+        if solved_selection is None or request.rank_results or request.sampling_mode is not None:
+            return None
+        solved_class_code_names, solved_excluded_time_blocks, solved_with_ranking = solved_selection
+        old_results = previous_results.buffered_results()
+        if solved_with_ranking or previous_results.total_count() != len(old_results)\
+            or len(solved_class_code_names) != len(prepared.usable_class_code_names)\
+            or not solved_excluded_time_blocks <= request.excluded_time_blocks: # a removed exclusion block allows new results anywhere
+            return None
+
+        major_catalog = self.major_catalog
+        courses = prepared.courses
+        conflict_index = prepared.conflict_index
+        excluded_time_blocks_mask = prepared.excluded_time_blocks_mask
+        course_id_to_same_time_course_ids_map = prepared.course_id_to_same_time_course_ids_map
+        # Removed options and added exclusion blocks only remove results.
+        # A course of a removed class may still be represented by a same time course of another class
+        course_id_to_representative_id = {same_time_id: course_id for course_id, same_time_ids in course_id_to_same_time_course_ids_map.items()
+                                          for same_time_id in same_time_ids}
+        slot_course_id_sets = [set(course_ids) for course_ids in courses]
+        old_course_id_to_new_course_id_maps = [{} for _ in courses]
+        for i, course_ids in enumerate(slot_course_id_sets):
+            for old_course_id in set(result[i] for result in old_results):
+                for same_time_id in previous_same_time_map.get(old_course_id, [old_course_id]):
+                    new_course_id = course_id_to_representative_id.get(same_time_id)
+                    if new_course_id in course_ids and not major_catalog.course_masks[new_course_id] & excluded_time_blocks_mask:
+                        old_course_id_to_new_course_id_maps[i][old_course_id] = new_course_id
+                        break
+        results = []
+        for result in old_results:
+            new_result = [old_course_id_to_new_course_id_maps[i].get(course_id) for i, course_id in enumerate(result)]
+            if None not in new_result:
+                results.append(new_result)
+
+        # Added options only add results that use one of the courses having no same time course in the old classes of the slot.
+        # The ith branch uses such a course in the ith changed slot and only old ones in the previous changed slots
+        solved_class_ids = [set(major_catalog.class_code_name_to_id_map[class_code_name] for class_code_name in slot) for slot in solved_class_code_names]
+        new_course_bits = [conflict_index.to_bits([course_id for course_id in course_ids
+                           if all(major_catalog.courses[same_time_id][2] not in solved_class_ids[i] for same_time_id in course_id_to_same_time_course_ids_map[course_id])])
+                           for i, course_ids in enumerate(courses)]
+        domains = conflict_index.slot_domains(courses, excluded_time_blocks_mask)
+        search = CombinationSearch(courses, conflict_index, excluded_time_blocks_mask)
+        metrics.source = 'incremental'
+        changed_slots = []
+        try:
+            for slot in range(len(courses)):
+                if not new_course_bits[slot]:
+                    continue
+                branch_domains = domains.copy()
+                branch_domains[slot] &= new_course_bits[slot]
+                for changed_slot in changed_slots:
+                    branch_domains[changed_slot] &= ~new_course_bits[changed_slot]
+                for result in search.iter_index_results_from(branch_domains):
+                    results.append([conflict_index.course_ids[index] for index in result])
+                    if progress is not None:
+                        progress.update(search.node_count, len(results))
+                changed_slots.append(slot)
+        except SearchCancelled:
+            pass
+        metrics.add_search(search)
+
+        # Sorted into the order of the slots and their courses
+        slot_positions = [{course_id: position for position, course_id in enumerate(course_ids)} for course_ids in courses]
+        results.sort(key=lambda result: [slot_positions[i][course_id] for i, course_id in enumerate(result)])
+        return self._make_result_stream(results, metrics)
+
+    # Only the first results are searched here and the rest is pulled when they are needed,
+    # they are counted after results_ready is called and any of them can be got directly after that
+    def _solve(self, prepared, metrics, progress=None, results_ready=None):
+        request = prepared.request
+        major_catalog = self.major_catalog
+        courses = prepared.courses
+        conflict_index = prepared.conflict_index
+        excluded_time_blocks_mask = prepared.excluded_time_blocks_mask
+        # These engines find all of the results at once
+        if request.rank_results:
+            # The same time courses are sorted by their quota so the first one has the best quota
+            course_quotas = {course_id: major_catalog.courses[same_time_ids[0]][4]
+                             for course_id, same_time_ids in prepared.course_id_to_same_time_course_ids_map.items()}
+            course_time_tuples = {course_id: major_catalog.courses[course_id][3] for course_id in conflict_index.course_ids}
+            search = RankedCombinationSearch(courses, conflict_index, course_time_tuples, course_quotas, excluded_time_blocks_mask,
+                                             weights=self.ranking_weights, result_limit=self.ranked_result_limit,
+                                             day_end_minutes=major_catalog.day_end_minutes, time_resolution=major_catalog.time_resolution,
+                                             progress=progress)
+            metrics.source = 'ranked'
+        elif request.sampling_mode is not None:
+            # The samples are drawn from the counted results so none of the engines has to enumerate them
+            metrics.source = request.sampling_mode + '_sample'
+            counter = CombinationCounter(courses, conflict_index, excluded_time_blocks_mask, progress=progress)
+            with metrics.phase('count'):
+                total_count = counter.count()
+            with metrics.phase('search'):
+                sampler = ResultSampler(counter, total_count or 0, seed=request.sample_seed)
+                if total_count is None:
+                    results = []
+                elif request.sampling_mode == 'diverse':
+                    results = sampler.diverse_sample(self.sample_result_count)
+                else:
+                    results = sampler.sample(self.sample_result_count)
+            metrics.add_search(counter)
+            return self._make_result_stream(results, metrics)
+        elif self.engine == 'parallel':
+            search = ParallelCombinationSearch(courses, conflict_index, excluded_time_blocks_mask, worker_count=self.worker_count,
+                                               progress=progress)
+            metrics.source = self.engine
+        elif self.engine == 'vectorized' and VectorizedCombinationSearch.fits(courses, self.vectorized_combination_limit):
+            search = VectorizedCombinationSearch(courses, major_catalog.course_masks, excluded_time_blocks_mask, progress=progress)
+            metrics.source = self.engine
+        else:
+            # Also searches the selections with too many combinations for the vectorized engine
+            search = None
+        if search is not None:
+            with metrics.phase('search'):
+                results = search.run()
+            metrics.add_search(search)
+            return self._make_result_stream(results, metrics)
+
+        # The slots are searched in their own order which is also the order of the counted results
+        metrics.source = 'search'
+        search = CombinationSearch(courses, conflict_index, excluded_time_blocks_mask, static_order=True)
+        with metrics.phase('search'):
+            result_stream = ResultStream(search, buffer_limit=self.result_buffer_limit, lookahead=self.result_lookahead)
+            # Only the first results can be cancelled, the later ones are pulled by the viewer after the solve returns
+            search.progress = progress
+            try:
+                result_stream.get(0)
+            except SearchCancelled:
+                pass
+            finally:
+                search.progress = None
+        # Only the searched part of the tree is counted, the rest is searched when the results are needed
+        metrics.add_search(search)
+        if progress is not None and progress.cancelled:
+            return result_stream
+        if result_stream and results_ready is not None:
+            results_ready(result_stream)
+        # The stream is not touched here anymore since the used results may pull from it meanwhile
+        if result_stream.total_count() is None:
+            self._index_result_stream(result_stream, prepared, metrics, progress)
+        return result_stream
+
+    def _make_result_stream(self, results, metrics):
+        with metrics.phase('store'):
+            metrics.record_result_memory(results)
+            return ResultStream(results=results, buffer_limit=self.result_buffer_limit, lookahead=self.result_lookahead)
+
+    # Counts the results so every one of them can be computed without searching the ones before it
+    def _index_result_stream(self, result_stream, prepared, metrics, progress=None):
+        counter = CombinationCounter(prepared.courses, prepared.conflict_index, prepared.excluded_time_blocks_mask, progress=progress)
+        with metrics.phase('count'):
+            total_count = counter.count()
+        metrics.add_search(counter)
+        if total_count is not None:
+            result_stream.set_total_count(total_count, indexer=counter)
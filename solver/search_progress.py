@@ -0,0 +1,27 @@
+import time
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+# Lets a search running in a background thread report how far it got and be stopped from another thread
+class SearchProgress:
+    def __init__(self, callback=None, report_interval=0.1):
+        self.callback = callback # Called with (node count, result count) at most once every report_interval seconds
+        self.report_interval = report_interval
+        self.cancelled = False
+        self._last_report_time = 0.0
+
+    def cancel(self):
+        self.cancelled = True
+
+    # Searches call this while they run, it raises SearchCancelled so deep recursions stop at once
+    def update(self, node_count, result_count):
+        if self.cancelled:
+            raise SearchCancelled()
+        if self.callback is not None:
+            now = time.monotonic()
+            if now - self._last_report_time >= self.report_interval:
+                self._last_report_time = now
+                self.callback(node_count, result_count)
@@ -0,0 +1,55 @@
+import hashlib, json, os
+
+
+class SolveCache:
+    # Part of every key so the entries of the older versions are not found. 2: results in the order of the courses of their slots
+    FORMAT_VERSION = 2
+
+    def __init__(self, directory, size_limit):
+        self.directory = directory
+        self.size_limit = size_limit # Least recently used entries are removed once the files take more bytes than this
+
+    # Inputs are serialised with sorted keys so equal inputs always give the same key
+    @staticmethod
+    def make_key(inputs):
+        return hashlib.sha256(json.dumps(dict(inputs, cache_format_version=SolveCache.FORMAT_VERSION), sort_keys=True).encode()).hexdigest()
+
+    def get(self, key):
+        file_addr = self._file_addr(key)
+        if not os.path.exists(file_addr):
+            return None
+        try:
+            with open(file_addr, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # The modification time is used as the last access time
+        os.utime(file_addr)
+        return entry
+
+    def put(self, key, entry):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        with open(self._file_addr(key), 'w') as f:
+            json.dump(entry, f)
+        self._evict()
+
+    def clear(self):
+        if not os.path.exists(self.directory):
+            return
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.json'):
+                os.remove(os.path.join(self.directory, file_name))
+
+    def _file_addr(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def _evict(self):
+        file_addrs = [os.path.join(self.directory, file_name) for file_name in os.listdir(self.directory) if file_name.endswith('.json')]
+        file_stats = sorted(((os.stat(file_addr), file_addr) for file_addr in file_addrs), key=lambda item: item[0].st_mtime)
+        total_size = sum(stat.st_size for stat, _ in file_stats)
+        for stat, file_addr in file_stats:
+            if total_size <= self.size_limit:
+                break
+            os.remove(file_addr)
+            total_size -= stat.st_size
@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+import sys, time
+
+
+class SolveMetrics:
+    def __init__(self):
+        self.phase_times = {} # Holds phase name -> seconds spent, a phase may run inside another one
+        self.start_time = time.perf_counter()
+        self.total_seconds = None # Set by finish()
+        self.source = '' # 'cache', 'incremental' or the name of the engine that found the results
+        self.node_count = 0 # Placements tried by the searches and the counter
+        self.leaf_count = 0 # Complete results reached by the searches
+        self.clash_pruned_count = 0 # Branches cut because a slot had no course left that fits the placed ones
+        self.bound_pruned_count = 0 # Branches cut by the ranking bound
+        self.exclusion_pruned_count = 0 # Courses left out before the search because they collide with an excluded time block
+        self.candidate_course_count = 0 # Courses of the slots the search chooses from
+        self.result_count = None # None if the results are not counted
+        self.peak_result_bytes = 0 # Largest memory held by a list or table of results during the solve
+        self.cancelled = False
+
+    def finish(self):
+        self.total_seconds = time.perf_counter() - self.start_time
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + time.perf_counter() - start
+
+    # Reads the counters of any of the searches, the ones a search does not have are left as they are
+    def add_search(self, search):
+        self.node_count += getattr(search, 'node_count', 0)
+        self.leaf_count += getattr(search, 'leaf_count', 0)
+        self.clash_pruned_count += getattr(search, 'clash_pruned_count', 0)
+        self.bound_pruned_count += getattr(search, 'pruned_count', 0)
+
+    # Results are either a ResultTable or a list of lists of course ids
+    def record_result_memory(self, results):
+        if hasattr(results, 'nbytes'):
+            result_bytes = results.nbytes()
+        else:
+            result_bytes = sys.getsizeof(results) + sum(sys.getsizeof(result) for result in results)
+        self.peak_result_bytes = max(self.peak_result_bytes, result_bytes)
+
+    def as_dict(self):
+        return {
+            'phase_seconds': {name: round(seconds, 6) for name, seconds in self.phase_times.items()},
+            'total_seconds': None if self.total_seconds is None else round(self.total_seconds, 6),
+            'source': self.source,
+            'node_count': self.node_count,
+            'leaf_count': self.leaf_count,
+            'clash_pruned_count': self.clash_pruned_count,
+            'bound_pruned_count': self.bound_pruned_count,
+            'exclusion_pruned_count': self.exclusion_pruned_count,
+            'candidate_course_count': self.candidate_course_count,
+            'result_count': self.result_count,
+            'peak_result_bytes': self.peak_result_bytes,
+            'cancelled': self.cancelled,
+        }
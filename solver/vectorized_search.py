@@ -0,0 +1,99 @@
+from .search_progress import SearchCancelled
+import numpy as np
+
+# Number of set bits of every byte value
+POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def popcount_words(words):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def mask_to_words(mask, word_count):
+    return np.array([(mask >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(word_count)], dtype=np.uint64)
+
+
+class VectorizedCombinationSearch:
+    def __init__(self, courses, course_masks, excluded_time_blocks_mask=0, block_size=65536, progress=None):
+        self.courses = courses # Holds a list of course ids for every slot
+        self.course_masks = course_masks # Holds course_id -> weekly occupancy bitmask
+        self.excluded_time_blocks_mask = excluded_time_blocks_mask
+        self.block_size = block_size # Number of combinations checked at once
+        self.results = []
+        self.node_count = 0 # Number of combinations checked during the last run
+        self.leaf_count = 0 # Number of valid combinations
+        self.clash_pruned_count = 0 # Number of combinations rejected because two of their courses collide
+        self.progress = progress # Optional SearchProgress, the results of the checked blocks are returned if it is cancelled
+
+    # Every combination is checked since nothing is pruned, about 2.5 million of them a second,
+    # so larger cartesian products are left to the pruned search
+    DEFAULT_COMBINATION_LIMIT = 1 << 22
+
+    # The product is computed with Python ints which do not overflow
+    @staticmethod
+    def combination_count(courses):
+        total_count = 1
+        for course_ids in courses:
+            total_count *= len(course_ids)
+        return total_count
+
+    @staticmethod
+    def fits(courses, combination_limit=DEFAULT_COMBINATION_LIMIT):
+        return VectorizedCombinationSearch.combination_count(courses) <= combination_limit
+
+    # Checks the cartesian product of the slots block by block and returns
+    # the same results in the same order as CombinationSearch.run()
+    def run(self):
+        self.results = []
+        self.node_count = 0
+        self.leaf_count = 0
+        self.clash_pruned_count = 0
+        if self.courses == [] or not all(self.courses):
+            return self.results
+        # The combinations are numbered with int64 flat indices
+        if self.combination_count(self.courses) + self.block_size > np.iinfo(np.int64).max:
+            raise OverflowError('the cartesian product of the slots does not fit into int64 indices')
+
+        all_masks = [self.course_masks[course_id] for course_ids in self.courses for course_id in course_ids]
+        bit_length = max([mask.bit_length() for mask in all_masks] + [self.excluded_time_blocks_mask.bit_length(), 1])
+        word_count = (bit_length + 63) // 64
+        # Holds an array of shape (courses of the slot, word_count) for every slot
+        slot_words = [np.array([mask_to_words(self.course_masks[course_id], word_count) for course_id in course_ids])
+                      for course_ids in self.courses]
+        slot_popcounts = [popcount_words(words) for words in slot_words]
+        excluded_words = mask_to_words(self.excluded_time_blocks_mask, word_count)
+        slot_sizes = np.array([len(course_ids) for course_ids in self.courses], dtype=np.int64)
+        # The last slot changes fastest so the flat indices follow the order of the slots
+        strides = np.ones(len(self.courses), dtype=np.int64)
+        for i in reversed(range(len(self.courses) - 1)):
+            strides[i] = strides[i + 1] * slot_sizes[i + 1]
+        total_count = int(strides[0] * slot_sizes[0])
+        course_id_arrays = [np.array(course_ids, dtype=np.int64) for course_ids in self.courses]
+
+        for block_start in range(0, total_count, self.block_size):
+            if self.progress is not None:
+                try:
+                    self.progress.update(self.node_count, len(self.results))
+                except SearchCancelled:
+                    break
+            flat_indices = np.arange(block_start, min(block_start + self.block_size, total_count), dtype=np.int64)
+            positions = (flat_indices[:, None] // strides) % slot_sizes
+            occupied_words = np.zeros((len(flat_indices), word_count), dtype=np.uint64)
+            popcount_sum = np.zeros(len(flat_indices), dtype=np.int64)
+            for i in range(len(self.courses)):
+                occupied_words |= slot_words[i][positions[:, i]]
+                popcount_sum += slot_popcounts[i][positions[:, i]]
+            # Two courses overlap exactly when the union has fewer bits than the courses together
+            no_clash = popcount_words(occupied_words) == popcount_sum
+            not_excluded = ~np.any(occupied_words & excluded_words, axis=1)
+            valid_positions = positions[no_clash & not_excluded]
+            self.node_count += len(flat_indices)
+            self.clash_pruned_count += int(np.count_nonzero(~no_clash))
+            if len(valid_positions):
+                valid_course_ids = np.stack([course_id_arrays[i][valid_positions[:, i]] for i in range(len(self.courses))], axis=1)
+                self.results.extend(valid_course_ids.tolist())
+
+        self.leaf_count = len(self.results)
+        return self.results
@@ -0,0 +1,36 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from solver.search_progress import SearchProgress
+
+# Solver Thread
+class SolverWorker(QThread):
+    progress_updated = pyqtSignal(int, int) # Signal with the number of explored nodes and found results
+    results_ready = pyqtSignal() # Emitted when the first results can be shown while the search goes on
+    thread_returned = pyqtSignal(bool) # Emits True if the calculation was cancelled
+    count_returned = pyqtSignal(object) # Emits the number of combinations or None if the count was cancelled, it may not fit into an int
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.backend = parent.backend
+        self.progress = None
+        self.counting = False # The thread counts the combinations instead of calculating them
+
+    def start_calculation(self):
+        self.counting = False
+        self.progress = SearchProgress(callback=self.progress_updated.emit)
+        self.start()
+
+    def start_count(self):
+        self.counting = True
+        self.progress = SearchProgress(callback=self.progress_updated.emit)
+        self.start()
+
+    def trigger_cancel(self):
+        if self.progress is not None:
+            self.progress.cancel()
+
+    def run(self):
+        if self.counting:
+            self.count_returned.emit(self.backend.run_count(self.progress))
+            return
+        finished = self.backend.run_calculation(self.progress, self.results_ready.emit)
+        self.thread_returned.emit(not finished)
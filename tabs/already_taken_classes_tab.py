@@ -1,7 +1,9 @@
 from PyQt5.QtWidgets import (QPushButton, QVBoxLayout,
 QHBoxLayout,QLabel, QLineEdit, QListWidget, QListWidgetItem, QWidget)
+from PyQt5.QtCore import pyqtSignal
 
 class AlreadyTakenClassesTab(QWidget):
+    taken_classes_changed = pyqtSignal()
     base_style = """
             QPushButton {
                 border: 2px solid black;
@@ -43,12 +45,14 @@ class AlreadyTakenClassesTab(QWidget):
         if class_code and self.backend.add_to_allready_taken_class_codes(class_code):
             self.add_class_item(class_code)
             self.class_input.clear()
+            self.taken_classes_changed.emit()
 
     def add_class_item(self, class_code):
         item = QListWidgetItem(self.class_list_widget)
 
         # Create a QWidget to hold the layout for class code and remove button
         item_widget = ClassRow(self.class_list_widget, self.backend, class_code, item)
+        item_widget.removed.connect(self.taken_classes_changed.emit)
         item.setSizeHint(item_widget.sizeHint())
         self.class_list_widget.addItem(item)
         self.class_list_widget.setItemWidget(item, item_widget)
@@ -62,12 +66,14 @@ class AlreadyTakenClassesTab(QWidget):
             widget.deleteLater()
             self.class_list_widget.takeItem(i)
             i -= 1
+        self.taken_classes_changed.emit()
 
     def load_classes(self):
         for class_code in self.backend.allready_taken_class_codes:
             self.add_class_item(class_code)
 
 class ClassRow(QWidget):
+    removed = pyqtSignal()
     base_style = """
             QPushButton {
                 border: 2px solid black;
@@ -99,4 +105,5 @@ class ClassRow(QWidget):
     def remove_class(self):
         self.backend.remove_from_allready_taken_class_codes(self.class_code)
         self.parent.takeItem(self.parent.row(self.item_ptr))
+        self.removed.emit()
         self.deleteLater()
\ No newline at end of file
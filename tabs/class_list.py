@@ -56,9 +56,14 @@ class ClassList(QListWidget):
         self.clear_list()
         self._load_list()
 
+    def update_eligibility(self):
+        for i in range(self.count()):
+            self.itemWidget(self.item(i)).update_button()
+
 class ClassRow(QWidget):
     BUTTON_TEXTS = ['Add', 'Remove']
     BUTTON_COLORS = ['#bada55', '#ff7373']
+    NOT_ELIGIBLE_COLOR = '#a0a0a0'
     ADD_STATE = 0
     REMOVE_STATE = 1
     button_base_style = """
@@ -98,12 +103,17 @@ class ClassRow(QWidget):
         self.layout.addWidget(self.add_or_remove_button)
 
     def update_button(self):
+        # Classes whose prerequisites are not satisfied can not be added, added ones can still be removed
+        eligible = self.button_state == self.REMOVE_STATE or self.class_id in self.backend.eligible_class_ids
+        self.add_or_remove_button.setEnabled(eligible)
         self.add_or_remove_button.setText(self.BUTTON_TEXTS[self.button_state])
         self.add_or_remove_button.setStyleSheet(self.button_base_style + f"""
             QPushButton {{
-                background-color: {self.BUTTON_COLORS[self.button_state]};
+                background-color: {self.BUTTON_COLORS[self.button_state] if eligible else self.NOT_ELIGIBLE_COLOR};
             }}
         """)
+        self.setToolTip('' if eligible else
+            f"Required Prerequisites are: {' and '.join('('+' or '.join(or_group)+')' for or_group in self.class_items[2])}")
     
     def toggle_button(self):
         self.button_state = (self.button_state + 1) % 2
@@ -45,6 +45,10 @@ class ClassPortfolioTab(QWidget):
         self.classes_list.clear()
         self.update_dropdown()
 
+    # Called when the already taken classes change
+    def update_eligibility(self):
+        self.classes_list.update_eligibility()
+
     def update_classes_list(self):
         class_code = self.class_code_dropdown.currentText()
         self.backend.current_class_code = class_code
@@ -0,0 +1,28 @@
+from PyQt5.QtWidgets import (QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QWidget)
+
+class SolverMetricsTab(QWidget):
+    def __init__(self, parent, backend):
+        super().__init__(parent)
+        layout = QVBoxLayout()
+        self.backend = backend
+
+        self.metrics_table = QTableWidget(self)
+        self.metrics_table.setColumnCount(2)
+        self.metrics_table.setHorizontalHeaderLabels(['Metric', 'Value'])
+        self.metrics_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.metrics_table.verticalHeader().setVisible(False)
+        self.metrics_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.metrics_table)
+
+        self.setLayout(layout)
+        self.update_metrics()
+
+    def update_metrics(self):
+        metrics = self.backend.solve_metrics.as_dict()
+        # Phase timings are shown one per row before the counters
+        rows = [(f'{name} (s)', f'{seconds:.6f}') for name, seconds in metrics.pop('phase_seconds').items()]
+        rows += [(name, '' if value is None else str(value)) for name, value in metrics.items()]
+        self.metrics_table.setRowCount(len(rows))
+        for row, (name, value) in enumerate(rows):
+            self.metrics_table.setItem(row, 0, QTableWidgetItem(name))
+            self.metrics_table.setItem(row, 1, QTableWidgetItem(value))
@@ -12,6 +12,7 @@ class TimeTableTab(QWidget):
     colors = ['#66cdaa', '#ffd700', '#e6e6fa', '#ffa500', '#40e0d0',
             '#ff7373', '#d3ffce', '#afeeee', '#faebd7', '#bada55',
             '#c39797', '#c0d6e4', '#ffc0cb', '#fff68f']
+    PAGE_INPUT_LIMIT = 2 ** 31 - 1 # Largest value of a QSpinBox, the results after it are reached with the next button
     def __init__(self, parent, backend):
         super().__init__(parent=parent)
         self.parent = parent
@@ -38,22 +39,30 @@ class TimeTableTab(QWidget):
         self.show_current_result()
 
     def update_time_table(self):
+        self.update_result_count()
+        if len(self.backend.results) == 0:
+            self.page_input.setValue(0)
+        else:
+            self._set_page_input_value(self.backend.current_result_index + 1)
+
+    # Called while the results are still being counted so the page input is left as it is
+    def update_result_count(self):
         total_result_count = len(self.backend.results)
         if total_result_count == 0:
             self.page_input.setRange(0, 0)
-            self.page_input.setValue(0)
         else:
-            self.page_input.setRange(1, total_result_count)
-            self.page_input.setValue(self.backend.current_result_index + 1)
-        self.total_result_count_label.setText(f'/ {total_result_count}')
+            self.page_input.setRange(1, min(total_result_count, self.PAGE_INPUT_LIMIT))
+        # The + shows that more results may be found, the label holds the exact count even if the page input can not reach it
+        self.total_result_count_label.setText(f"/ {total_result_count}{'' if self.backend.results.total_count() is not None else '+'}")
+        self.total_result_count_label.setToolTip('')
 
     def show_current_result(self):
         self.clear_time_table()
-        if self.backend.results == []:
+        course_ids = self.backend.get_current_result()
+        if course_ids is None:
             return
         
-        self.page_input.setValue(self.backend.current_result_index + 1)
-        course_ids = self.backend.results[self.backend.current_result_index]
+        self._set_page_input_value(self.backend.current_result_index + 1)
         self.courses_widgets = [[] for _ in course_ids]
         for course_index, course_id in enumerate(course_ids):
             for time_block_index, time_tuple in enumerate(self.backend.courses[course_id][3]):
@@ -66,6 +75,9 @@ class TimeTableTab(QWidget):
                 self.table_layout.addWidget(time_block, start_row, time_tuple[0], row_span, 1)
                 self.courses_widgets[course_index].append(time_block)
 
+    def _set_page_input_value(self, result_number):
+        self.page_input.setValue(min(result_number, self.PAGE_INPUT_LIMIT))
+
     def _show_specific_result(self):
         target_result_number = self.page_input.value()
         if target_result_number <= 0:
@@ -75,7 +87,7 @@ class TimeTableTab(QWidget):
             self.show_current_result()
 
     def show_next_result(self):
-        if self.backend.current_result_index + 1 >= len(self.backend.results):
+        if self.backend.results.get(self.backend.current_result_index + 1) is None:
             return
         self.backend.current_result_index += 1
         self.show_current_result()
@@ -150,7 +162,7 @@ class TimeTableTab(QWidget):
         self.page_input.setAlignment(Qt.AlignCenter)
         self.page_input.setFixedWidth(50)
         self.total_result_count_label = QLabel(self)
-        self.total_result_count_label.setFixedWidth(40)
+        self.total_result_count_label.setFixedWidth(100)
         font = QFont()
         font.setPointSize(14)
         self.total_result_count_label.setFont(font)
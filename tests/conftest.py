@@ -0,0 +1,82 @@
+# Course databases shaped like the scraped ones, the results of the solver are checked on them
+import pytest, random, sqlite3, os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver.catalog import Catalog
+from solver.catalog_schema import create_tables_if_not_exist, insert_course_times, insert_major_courses
+from solver.schedule_solver import ScheduleRequest
+
+CLASS_CODES = ['MAT', 'FIZ', 'EHB', 'BLG', 'KIM', 'ING']
+# Most of the lessons start on the half hours and end a minute early, e.g. 8:30-10:29, a few of them are off the grid
+START_TIMES = [510, 570, 630, 690, 750, 810, 870, 930, 545, 640, 835]
+DURATIONS = [60, 120, 180, 50]
+
+
+# Every class gets a few sections, some of them at the same time as the previous section
+def make_course_database(path, seed=0):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    create_tables_if_not_exist(conn)
+    cursor = conn.cursor()
+    cursor.executemany('INSERT INTO Professors VALUES (?, ?)', [(professor_id, f'Professor {professor_id}') for professor_id in range(1, 21)])
+    class_id = 0
+    course_id = 0
+    course_id_to_time_tuples_text = []
+    for class_code in CLASS_CODES:
+        for class_number in range(101, 109):
+            class_id += 1
+            cursor.execute('INSERT INTO Classes VALUES (?, ?, ?, ?)', (class_id, f'{class_code} {class_number}', f'{class_code} {class_number} title', ''))
+            time_tuples_text = ''
+            for _ in range(rng.randint(1, 8)):
+                course_id += 1
+                if not time_tuples_text or rng.random() > 0.3:
+                    time_tuples = []
+                    for day in sorted(rng.sample(range(1, 6), rng.randint(1, 3))):
+                        start_time = rng.choice(START_TIMES)
+                        time_tuples.append((day, start_time, start_time + rng.choice(DURATIONS) - 1))
+                    time_tuples_text = '&'.join(','.join(str(item) for item in time_tuple) for time_tuple in time_tuples)
+                cursor.execute('INSERT INTO Courses VALUES (?, ?, ?, ?, ?, ?)',
+                               (course_id, str(10000 + course_id), rng.randint(1, 20), class_id, time_tuples_text, rng.randint(1, 60)))
+                course_id_to_time_tuples_text.append((course_id, time_tuples_text))
+    insert_course_times(cursor, course_id_to_time_tuples_text)
+    major_id_to_course_ids_text = [(1, ','.join(str(course_id) for course_id in range(1, course_id + 1)))]
+    cursor.executemany('INSERT INTO Majors VALUES (?, ?, ?)', [(major_id, f'Major {major_id}', course_ids_text)
+                                                              for major_id, course_ids_text in major_id_to_course_ids_text])
+    insert_major_courses(cursor, major_id_to_course_ids_text)
+    conn.commit()
+    return conn
+
+
+@pytest.fixture(params=[0, 1, 2])
+def major_catalog(request, tmp_path):
+    conn = make_course_database(str(tmp_path / 'courses.db'), request.param)
+    major_catalog = Catalog(conn).load().get_major(1)
+    conn.close()
+    return major_catalog
+
+
+# Reference collision check working on the raw time tuples instead of the occupancy masks
+def overlaps(time_tuples, other_time_tuples):
+    return any(day == other_day and start_time < other_end_time and other_start_time < end_time
+               for day, start_time, end_time in time_tuples for other_day, other_start_time, other_end_time in other_time_tuples)
+
+
+# Class code names of the classes having at least one section
+def class_code_names_of(major_catalog):
+    return sorted(class_code_name for class_code_name, class_id in major_catalog.class_code_name_to_id_map.items()
+                  if major_catalog.class_id_to_course_ids_map.get(class_id))
+
+
+# Random selections of one or two options for every slot with an excluded time block now and then
+def random_requests(major_catalog, seed, request_count):
+    rng = random.Random(seed)
+    class_code_names = class_code_names_of(major_catalog)
+    requests = []
+    for _ in range(request_count):
+        selected_class_code_names = [rng.sample(class_code_names, rng.randint(1, 2)) for _ in range(rng.randint(2, 5))]
+        excluded_time_blocks = []
+        if rng.random() < 0.4:
+            start_time = rng.choice(START_TIMES)
+            excluded_time_blocks.append((rng.randint(1, 5), start_time, start_time + 90))
+        requests.append(ScheduleRequest(selected_class_code_names, excluded_time_blocks))
+    return requests
@@ -0,0 +1,83 @@
+import pytest, logging, sqlite3
+pytest.importorskip('PyQt5')
+
+from course_schduler_backend import CourseSchedulerBackend
+from solver.search_progress import SearchProgress
+from conftest import make_course_database
+
+
+class SlotRow:
+    def __init__(self, class_options):
+        self.class_options = class_options
+
+
+# Stands in for the window, the backend reads the selected slots from its slot list tab
+class ParentStub:
+    def __init__(self):
+        self.slot_list_tab = self
+        self.slot_rows = []
+        self.warnings = []
+
+    def show_warning(self, warning_message):
+        self.warnings.append(warning_message)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = CourseSchedulerBackend(parent=ParentStub(), logger=logging.getLogger('test'))
+    backend.solve_cache_directory_path = str(tmp_path / 'solve_cache')
+    backend.solve_cache.directory = backend.solve_cache_directory_path
+    backend.conn = make_course_database(str(tmp_path / 'courses.db'))
+    backend.student_major_id = 1
+    backend.load_data()
+    backend.fetch_major_specific_data()
+    yield backend
+    backend.conn.close()
+
+
+def select_slots(backend, slots):
+    backend.parent.slot_rows = [SlotRow(class_options) for class_options in slots]
+
+
+def test_count_can_be_cancelled(backend):
+    select_slots(backend, [['MAT 101', 'MAT 102'], ['FIZ 101'], ['EHB 101']])
+    count = backend.count_combinations()
+    assert count > 0
+    progress = SearchProgress()
+    progress.cancel()
+    assert backend.prepare_count()
+    assert backend.run_count(progress) is None
+    assert backend.prepare_count()
+    assert backend.run_count(SearchProgress()) == count
+
+
+def test_equivalent_taken_class_codes_are_added_once(backend):
+    assert backend.add_to_allready_taken_class_codes('MAT 101')
+    assert not backend.add_to_allready_taken_class_codes('MAT 101E')
+    assert not backend.add_to_allready_taken_class_codes('mat101')
+    assert backend.allready_taken_class_codes == {'MAT 101'}
+
+
+def solve(backend):
+    backend.something_changed = True
+    backend.calculate_combinations()
+    return [backend.results.get(index) for index in range(backend.results.total_count())]
+
+
+# The order the options of a slot were added in changes neither the results nor the cache key, the order of the slots does
+def test_option_order_does_not_change_cache_key(backend):
+    select_slots(backend, [['MAT 102', 'MAT 101', 'MAT 103'], ['FIZ 101', 'EHB 101']])
+    backend.get_selected_class_code_names_from_slot_list()
+    solve_cache_key = backend._get_solve_cache_key()
+    results = solve(backend)
+    assert results and backend.solve_metrics.source != 'cache'
+
+    select_slots(backend, [['MAT 101', 'MAT 103', 'MAT 102'], ['EHB 101', 'FIZ 101']])
+    backend.get_selected_class_code_names_from_slot_list()
+    assert backend._get_solve_cache_key() == solve_cache_key
+    assert solve(backend) == results
+    assert backend.solve_metrics.source == 'cache'
+
+    select_slots(backend, [['EHB 101', 'FIZ 101'], ['MAT 101', 'MAT 103', 'MAT 102']])
+    backend.get_selected_class_code_names_from_slot_list()
+    assert backend._get_solve_cache_key() != solve_cache_key
@@ -0,0 +1,79 @@
+import sqlite3
+
+from solver.catalog import Catalog
+from solver.catalog_schema import SCHEMA_VERSION, create_tables_if_not_exist, get_metadata
+
+# Courses of the baseline schema, the times are only in time_tuples padded with 0,0,0 entries to three tuples
+COURSES = [
+    (1, '10001', 1, 1, '1,510,629&3,510,629&0,0,0', 30),
+    (2, '10002', 2, 1, '2,690,869&0,0,0&0,0,0', 40),
+    (3, '10003', 1, 2, '1,545,634&2,545,634&4,545,634', 25),
+    (4, '10004', 3, 2, '0,0,0&0,0,0&0,0,0', 10),
+]
+COURSE_TIMES = [
+    (1, 1, 510, 629), (1, 3, 510, 629),
+    (2, 2, 690, 869),
+    (3, 1, 545, 634), (3, 2, 545, 634), (3, 4, 545, 634),
+]
+MAJORS = [(1, 'Major 1', '1,2,3,4'), (2, 'Major 2', '2,4'), (3, 'Major 3', '')]
+MAJOR_COURSES = [(1, 1), (1, 2), (1, 3), (1, 4), (2, 2), (2, 4)]
+
+
+# The tables as the first versions of the scraper wrote them, without CourseTimes, MajorCourses and Metadata
+def make_baseline_database(path):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute('CREATE TABLE Courses (course_id INTEGER PRIMARY KEY AUTOINCREMENT, crn TEXT, professor_id INTEGER, class_id INTEGER, '
+                   'time_tuples TEXT, quota INTEGER)')
+    cursor.execute('CREATE TABLE Classes (class_id INTEGER PRIMARY KEY, class_code_name TEXT, class_title TEXT, prerequisite_class_ids TEXT)')
+    cursor.execute('CREATE TABLE Majors (major_id INTEGER PRIMARY KEY, major_name TEXT, course_ids TEXT)')
+    cursor.execute('CREATE TABLE Professors (professor_id INTEGER PRIMARY KEY, professor_name TEXT)')
+    cursor.executemany('INSERT INTO Courses VALUES (?, ?, ?, ?, ?, ?)', COURSES)
+    cursor.executemany('INSERT INTO Classes VALUES (?, ?, ?, ?)', [(1, 'MAT 101', 'Calculus I', ''), (2, 'MAT 102', 'Calculus II', 'MAT 101')])
+    cursor.executemany('INSERT INTO Majors VALUES (?, ?, ?)', MAJORS)
+    cursor.executemany('INSERT INTO Professors VALUES (?, ?)', [(1, 'Professor 1'), (2, 'Professor 2'), (3, 'Professor 3')])
+    conn.commit()
+    return conn
+
+
+def read_course_times(conn):
+    return conn.execute('SELECT course_id, day, start_time, end_time FROM CourseTimes ORDER BY course_id, rowid').fetchall()
+
+
+def read_major_courses(conn):
+    return conn.execute('SELECT major_id, course_id FROM MajorCourses ORDER BY major_id, course_id').fetchall()
+
+
+def test_baseline_database_is_migrated(tmp_path):
+    conn = make_baseline_database(str(tmp_path / 'courses.db'))
+    create_tables_if_not_exist(conn)
+    assert read_course_times(conn) == COURSE_TIMES
+    assert read_major_courses(conn) == MAJOR_COURSES
+    assert get_metadata(conn, 'schema_version') == str(SCHEMA_VERSION)
+    major_catalog = Catalog(conn).load().get_major(2)
+    assert major_catalog.courses == {2: ['10002', 2, 1, [(2, 690, 869)], 40], 4: ['10004', 3, 2, [], 10]}
+    conn.close()
+
+    # Opening the migrated database again does not add the rows twice
+    conn = sqlite3.connect(str(tmp_path / 'courses.db'))
+    create_tables_if_not_exist(conn)
+    assert read_course_times(conn) == COURSE_TIMES
+    assert read_major_courses(conn) == MAJOR_COURSES
+    conn.close()
+
+
+# A version 2 database already has its CourseTimes, only MajorCourses is filled from Majors.course_ids
+def test_version_2_database_is_migrated(tmp_path):
+    conn = make_baseline_database(str(tmp_path / 'courses.db'))
+    cursor = conn.cursor()
+    cursor.execute('CREATE TABLE CourseTimes (course_id INTEGER, day INTEGER, start_time INTEGER, end_time INTEGER)')
+    cursor.execute('CREATE TABLE Metadata (key TEXT PRIMARY KEY, value TEXT)')
+    cursor.executemany('INSERT INTO CourseTimes VALUES (?, ?, ?, ?)', COURSE_TIMES[:3])
+    cursor.execute("INSERT INTO Metadata VALUES ('schema_version', '2')")
+    conn.commit()
+    create_tables_if_not_exist(conn)
+    assert read_course_times(conn) == COURSE_TIMES[:3]
+    assert read_major_courses(conn) == MAJOR_COURSES
+    assert get_metadata(conn, 'schema_version') == str(SCHEMA_VERSION)
+    assert sorted(Catalog(conn).load().get_major(1).courses) == [1, 2, 3, 4]
+    conn.close()
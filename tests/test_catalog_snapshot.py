@@ -0,0 +1,74 @@
+import pytest
+
+from solver.catalog import Catalog
+from solver.catalog_schema import insert_major_courses
+from solver.catalog_snapshot import CatalogSnapshot, load_catalog, get_snapshot_file_addr
+from conftest import make_course_database
+
+MAJOR_CATALOG_FIELDS = ['major_id', 'day_start_minutes', 'day_end_minutes', 'time_resolution', 'courses', 'classes', 'class_id_to_course_ids_map',
+                        'class_code_name_to_id_map', 'class_code_to_class_ids_map', 'time_segment_boundaries', 'course_masks',
+                        'course_id_to_time_group_id']
+
+
+# A second major with every third course, a few prerequisites with E suffixes and a course without times
+@pytest.fixture
+def conn(tmp_path):
+    conn = make_course_database(str(tmp_path / 'courses.db'), seed=3)
+    cursor = conn.cursor()
+    course_ids_text = ','.join(str(row[0]) for row in cursor.execute('SELECT course_id FROM Courses WHERE course_id % 3 = 0'))
+    cursor.execute('INSERT INTO Majors VALUES (2, ?, ?)', ('Major 2', course_ids_text))
+    insert_major_courses(cursor, [(2, course_ids_text)])
+    cursor.execute("UPDATE Classes SET prerequisite_class_ids = 'MAT 101|MAT 101E&FIZ101' WHERE class_code_name = 'MAT 102'")
+    cursor.execute("UPDATE Classes SET prerequisite_class_ids = 'MAT 102E' WHERE class_code_name = 'EHB 101'")
+    cursor.execute('DELETE FROM CourseTimes WHERE course_id = 1')
+    cursor.execute("INSERT OR REPLACE INTO Metadata (key, value) VALUES ('catalog_version', 'first')")
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def write_snapshot(conn):
+    CatalogSnapshot.write(get_snapshot_file_addr(conn), Catalog(conn).load())
+
+
+def test_snapshot_round_trip(conn):
+    write_snapshot(conn)
+    catalog = load_catalog(conn)
+    assert catalog.snapshot is not None
+    expected_catalog = Catalog(conn).load()
+    for field in ['majors', 'professors', 'prerequisite_class_codes_set', 'catalog_version']:
+        assert getattr(catalog, field) == getattr(expected_catalog, field), field
+    for major_id in range(1, len(expected_catalog.majors) + 1):
+        major_catalog, expected_major_catalog = catalog.get_major(major_id), expected_catalog.get_major(major_id)
+        for field in MAJOR_CATALOG_FIELDS:
+            assert getattr(major_catalog, field) == getattr(expected_major_catalog, field), field
+        assert vars(major_catalog.prerequisite_index) == vars(expected_major_catalog.prerequisite_index)
+        assert sorted(vars(major_catalog)) == sorted(MAJOR_CATALOG_FIELDS + ['prerequisite_index'])
+    assert catalog.get_major(len(expected_catalog.majors) + 1) is None
+
+
+def test_stale_snapshot_is_not_read(conn):
+    write_snapshot(conn)
+    conn.execute("UPDATE CourseTimes SET start_time = start_time + 30 WHERE course_id = 2")
+    conn.execute("INSERT OR REPLACE INTO Metadata (key, value) VALUES ('catalog_version', 'second')")
+    conn.commit()
+    catalog = load_catalog(conn)
+    assert catalog.snapshot is None
+    assert catalog.catalog_version == 'second'
+    assert catalog.get_major(1).courses[2][3] == Catalog(conn).load().get_major(1).courses[2][3]
+
+
+def test_snapshot_of_other_time_grid_is_not_read(conn):
+    write_snapshot(conn)
+    assert load_catalog(conn).snapshot is not None
+    assert load_catalog(conn, time_resolution=30).snapshot is None
+
+
+def test_snapshot_of_other_version_is_not_read(conn):
+    write_snapshot(conn)
+    snapshot_file_addr = get_snapshot_file_addr(conn)
+    with open(snapshot_file_addr, 'r+b') as f:
+        f.seek(4)
+        f.write((0).to_bytes(4, 'little'))
+    assert CatalogSnapshot.load(snapshot_file_addr) is None
+    assert load_catalog(conn).snapshot is None
@@ -0,0 +1,40 @@
+from conftest import overlaps, random_requests
+from test_result_order import solve_all
+from solver.schedule_solver import ScheduleSolver
+from itertools import combinations, product
+import pytest
+
+
+# Every schedule of the request found by trying every section of every slot against the raw time tuples
+def reference_schedules(major_catalog, request):
+    slot_course_ids = []
+    for slot in request.selected_class_code_names:
+        course_ids = [course_id for class_code_name in slot
+                      for course_id in major_catalog.class_id_to_course_ids_map.get(major_catalog.class_code_name_to_id_map[class_code_name], [])]
+        slot_course_ids.append([course_id for course_id in course_ids if not overlaps(major_catalog.courses[course_id][3], request.excluded_time_blocks)])
+    return sorted(schedule for schedule in product(*slot_course_ids)
+                  if not any(overlaps(major_catalog.courses[course_id][3], major_catalog.courses[other_course_id][3])
+                             for course_id, other_course_id in combinations(schedule, 2)))
+
+
+# Results hold one course of every group of same time courses, the groups are expanded back into every schedule
+def expand_same_time_courses(results, course_id_to_same_time_course_ids_map):
+    return sorted(schedule for result in results for schedule in product(*[course_id_to_same_time_course_ids_map[course_id] for course_id in result]))
+
+
+# The occupancy masks, the conflict index and the engines built on them find exactly the schedules the time tuples allow
+@pytest.mark.parametrize('engine', ['search', 'parallel', 'vectorized'])
+def test_results_match_time_tuples(major_catalog, engine):
+    solver = ScheduleSolver(major_catalog, engine=engine, worker_count=2)
+    checked_count = 0
+    for request in random_requests(major_catalog, 3, 40 if engine != 'parallel' else 10):
+        prepared = solver.prepare(request)
+        expected = reference_schedules(major_catalog, request)
+        if prepared.empty_slot_reasons:
+            assert expected == []
+            continue
+        results = solve_all(solver, request)
+        assert expand_same_time_courses(results, prepared.course_id_to_same_time_course_ids_map) == expected
+        assert solver.count(prepared) == len(results)
+        checked_count += bool(expected)
+    assert checked_count > 0
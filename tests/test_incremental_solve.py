@@ -0,0 +1,56 @@
+from conftest import START_TIMES, class_code_names_of
+from solver.schedule_solver import ScheduleRequest, ScheduleSolver
+from solver.solve_metrics import SolveMetrics
+from test_result_order import solve_all
+import random
+
+
+def pull_all(result_stream):
+    results = []
+    while result_stream.get(len(results)) is not None:
+        results.append(list(result_stream.get(len(results))))
+    return results
+
+
+# Adds or removes an exclusion block or an option of a slot
+def change_request(rng, request, class_code_names):
+    selected_class_code_names = [list(slot) for slot in request.selected_class_code_names]
+    excluded_time_blocks = set(request.excluded_time_blocks)
+    change = rng.choice(['add_exclusion', 'add_exclusion', 'remove_exclusion', 'add_option', 'remove_option'])
+    if change == 'add_exclusion' or change == 'remove_exclusion' and not excluded_time_blocks:
+        start_time = rng.choice(START_TIMES)
+        excluded_time_blocks.add((rng.randint(1, 5), start_time, start_time + rng.choice([60, 90, 180])))
+    elif change == 'remove_exclusion':
+        excluded_time_blocks.remove(rng.choice(sorted(excluded_time_blocks)))
+    elif change == 'add_option':
+        used_class_code_names = set(class_code_name for slot in selected_class_code_names for class_code_name in slot)
+        rng.choice(selected_class_code_names).append(rng.choice([name for name in class_code_names if name not in used_class_code_names]))
+    else:
+        slot = rng.choice(selected_class_code_names)
+        if len(slot) > 1:
+            slot.pop(rng.randrange(len(slot)))
+    return ScheduleRequest(selected_class_code_names, excluded_time_blocks)
+
+
+# Every result updated from the previous results is the one a new solve finds, in the same order
+def test_incremental_solve_equals_new_solve(major_catalog):
+    rng = random.Random(len(major_catalog.courses))
+    class_code_names = class_code_names_of(major_catalog)
+    solver = ScheduleSolver(major_catalog)
+    incremental_solve_count = 0
+    for _ in range(10):
+        request = ScheduleRequest([rng.sample(class_code_names, rng.randint(1, 2)) for _ in range(rng.randint(2, 4))])
+        previous = None
+        for _ in range(8):
+            prepared = solver.prepare(request)
+            if prepared.empty_slot_reasons:
+                previous = None
+            else:
+                metrics = SolveMetrics()
+                result_stream = solver.solve(prepared, metrics, previous=previous)
+                results = pull_all(result_stream)
+                assert results == solve_all(ScheduleSolver(major_catalog), request)
+                incremental_solve_count += metrics.source == 'incremental'
+                previous = (prepared.selection(), result_stream, prepared.course_id_to_same_time_course_ids_map)
+            request = change_request(rng, request, class_code_names)
+    assert incremental_solve_count > 0
@@ -0,0 +1,44 @@
+import pytest
+
+from solver.prerequisite_index import PrerequisiteIndex, normalize_class_code
+
+
+@pytest.mark.parametrize('class_code', ['MAT 103', 'MAT103', 'MAT 103E', 'MAT103E', 'mat 103e', ' MAT  103 '])
+def test_normalize_class_code_is_symmetric(class_code):
+    assert normalize_class_code(class_code) == 'MAT 103'
+
+
+def test_normalize_class_code_keeps_other_codes():
+    assert normalize_class_code('blg 101l') == 'BLG 101L'
+    assert normalize_class_code('ITB') == 'ITB'
+
+
+# classes holds class_id -> [class code name, class title, prerequisite or groups]
+CLASSES = {
+    1: ['MAT 101', 'Calculus I', []],
+    2: ['MAT 102', 'Calculus II', [['MAT 101']]],
+    3: ['MAT 201', 'Differential Equations', [['MAT 102E'], ['FIZ 101', 'FIZ 101E', 'FIZ 103']]],
+    4: ['BLG 102', 'Programming', [['BLG 101', 'MAT 101']]],
+}
+
+
+@pytest.mark.parametrize('taken_class_codes, eligible_class_ids', [
+    ([], {1}),
+    (['MAT 101'], {1, 2, 4}),
+    (['BLG101E'], {1, 4}),
+    (['MAT 102'], {1}),
+    (['MAT 102', 'FIZ 103'], {1, 3}),
+    (['MAT102E', 'fiz 101'], {1, 3}),
+    (['MAT 101', 'MAT 102', 'FIZ101E'], {1, 2, 3, 4}),
+    (['KIM 101'], {1}),
+])
+def test_eligible_class_ids(taken_class_codes, eligible_class_ids):
+    prerequisite_index = PrerequisiteIndex(CLASSES)
+    assert prerequisite_index.get_eligible_class_ids(taken_class_codes) == eligible_class_ids
+    taken_bits = prerequisite_index.to_bits(taken_class_codes)
+    assert set(class_id for class_id in CLASSES if prerequisite_index.is_eligible(class_id, taken_bits)) == eligible_class_ids
+
+
+def test_equivalent_codes_give_the_same_bits():
+    prerequisite_index = PrerequisiteIndex(CLASSES)
+    assert prerequisite_index.to_bits(['MAT 102E']) == prerequisite_index.to_bits(['MAT102']) == prerequisite_index.to_bits(['mat 102']) != 0
@@ -0,0 +1,50 @@
+from conftest import random_requests
+from test_result_order import solve_all
+from solver.ranked_search import RankedCombinationSearch
+from solver.schedule_solver import ScheduleSolver
+import pytest
+
+
+# The objective of RankedCombinationSearch computed from the raw time tuples of the result
+def reference_score(major_catalog, result, course_quotas, weights):
+    time_tuples = [time_tuple for course_id in result for time_tuple in major_catalog.courses[course_id][3]]
+    day_to_time_blocks = {}
+    for day, start_time, end_time in time_tuples:
+        day_to_time_blocks.setdefault(day, []).append((start_time, end_time))
+    idle_minutes = 0
+    for time_blocks in day_to_time_blocks.values():
+        time_blocks.sort()
+        for (_, previous_end_time), (start_time, _) in zip(time_blocks, time_blocks[1:]):
+            idle_minutes += max(0, start_time - previous_end_time) // major_catalog.time_resolution * major_catalog.time_resolution
+    earliest_start = min([start_time for _, start_time, _ in time_tuples] + [major_catalog.day_end_minutes])
+    return weights['campus_days'] * len(day_to_time_blocks)\
+        + weights['idle_gaps'] * idle_minutes / 60\
+        + weights['early_start'] * (major_catalog.day_end_minutes - earliest_start) / 60\
+        - weights['quota'] * sum(course_quotas[course_id] for course_id in result)
+
+
+# The best results of the ranked search are the first ones of every result sorted by its score,
+# equal scores keep the order the plain search finds the results in
+@pytest.mark.parametrize('weights', [RankedCombinationSearch.DEFAULT_WEIGHTS,
+                                     {'campus_days': 1.0, 'idle_gaps': 0.0, 'early_start': 0.0, 'quota': 0.0},
+                                     {'campus_days': 0.0, 'idle_gaps': 0.0, 'early_start': 0.0, 'quota': 0.0}])
+def test_ranked_results_match_sorted_results(major_catalog, weights):
+    solver = ScheduleSolver(major_catalog)
+    checked_count = 0
+    for request in random_requests(major_catalog, 4, 20):
+        prepared = solver.prepare(request)
+        if prepared.empty_slot_reasons:
+            continue
+        course_quotas = {course_id: major_catalog.courses[same_time_ids[0]][4]
+                         for course_id, same_time_ids in prepared.course_id_to_same_time_course_ids_map.items()}
+        scored_results = [(reference_score(major_catalog, result, course_quotas, weights), result) for result in solve_all(solver, request)]
+        scored_results.sort(key=lambda scored_result: scored_result[0])
+        course_time_tuples = {course_id: major_catalog.courses[course_id][3] for course_id in prepared.conflict_index.course_ids}
+        for result_limit in [1, 5, 50]:
+            search = RankedCombinationSearch(prepared.courses, prepared.conflict_index, course_time_tuples, course_quotas,
+                                             prepared.excluded_time_blocks_mask, weights=weights, result_limit=result_limit,
+                                             day_end_minutes=major_catalog.day_end_minutes, time_resolution=major_catalog.time_resolution)
+            assert search.run() == [result for _, result in scored_results[:result_limit]]
+            assert search.scores == [score for score, _ in scored_results[:result_limit]]
+        checked_count += len(scored_results) > 5
+    assert checked_count > 0
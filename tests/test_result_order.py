@@ -0,0 +1,42 @@
+from conftest import class_code_names_of, random_requests
+from solver.schedule_solver import ScheduleSolver
+from solver.combination_counter import CombinationCounter
+import pytest, random
+
+
+def solve_all(solver, request):
+    prepared = solver.prepare(request)
+    if prepared.empty_slot_reasons:
+        return None
+    result_stream = solver.solve(prepared)
+    results = []
+    while result_stream.get(len(results)) is not None:
+        results.append(list(result_stream.get(len(results))))
+    return results
+
+
+# A solver reusing a conflict index built for other classes returns the results in the same order as a new one
+@pytest.mark.parametrize('engine', ['search', 'parallel', 'vectorized', 'ranked'])
+def test_result_order_does_not_depend_on_conflict_index(major_catalog, engine):
+    reused_solver = ScheduleSolver(major_catalog, engine='search' if engine == 'ranked' else engine, worker_count=2, ranked_result_limit=20)
+    class_code_names = class_code_names_of(major_catalog)
+    reused_solver.index_classes(random.Random(0).sample(class_code_names, len(class_code_names)))
+    for request in random_requests(major_catalog, 0, 4 if engine == 'parallel' else 15):
+        request.rank_results = engine == 'ranked'
+        new_solver = ScheduleSolver(major_catalog, engine=reused_solver.engine, worker_count=2, ranked_result_limit=20)
+        assert solve_all(reused_solver, request) == solve_all(new_solver, request)
+
+
+# The counted results are in the order the results are searched in so the stream can jump to any of them
+def test_counter_result_at_follows_search_order(major_catalog):
+    solver = ScheduleSolver(major_catalog)
+    class_code_names = class_code_names_of(major_catalog)
+    solver.index_classes(random.Random(1).sample(class_code_names, len(class_code_names)))
+    for request in random_requests(major_catalog, 1, 15):
+        results = solve_all(solver, request)
+        if results is None:
+            continue
+        prepared = solver.prepare(request)
+        counter = CombinationCounter(prepared.courses, prepared.conflict_index, prepared.excluded_time_blocks_mask)
+        assert counter.count() == len(results)
+        assert [counter.result_at(index) for index in range(len(results))] == results
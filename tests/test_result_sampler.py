@@ -0,0 +1,56 @@
+from conftest import random_requests
+from test_result_order import solve_all
+from solver.combination_counter import CombinationCounter
+from solver.result_sampler import ResultSampler
+from solver.schedule_solver import ScheduleSolver
+import pytest
+
+
+# Maps every index to a result of its own, like a counter of more results than fit into a Py_ssize_t
+class CounterStub:
+    def result_at(self, index):
+        return [index % 1000, index // 1000]
+
+
+@pytest.mark.parametrize('sampling_mode', ['random', 'diverse'])
+def test_samples_are_distinct_results(major_catalog, sampling_mode):
+    solver = ScheduleSolver(major_catalog)
+    checked_count = 0
+    for request in random_requests(major_catalog, 5, 20):
+        prepared = solver.prepare(request)
+        if prepared.empty_slot_reasons:
+            continue
+        results = solve_all(solver, request)
+        counter = CombinationCounter(prepared.courses, prepared.conflict_index, prepared.excluded_time_blocks_mask)
+        total_count = counter.count()
+        assert total_count == len(results)
+        for count in [1, 3, 10, 1000]:
+            samples = []
+            for seed in [0, 0, 1]:
+                sampler = ResultSampler(counter, total_count, seed=seed)
+                samples.append(sampler.diverse_sample(count) if sampling_mode == 'diverse' else sampler.sample(count))
+            assert len(samples[0]) == min(count, total_count)
+            assert len(set(tuple(result) for result in samples[0])) == len(samples[0])
+            assert all(result in results for result in samples[0])
+            assert samples[0] == samples[1]
+            checked_count += count < total_count and samples[0] != samples[2]
+    assert checked_count > 0
+
+
+# The diverse sample starts from the first result of the pool and adds the one differing from the picked ones in the most slots
+def test_diverse_sample_spreads_results():
+    sampler = ResultSampler(CounterStub(), 1000 * 1000, seed=3)
+    pool = sampler.sample(20)
+    samples = sampler.diverse_sample(2)
+    assert samples[0] == pool[0]
+    assert samples[1] in pool
+    assert samples[1][0] != samples[0][0] and samples[1][1] != samples[0][1]
+
+
+def test_sample_of_huge_result_count():
+    sampler = ResultSampler(CounterStub(), 2 ** 80, seed=7)
+    samples = sampler.sample(50)
+    assert len(samples) == 50
+    assert len(set(tuple(result) for result in samples)) == 50
+    assert samples == ResultSampler(CounterStub(), 2 ** 80, seed=7).sample(50)
+    assert len(sampler.diverse_sample(5)) == 5
@@ -0,0 +1,61 @@
+from array import array
+from solver.result_table import HEADER_FORMAT, HEADER_SIZE, MAGIC, VERSION, ResultTable
+import os, struct, sys
+
+RESULTS = [[3, 17, 250], [4, 17, 251], [5, 2 ** 32 - 1, 0]]
+
+
+def test_save_and_load(tmp_path):
+    file_addr = str(tmp_path / '_results.bin')
+    ResultTable.from_results(RESULTS).save(file_addr)
+    table = ResultTable.load(file_addr)
+    assert table._mapped_file_addr == file_addr
+    assert isinstance(table.data, memoryview)
+    assert len(table) == len(RESULTS)
+    assert table.tolist() == RESULTS
+    assert table[-1] == RESULTS[-1]
+    assert table.nbytes() == os.path.getsize(file_addr) - HEADER_SIZE
+
+    # Saving into the mapped file keeps it, the appended rows are copied into memory and the file is left as it was
+    table.save(file_addr)
+    table.append([6, 7, 8])
+    assert table._mapped_file_addr is None
+    assert table.tolist() == RESULTS + [[6, 7, 8]]
+    assert ResultTable.load(file_addr).tolist() == RESULTS
+
+
+def test_save_and_load_empty_table(tmp_path):
+    file_addr = str(tmp_path / '_results.bin')
+    ResultTable.from_results([]).save(file_addr)
+    table = ResultTable.load(file_addr)
+    assert len(table) == 0
+    assert table.tolist() == []
+    table.append([1, 2])
+    assert table.tolist() == [[1, 2]]
+
+
+def test_missing_or_truncated_file_loads_empty_table(tmp_path):
+    file_addr = str(tmp_path / '_results.bin')
+    assert len(ResultTable.load(file_addr)) == 0
+    ResultTable.from_results(RESULTS).save(file_addr)
+    with open(file_addr, 'rb') as f:
+        data = f.read()
+    for size in [0, HEADER_SIZE - 1, HEADER_SIZE, len(data) - 1]:
+        with open(file_addr, 'wb') as f:
+            f.write(data[:size])
+        table = ResultTable.load(file_addr)
+        assert len(table) == 0
+        assert table.tolist() == []
+
+
+# A file written on a machine of the other byte order is read into memory and swapped
+def test_load_other_byte_order(tmp_path):
+    file_addr = str(tmp_path / '_results.bin')
+    data = array(ResultTable().data.typecode, [course_id for result in RESULTS for course_id in result])
+    data.byteswap()
+    with open(file_addr, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, int(sys.byteorder != 'big'), len(RESULTS[0]), len(RESULTS)))
+        f.write(data.tobytes())
+    table = ResultTable.load(file_addr)
+    assert table._mapped_file_addr is None
+    assert table.tolist() == RESULTS
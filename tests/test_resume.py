@@ -0,0 +1,27 @@
+from conftest import class_code_names_of, random_requests
+from test_result_order import solve_all
+from solver.schedule_solver import ScheduleSolver
+import random
+
+
+# A solve cached while its results were still being searched continues on another solver exactly like a new solve
+def test_resume_continues_like_a_new_solve(major_catalog):
+    class_code_names = class_code_names_of(major_catalog)
+    cached_solver = ScheduleSolver(major_catalog, result_lookahead=3)
+    cached_solver.index_classes(random.Random(2).sample(class_code_names, len(class_code_names)))
+    resumed_solver = ScheduleSolver(major_catalog, result_lookahead=3)
+    resumed_solver.index_classes(random.Random(3).sample(class_code_names, len(class_code_names)))
+    for request in random_requests(major_catalog, 2, 15):
+        prepared = cached_solver.prepare(request)
+        if prepared.empty_slot_reasons:
+            continue
+        result_stream = cached_solver.solve(prepared)
+        cached_results = result_stream.buffered_results().tolist()
+        total_count = result_stream.total_count()
+
+        resumed_stream = resumed_solver.resume(resumed_solver.prepare(request), cached_results, total_count,
+                                               complete=total_count == len(cached_results))
+        resumed_results = []
+        while resumed_stream.get(len(resumed_results)) is not None:
+            resumed_results.append(list(resumed_stream.get(len(resumed_results))))
+        assert resumed_results == solve_all(ScheduleSolver(major_catalog), request)
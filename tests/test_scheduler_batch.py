@@ -0,0 +1,55 @@
+from scheduler_batch import main, SUMMARY_FILE_NAME
+from conftest import make_course_database
+import json
+
+
+def read_summaries(output_directory_path):
+    with open(output_directory_path / SUMMARY_FILE_NAME) as f:
+        return {summary['student_id']: summary for summary in map(json.loads, f)}
+
+
+# Invalid requests are reported in their own summaries and the other students are still solved
+def test_invalid_requests_do_not_stop_the_batch(tmp_path, capsys):
+    make_course_database(str(tmp_path / 'courses.db')).close()
+    requests = [
+        {'student_id': 'day_zero', 'major': 1, 'slots': ['MAT 101'], 'exclude': ['0,08:30,10:30']},
+        {'student_id': 'not_a_text', 'major': 1, 'slots': ['MAT 101'], 'exclude': [1]},
+        {'student_id': 'bad_limit', 'major': 1, 'slots': ['MAT 101'], 'limit': 'all'},
+        {'student_id': 'valid', 'major': 1, 'slots': ['MAT 101']},
+    ]
+    with open(tmp_path / 'requests.jsonl', 'w') as f:
+        f.writelines(json.dumps(request) + '\n' for request in requests)
+    for workers in ['1', '2']:
+        output_directory_path = tmp_path / f'output_{workers}'
+        assert main(['--db', str(tmp_path / 'courses.db'), '--requests', str(tmp_path / 'requests.jsonl'),
+                     '--output', str(output_directory_path), '--workers', workers]) == 0
+        summaries = read_summaries(output_directory_path)
+        assert summaries['day_zero']['error'] == 'invalid_time_block'
+        assert summaries['not_a_text']['error'] == 'invalid_time_block'
+        assert summaries['bad_limit']['error'] == 'solve_failed'
+        assert summaries['valid']['error'] is None and summaries['valid']['written_count'] > 0
+
+
+# Lines that are not JSON objects are reported under their line numbers and the other lines are still solved
+def test_invalid_lines_do_not_stop_the_batch(tmp_path, capsys):
+    make_course_database(str(tmp_path / 'courses.db')).close()
+    lines = [
+        json.dumps({'student_id': 'first', 'major': 1, 'slots': ['MAT 101']}),
+        '{"student_id": "broken", "major": 1,',
+        '',
+        '["MAT 101"]',
+        json.dumps({'major': 1, 'slots': ['FIZ 101']}),
+    ]
+    with open(tmp_path / 'requests.jsonl', 'w') as f:
+        f.writelines(line + '\n' for line in lines)
+    for workers in ['1', '2']:
+        output_directory_path = tmp_path / f'output_{workers}'
+        assert main(['--db', str(tmp_path / 'courses.db'), '--requests', str(tmp_path / 'requests.jsonl'),
+                     '--output', str(output_directory_path), '--workers', workers]) == 0
+        summaries = read_summaries(output_directory_path)
+        assert sorted(summaries) == ['2', '4', '5', 'first']
+        assert summaries['2']['error'] == summaries['4']['error'] == 'invalid_request'
+        assert summaries['4']['line_number'] == 4
+        assert summaries['first']['error'] is None and summaries['first']['written_count'] > 0
+        assert summaries['5']['error'] is None and summaries['5']['written_count'] > 0
+        assert json.loads(capsys.readouterr().out)['error_count'] == 2
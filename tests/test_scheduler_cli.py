@@ -0,0 +1,32 @@
+from scheduler_cli import parse_time_block, main
+from conftest import make_course_database
+import pytest, json
+
+
+@pytest.mark.parametrize('text', ['0,08:30,10:30', '6,08:30,10:30', '1,10:30,08:30', '1,10:30,10:30', '1,08:30', 'x,08:30,10:30'])
+def test_parse_time_block_rejects_invalid_blocks(text):
+    with pytest.raises(ValueError):
+        parse_time_block(text)
+
+
+def test_parse_time_block():
+    assert parse_time_block('3,15:20,16:00') == (3, 920, 960)
+
+
+def run_main(capsys, argv):
+    exit_code = main(argv)
+    out, err = capsys.readouterr()
+    return exit_code, [json.loads(line) for line in out.splitlines()], err
+
+
+def test_invalid_time_block_is_reported(tmp_path, capsys):
+    make_course_database(str(tmp_path / 'courses.db')).close()
+    exit_code, _, err = run_main(capsys, ['--db', str(tmp_path / 'courses.db'), '--major', '1', '--slot', 'MAT 101', '--exclude', '0,08:30,10:30'])
+    assert exit_code == 1 and json.loads(err)['error'] == 'invalid_time_block'
+
+
+# Limiting the output to no results is not the same as having no results
+def test_limit_zero_is_not_reported_as_no_combination(tmp_path, capsys):
+    make_course_database(str(tmp_path / 'courses.db')).close()
+    exit_code, results, err = run_main(capsys, ['--db', str(tmp_path / 'courses.db'), '--major', '1', '--slot', 'MAT 101', '--limit', '0'])
+    assert exit_code == 0 and results == [] and err == ''
@@ -0,0 +1,93 @@
+from scheduler_server import SchedulerHTTPServer, SchedulerRequestHandler, SchedulerService, ServiceError, preload_catalog
+from solver.catalog_schema import create_tables_if_not_exist, insert_course_times, insert_major_courses
+from conftest import make_course_database
+import http.client, json, pytest, sqlite3, threading, time
+
+
+# Eleven classes sharing ten section times, no schedule exists but the search has to try most of the placements to see it
+def make_pigeonhole_database(path):
+    conn = sqlite3.connect(path)
+    create_tables_if_not_exist(conn)
+    cursor = conn.cursor()
+    course_id_to_time_tuples_text = []
+    for class_id in range(1, 12):
+        cursor.execute('INSERT INTO Classes VALUES (?, ?, ?, ?)', (class_id, f'PH {100 + class_id}', f'Class {class_id}', ''))
+        for time_index in range(10):
+            course_id = class_id * 100 + time_index
+            start_time = 510 + time_index % 2 * 240
+            time_tuples_text = f'{time_index // 2 + 1},{start_time},{start_time + 119}'
+            cursor.execute('INSERT INTO Courses VALUES (?, ?, ?, ?, ?, ?)', (course_id, str(course_id), 1, class_id, time_tuples_text, 10))
+            course_id_to_time_tuples_text.append((course_id, time_tuples_text))
+    insert_course_times(cursor, course_id_to_time_tuples_text)
+    major_id_to_course_ids_text = [(1, ','.join(str(course_id) for course_id, _ in course_id_to_time_tuples_text))]
+    cursor.execute('INSERT INTO Majors VALUES (1, ?, ?)', ('Major 1', major_id_to_course_ids_text[0][1]))
+    insert_major_courses(cursor, major_id_to_course_ids_text)
+    cursor.execute("INSERT INTO Professors VALUES (1, 'Professor 1')")
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.parametrize('exclude', [['0,08:30,10:30'], ['1,10:30,08:30'], [1], '1,08:30,10:30'])
+def test_invalid_time_blocks_are_bad_requests(tmp_path, exclude):
+    make_course_database(str(tmp_path / 'courses.db')).close()
+    service = SchedulerService(preload_catalog(str(tmp_path / 'courses.db')), worker_count=1)
+    try:
+        with pytest.raises(ServiceError) as error:
+            service.solve({'major': 1, 'slots': ['MAT 101'], 'exclude': exclude})
+        assert (error.value.status, error.value.error) == (400, 'invalid_time_block')
+    finally:
+        service.close()
+
+
+# A timed out solve stops its search so the worker and the solve slot are free again soon after
+def test_timed_out_solve_is_stopped(tmp_path):
+    make_pigeonhole_database(str(tmp_path / 'courses.db'))
+    service = SchedulerService(preload_catalog(str(tmp_path / 'courses.db')), worker_count=1, queue_limit=0, timeout=0.2)
+    try:
+        with pytest.raises(ServiceError) as error:
+            service.solve({'major': 1, 'slots': [f'PH {100 + class_id}' for class_id in range(1, 12)]})
+        assert error.value.status == 504
+        start_time = time.perf_counter()
+        assert service.solve_slots.acquire(timeout=5)
+        assert time.perf_counter() - start_time < 1
+    finally:
+        service.close()
+
+
+@pytest.fixture
+def server(tmp_path):
+    make_course_database(str(tmp_path / 'courses.db')).close()
+    server = SchedulerHTTPServer(('127.0.0.1', 0), SchedulerRequestHandler)
+    server.service = SchedulerService(preload_catalog(str(tmp_path / 'courses.db')), worker_count=1)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+    server.service.close()
+
+
+def post(server, body, content_length):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    try:
+        connection.putrequest('POST', '/solve')
+        connection.putheader('Content-Length', content_length)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize('content_length', ['-1', 'abc', '1.5', '+3', '1_0', '12abc'])
+def test_invalid_content_length_is_bad_request(server, content_length):
+    assert post(server, b'{}', content_length) == (400, {'error': 'invalid_content_length'})
+
+
+def test_valid_content_length(server):
+    body = json.dumps({'major': 1, 'slots': ['MAT 101']}).encode()
+    status, payload = post(server, body, str(len(body)))
+    assert status == 200
+    assert payload['result_count'] > 0
+    assert post(server, b'{}', str(2 * 1024 * 1024))[0] == 413
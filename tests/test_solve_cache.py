@@ -0,0 +1,47 @@
+from solver.solve_cache import SolveCache
+import json, os
+
+INPUTS = {'catalog_version': 'first', 'student_major_id': 1, 'selected_class_code_names': [['MAT 101'], ['FIZ 101', 'FIZ 102']],
+          'excluded_time_blocks': [[1, 510, 600]]}
+
+
+def test_hit_and_miss(tmp_path):
+    solve_cache = SolveCache(str(tmp_path / 'solve_cache'), 1024 * 1024)
+    key = SolveCache.make_key(INPUTS)
+    assert solve_cache.get(key) is None
+    solve_cache.put(key, {'results': [[1, 2]], 'complete': True})
+    assert solve_cache.get(SolveCache.make_key(dict(reversed(list(INPUTS.items()))))) == {'results': [[1, 2]], 'complete': True}
+    for changed_inputs in [dict(INPUTS, catalog_version='second'), dict(INPUTS, excluded_time_blocks=[]),
+                           dict(INPUTS, selected_class_code_names=[['MAT 101'], ['FIZ 101']])]:
+        assert SolveCache.make_key(changed_inputs) != key
+        assert solve_cache.get(SolveCache.make_key(changed_inputs)) is None
+    solve_cache.clear()
+    assert solve_cache.get(key) is None
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    solve_cache = SolveCache(str(tmp_path / 'solve_cache'), 1024 * 1024)
+    key = SolveCache.make_key(INPUTS)
+    solve_cache.put(key, {'results': []})
+    with open(solve_cache._file_addr(key), 'w') as f:
+        f.write('{"results": [')
+    assert solve_cache.get(key) is None
+
+
+# Entries are evicted from the least recently used one once the files take more than the size limit
+def test_eviction(tmp_path):
+    entry = {'results': [[course_id] for course_id in range(100)]}
+    solve_cache = SolveCache(str(tmp_path / 'solve_cache'), 0)
+    keys = [SolveCache.make_key(dict(INPUTS, catalog_version=str(version))) for version in range(4)]
+    solve_cache.put(keys[0], entry)
+    assert solve_cache.get(keys[0]) is None
+
+    solve_cache.size_limit = 3 * len(json.dumps(entry))
+    for time, key in enumerate(keys[:3]):
+        solve_cache.put(key, entry)
+        os.utime(solve_cache._file_addr(key), (time, time))
+    # Getting the oldest entry makes it the most recently used one
+    assert solve_cache.get(keys[0]) == entry
+    solve_cache.put(keys[3], entry)
+    assert solve_cache.get(keys[1]) is None
+    assert all(solve_cache.get(key) == entry for key in [keys[0], keys[2], keys[3]])
@@ -0,0 +1,13 @@
+from conftest import START_TIMES, overlaps
+import random
+
+
+# Excluded time blocks off the segment boundaries, e.g. 15:20-16:00, still mask every course they overlap
+def test_exclusion_masks_match_time_tuples(major_catalog):
+    rng = random.Random(0)
+    for _ in range(200):
+        start_time = rng.choice(START_TIMES) + rng.randint(-20, 20)
+        excluded_time_blocks = [(rng.randint(1, 5), start_time, start_time + rng.randint(1, 120))]
+        excluded_time_blocks_mask = major_catalog.time_tuples_to_mask(excluded_time_blocks)
+        for course_id, course in major_catalog.courses.items():
+            assert bool(major_catalog.course_masks[course_id] & excluded_time_blocks_mask) == overlaps(course[3], excluded_time_blocks)
@@ -0,0 +1,22 @@
+import pytest, logging, os
+pytest.importorskip('PyQt5')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QWidget
+from course_schduler_backend import CourseSchedulerBackend
+from solver.result_stream import ResultStream
+from tabs.time_table_tab import TimeTableTab
+
+app = QApplication.instance() or QApplication([])
+
+
+# 15 slots of 5 sections that never clash have 5 ** 15 results, more than a QSpinBox holds
+def test_result_count_larger_than_the_page_input():
+    backend = CourseSchedulerBackend(parent=None, logger=logging.getLogger('test'))
+    time_table_tab = TimeTableTab(QWidget(), backend)
+    backend.results = ResultStream(results=[], total_count=5 ** 15)
+    backend.current_result_index = 2 ** 31 + 5
+    time_table_tab.update_time_table()
+    assert time_table_tab.page_input.maximum() == TimeTableTab.PAGE_INPUT_LIMIT
+    assert time_table_tab.page_input.value() == TimeTableTab.PAGE_INPUT_LIMIT
+    assert time_table_tab.total_result_count_label.text() == f'/ {5 ** 15}'
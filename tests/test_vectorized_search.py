@@ -0,0 +1,57 @@
+from solver.conflict_index import ConflictIndex
+from solver.schedule_solver import ScheduleSolver, ScheduleRequest, PreparedSolve
+from solver.solve_metrics import SolveMetrics
+from solver.vectorized_search import VectorizedCombinationSearch
+import pytest
+
+
+class MajorCatalogStub:
+    def __init__(self, course_masks):
+        self.course_masks = course_masks
+
+
+# 16 slots of 16 courses never clashing with the courses of the other slots give 2 ** 64 combinations
+def make_prepared(slot_count, course_count):
+    courses = [[slot * 100 + course for course in range(course_count)] for slot in range(slot_count)]
+    course_masks = {course_id: 1 << (course_id // 100) for course_ids in courses for course_id in course_ids}
+    prepared = PreparedSolve(ScheduleRequest([]))
+    prepared.courses = courses
+    prepared.conflict_index = ConflictIndex([course_id for course_ids in courses for course_id in course_ids], course_masks)
+    return prepared, course_masks
+
+
+def test_fits():
+    assert VectorizedCombinationSearch.fits([[1] * 16] * 5)
+    assert not VectorizedCombinationSearch.fits([[1] * 40] * 10)
+    assert VectorizedCombinationSearch.fits([[1] * 40] * 10, combination_limit=40 ** 10)
+
+
+def test_too_large_products_are_not_enumerated():
+    prepared, course_masks = make_prepared(16, 16)
+    with pytest.raises(OverflowError):
+        VectorizedCombinationSearch(prepared.courses, course_masks).run()
+
+
+# The solver searches the selections with too many combinations to check one by one instead of enumerating or overflowing
+@pytest.mark.parametrize('combination_limit', [VectorizedCombinationSearch.DEFAULT_COMBINATION_LIMIT, 2 ** 70])
+def test_solver_falls_back_to_search(combination_limit):
+    prepared, course_masks = make_prepared(16, 16)
+    metrics = SolveMetrics()
+    solver = ScheduleSolver(MajorCatalogStub(course_masks), engine='vectorized', vectorized_combination_limit=combination_limit)
+    if combination_limit > 2 ** 64:
+        with pytest.raises(OverflowError):
+            solver.solve(prepared, metrics)
+        return
+    results = solver.solve(prepared, metrics)
+    assert metrics.source == 'search'
+    assert results.total_count() == 2 ** 64
+    assert results.get(0) == [slot * 100 for slot in range(16)]
+    assert results.get(2 ** 64 - 1) == [slot * 100 + 15 for slot in range(16)]
+
+
+def test_solver_uses_vectorized_engine_within_the_limit():
+    prepared, course_masks = make_prepared(4, 8)
+    metrics = SolveMetrics()
+    results = ScheduleSolver(MajorCatalogStub(course_masks), engine='vectorized').solve(prepared, metrics)
+    assert metrics.source == 'vectorized'
+    assert results.total_count() == 8 ** 4